@@ -13,7 +13,7 @@ import asyncio
 from datetime import datetime
 from groq import Groq
 from config import GROQ_API_KEY, GROQ_MODEL
-from domains.market import get_market_data, resolve_coords_for_state
+from domains.market import get_market_data, get_nearest_markets, resolve_coords_for_state
 from agents.climate_agent import get_climate_risk
 from agents.satellite_agent import get_satellite_health
 
@@ -96,11 +96,21 @@ async def run_orchestration(agent_data: dict) -> dict:
         raise ValueError("GROQ_API_KEY is not set. Please add it to your .env file.")
 
     # ── Extract context params (text-based, matching CSV columns) ──
-    region    = str(agent_data.get("region",    "Kerala_Kottayam"))
-    commodity = str(agent_data.get("commodity", "Banana"))
+    region    = agent_data.get("region")
+    commodity = str(agent_data.get("commodity") or "Banana")
     lat       = agent_data.get("lat")
     lon       = agent_data.get("lon")
 
+    # Resolve the region from the farm's nearest market quoting the commodity
+    if not region and lat is not None and lon is not None:
+        try:
+            nearest = await get_nearest_markets(lat, lon, k=1, commodity=commodity)
+            if nearest["results"]:
+                region = nearest["results"][0]["region"]
+        except Exception as e:
+            print(f"Nearest market lookup failed, using the default region: {e}")
+    region = str(region or "Kerala_Kottayam")
+
     # Resolve coordinates from region name if not provided
     if lat is None or lon is None:
         lat, lon = resolve_coords_for_state(region)
@@ -0,0 +1,106 @@
+"""
+Event-loop lag benchmark for the market domain.
+
+Runs a 5 ms heartbeat coroutine while firing concurrent market requests
+with a cold region cache, and reports how late the heartbeat fired:
+
+  inline — the old behaviour: pandas work runs directly on the event loop
+  pool   — the market worker pool (run_in_market_pool)
+
+Usage (from backend/, with region CSVs in backend/data/):
+  python bench_event_loop.py [--rounds 5] [--concurrency 8] [--csv]
+
+--csv also bypasses the columnar sidecar so every load is a full CSV parse.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from domains.market import market_analyze, market_store
+from domains.market.market_analyze import (
+    DATA_DIR,
+    get_market_data,
+    get_market_data_sync,
+    get_price_trend_series,
+    get_price_trend_series_sync,
+)
+from domains.market.market_manifest import SKIP_FILES
+
+TICK = 0.005
+
+
+async def _heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    expected = loop.time() + TICK
+    while not stop.is_set():
+        await asyncio.sleep(max(expected - loop.time(), 0))
+        lags.append(max(loop.time() - expected, 0) * 1000)
+        expected += TICK
+
+
+async def _inline_request(region: str, commodity: str) -> None:
+    get_market_data_sync(region, commodity)
+    get_price_trend_series_sync(region, commodity, days=30)
+
+
+async def _pool_request(region: str, commodity: str) -> None:
+    await asyncio.gather(
+        get_market_data(region, commodity),
+        get_price_trend_series(region, commodity, days=30),
+    )
+
+
+async def _run(mode: str, regions: list[str], rounds: int, concurrency: int) -> dict:
+    request = _inline_request if mode == "inline" else _pool_request
+    lags: list[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(_heartbeat(lags, stop))
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        market_analyze._REGION_CACHE.invalidate()
+        jobs = [request(regions[i % len(regions)], "Banana") for i in range(concurrency)]
+        await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await beat
+    lags.sort()
+    return {
+        "mode":     mode,
+        "wall_s":   round(elapsed, 3),
+        "lag_p50":  round(statistics.median(lags), 2) if lags else 0.0,
+        "lag_p99":  round(lags[int(len(lags) * 0.99) - 1], 2) if lags else 0.0,
+        "lag_max":  round(lags[-1], 2) if lags else 0.0,
+        "ticks":    len(lags),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--csv", action="store_true", help="bypass the columnar sidecar cache")
+    args = parser.parse_args()
+
+    regions = sorted(p.stem for p in DATA_DIR.glob("*.csv") if p.name not in SKIP_FILES)
+    if not regions:
+        sys.exit(f"No region CSVs found in {DATA_DIR}")
+    if args.csv:
+        market_store.MARKET_COLUMNAR_CACHE = False
+
+    print(f"{len(regions)} regions, {args.rounds} rounds x {args.concurrency} concurrent requests, tick {TICK * 1000:.0f} ms")
+    print(f"{'mode':<8}{'wall s':>9}{'lag p50 ms':>12}{'lag p99 ms':>12}{'lag max ms':>12}{'ticks':>8}")
+    for mode in ("inline", "pool"):
+        r = asyncio.run(_run(mode, regions, args.rounds, args.concurrency))
+        print(f"{r['mode']:<8}{r['wall_s']:>9}{r['lag_p50']:>12}{r['lag_p99']:>12}{r['lag_max']:>12}{r['ticks']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,3 +14,20 @@ HF_VISION_MODEL = os.getenv(
     "HF_VISION_MODEL",
     "ozair23/mobilenet_v2_1.0_224-finetuned-plantdisease",
 )
+
+# ── Market domain ──
+# Set MARKET_COLUMNAR_CACHE=0 to always re-parse region CSVs.
+MARKET_COLUMNAR_CACHE = os.getenv("MARKET_COLUMNAR_CACHE", "1") != "0"
+# Memory budget for loaded region frames, per worker process.
+MARKET_CACHE_MAX_BYTES = int(os.getenv("MARKET_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Store resident region frames with categorical/float32/int32 dtypes (lower memory, same API output).
+MARKET_COMPACT_FRAMES = os.getenv("MARKET_COMPACT_FRAMES", "0") == "1"
+# Threads available to blocking market (pandas) work, per worker process.
+MARKET_WORKERS = int(os.getenv("MARKET_WORKERS", "4"))
+# Processes loading district files for state/all-India aggregates (0 = use the thread pool).
+MARKET_PROCESSES = int(os.getenv("MARKET_PROCESSES", str(min(os.cpu_count() or 1, 4))))
+# Region CSVs at least this large are parsed in chunks straight into the columnar cache.
+MARKET_STREAM_MIN_BYTES = int(os.getenv("MARKET_STREAM_MIN_BYTES", str(64 * 1024 * 1024)))
+MARKET_CSV_CHUNK_ROWS   = int(os.getenv("MARKET_CSV_CHUNK_ROWS", "200000"))
+# Market geocodes (State, District, Market, Latitude, Longitude), relative to backend/data/.
+MARKET_GAZETTEER_FILE = os.getenv("MARKET_GAZETTEER_FILE", "market_gazetteer.csv")
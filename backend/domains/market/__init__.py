@@ -1,10 +1,15 @@
 """Market domain package."""
 from .market_analyze import (
     get_market_data,
+    get_market_data_sync,
     get_price_trend_series,
+    get_price_trend_series_sync,
     get_available_filters,
     get_market_records,
+    get_market_series,
+    get_market_seasonality,
     resolve_coords_for_state,
+    get_region_cache_stats,
 )
 from .market_signals import (
     compute_buyer_signal,
@@ -13,13 +18,35 @@ from .market_signals import (
     enrich_market_data,
 )
 from .market_transformers import to_price_card, to_chart_series, to_market_summary
+from .market_executor import run_in_market_pool
+from .market_downsample import RESOLUTIONS
+from .market_intelligence import (
+    ChartOptions,
+    get_market_intelligence,
+    get_market_intelligence_sync,
+    get_market_intelligence_batch,
+)
+from .market_ingest import ingest_rows
+from .market_screener import get_market_screener
+from .market_anomalies import get_market_anomalies
+from .market_backtest import get_market_backtest
+from .market_spread import get_market_spread, get_spread_cache_stats
+from .market_correlation import get_market_correlation, get_correlation_cache_stats
+from .market_geo import get_nearest_markets
+from .market_aggregate import get_market_aggregate, get_aggregate_cache_stats
+from .market_store import get_load_stats
 
 __all__ = [
     "get_market_data",
+    "get_market_data_sync",
     "get_price_trend_series",
+    "get_price_trend_series_sync",
     "get_available_filters",
     "get_market_records",
+    "get_market_series",
+    "get_market_seasonality",
     "resolve_coords_for_state",
+    "get_region_cache_stats",
     "compute_buyer_signal",
     "compute_price_momentum",
     "compute_trade_recommendation",
@@ -27,4 +54,22 @@ __all__ = [
     "to_price_card",
     "to_chart_series",
     "to_market_summary",
+    "run_in_market_pool",
+    "ChartOptions",
+    "RESOLUTIONS",
+    "get_market_intelligence",
+    "get_market_intelligence_sync",
+    "get_market_intelligence_batch",
+    "ingest_rows",
+    "get_market_screener",
+    "get_market_anomalies",
+    "get_market_backtest",
+    "get_market_spread",
+    "get_spread_cache_stats",
+    "get_market_correlation",
+    "get_correlation_cache_stats",
+    "get_nearest_markets",
+    "get_market_aggregate",
+    "get_aggregate_cache_stats",
+    "get_load_stats",
 ]
@@ -0,0 +1,241 @@
+"""
+Market Aggregate — Domain Layer
+State-level and all-India views of one commodity: the daily median price
+across districts, a volume proxy and momentum.
+
+The CSVs carry no arrival quantities, so the volume proxy is the number of
+price quotes reported per day (and the number of districts quoting).
+
+Each district contributes a partial aggregate: its daily rollup of the
+commodity (Modal_Price median/min/max/count). A district already resident
+in the region cache is read from there; every other district file is
+loaded and rolled up in the market process pool, one file per task, so a
+cold state view costs about one district load rather than the sum of
+them. Pool processes only read: they are handed the date format the
+manifest knows for the file and never write the manifest or sidecars. Partials are cached per district file version and merged per day:
+the view's price is the median of its districts' daily medians, min/max
+the extremes and quotes the sum. Merged views are cached per state (and
+for all of India), tagged with the versions of every district in them.
+"""
+
+import asyncio
+
+import pandas as pd
+
+from .market_analyze import DATA_DIR, get_available_filters, read_region_frame, resident_region
+from .market_cache import ByteBudgetCache
+from .market_columns import COL_DATE
+from .market_executor import run_in_market_pool, run_in_market_processes
+from .market_index import _commodity_keys, commodity_key
+from .market_manifest import known_date_format, split_region_id
+from .market_outliers import COL_ANOMALY, mark_anomalies
+from .market_rollups import build_daily_rollups, empty_rollup
+from .market_signals import compute_price_momentum
+
+PARTIAL_CACHE_BYTES = 64 * 1024 * 1024
+VIEW_CACHE_BYTES    = 32 * 1024 * 1024
+INDIA               = "India"
+
+_PARTIAL_CACHE = ByteBudgetCache(PARTIAL_CACHE_BYTES)   # "region:commodity:excl" → district daily rollup
+_VIEW_CACHE    = ByteBudgetCache(VIEW_CACHE_BYTES)      # "scope:name:commodity:excl" → merged view
+
+
+async def get_market_aggregate(
+    commodity: str,
+    state:     str | None = None,
+    days:      int = 90,
+    exclude_anomalies: bool = False,
+) -> dict:
+    """
+    Daily median price, quote volume and momentum of a commodity over the
+    last `days` days across every district of a state, or of all of India
+    when no state is given, with a per-district (per-state for India)
+    breakdown.
+    """
+    filters = await run_in_market_pool(get_available_filters)
+    key     = commodity_key(commodity)
+    regions = [
+        region for region, names in sorted(filters["commodities"].items())
+        if any(commodity_key(name) == key for name in names)
+        and (not state or split_region_id(region)[0].lower() == state.lower())
+    ]
+    if not regions:
+        raise ValueError(f"No market data for {commodity} in {state or INDIA}")
+    name = next(n for n in filters["commodities"][regions[0]] if commodity_key(n) == key)
+
+    versions = await run_in_market_pool(_file_versions, regions)
+    partials = await asyncio.gather(*(
+        _district_partial(region, version, key, exclude_anomalies) for region, version in zip(regions, versions)
+    ))
+    view = await run_in_market_pool(_view, state, regions, versions, list(partials), key, exclude_anomalies)
+    return await run_in_market_pool(_report, view, name, days)
+
+
+def get_aggregate_cache_stats() -> dict:
+    """Hit/miss/eviction/invalidation counters of the district partial and merged view caches."""
+    return {"districts": _PARTIAL_CACHE.stats(), "views": _VIEW_CACHE.stats()}
+
+
+def _file_versions(regions: list[str]) -> list[tuple]:
+    versions = []
+    for region in regions:
+        stat = (DATA_DIR / f"{region}.csv").stat()
+        versions.append((stat.st_mtime_ns, stat.st_size))
+    return versions
+
+
+async def _district_partial(region: str, version: tuple, key: str, exclude_anomalies: bool) -> pd.DataFrame:
+    """One district's daily rollup of the commodity, from cache, the region cache or a pool process."""
+    cache_key = f"{region}:{key}:{int(exclude_anomalies)}"
+    daily = _PARTIAL_CACHE.get(cache_key, version)
+    if daily is None:
+        daily = await run_in_market_pool(_resident_daily, region, version, key, exclude_anomalies)
+        if daily is None:
+            daily = await run_in_market_processes(
+                district_daily, f"{region}.csv", key, exclude_anomalies, known_date_format(DATA_DIR, region),
+            )
+        _PARTIAL_CACHE.put(cache_key, version, daily, int(daily.memory_usage(deep=True).sum()))
+    return daily
+
+
+def _resident_daily(region: str, version: tuple, key: str, exclude_anomalies: bool) -> pd.DataFrame | None:
+    data = resident_region(f"{region}.csv", version)
+    if data is None:
+        return None
+    return (data.without_anomalies() if exclude_anomalies else data).daily(key)
+
+
+def district_daily(
+    filename: str,
+    key: str,
+    exclude_anomalies: bool = False,
+    date_format: str | None = None,
+) -> pd.DataFrame:
+    """
+    Daily rollup of one commodity of one region file, loaded in the calling
+    process; the same table RegionData.daily() gives for a loaded region.
+    Runs as a process-pool task, so it only reads the file (and its sidecar).
+    """
+    df   = read_region_frame(filename, date_format)
+    rows = df[_commodity_keys(df) == key]
+    rows = rows.sort_values(COL_DATE, kind="stable", na_position="first").reset_index(drop=True)
+    ranges  = {key: (0, len(rows))}
+    exclude = None
+    if exclude_anomalies:
+        rows, _ = mark_anomalies(rows, ranges)
+        exclude = rows[COL_ANOMALY].to_numpy()
+    return build_daily_rollups(rows, ranges, exclude).get(key, empty_rollup())
+
+
+def merge_dailies(dailies: list[pd.DataFrame]) -> pd.DataFrame:
+    """Per-day median of the dailies' medians, overall min/max, summed quotes and districts quoting."""
+    frames = [daily for daily in dailies if len(daily)]
+    if not frames:
+        return pd.DataFrame(columns=[COL_DATE, "median", "min", "max", "quotes", "districts"])
+    return (
+        pd.concat(frames, ignore_index=True)
+          .groupby(COL_DATE, sort=True)
+          .agg(median=("median", "median"), min=("min", "min"), max=("max", "max"),
+               quotes=("count", "sum"), districts=("median", "size"))
+          .reset_index()
+    )
+
+
+def _view(
+    state: str | None,
+    regions: list[str],
+    versions: list[tuple],
+    partials: list[pd.DataFrame],
+    key: str,
+    exclude_anomalies: bool,
+) -> dict:
+    """Merged view of a state (members: districts) or of India (members: states), cached."""
+    by_state: dict[str, list[int]] = {}
+    for i, region in enumerate(regions):
+        by_state.setdefault(split_region_id(region)[0], []).append(i)
+
+    def cached(scope: str, name: str, members: list[int], build) -> dict:
+        cache_key = f"{scope}:{name.lower()}:{key}:{int(exclude_anomalies)}"
+        version   = tuple((regions[i], versions[i]) for i in members)
+        view      = _VIEW_CACHE.get(cache_key, version)
+        if view is None:
+            view = {"scope": scope, "name": name, "regions": [regions[i] for i in members], **build()}
+            nbytes = sum(int(d.memory_usage(deep=True).sum()) for d in [view["daily"], *view["members"].values()])
+            _VIEW_CACHE.put(cache_key, version, view, nbytes)
+        return view
+
+    def state_view(name: str) -> dict:
+        members = by_state[name]
+        return cached("state", name, members, lambda: {
+            "daily":   merge_dailies([partials[i] for i in members]),
+            "members": {split_region_id(regions[i])[1]: partials[i] for i in members},
+        })
+
+    if state:
+        return state_view(split_region_id(regions[0])[0])
+    return cached("india", INDIA, list(range(len(regions))), lambda: {
+        "daily":   merge_dailies(partials),
+        "members": {name: state_view(name)["daily"] for name in sorted(by_state)},
+    })
+
+
+def _report(view: dict, commodity: str, days: int) -> dict:
+    daily  = view["daily"]
+    result = {
+        "scope":     view["scope"],
+        "name":      view["name"],
+        "commodity": commodity,
+        "days":      days,
+        "regions":   view["regions"],
+    }
+    if daily.empty:
+        return {**result, "window": None, "latest": None, "momentum": compute_price_momentum([]),
+                "volume": None, "series": [], "members": []}
+
+    end    = daily[COL_DATE].iloc[-1]
+    since  = end - pd.Timedelta(days=days - 1)
+    window = daily[daily[COL_DATE] >= since]
+    prior  = daily[(daily[COL_DATE] >= since - pd.Timedelta(days=days)) & (daily[COL_DATE] < since)]
+
+    series = [
+        {
+            "date":      f"{row.Arrival_Date:%Y-%m-%d}",
+            "price":     round(float(row.median), 2),
+            "min":       round(float(row.min), 2),
+            "max":       round(float(row.max), 2),
+            "quotes":    int(row.quotes),
+            "districts": int(row.districts),
+        }
+        for row in window.itertuples(index=False)
+    ]
+    quotes, prev_quotes = int(window["quotes"].sum()), int(prior["quotes"].sum())
+    return {
+        **result,
+        "window":   {"from": f"{since:%Y-%m-%d}", "to": f"{end:%Y-%m-%d}"},
+        "latest":   series[-1],
+        "momentum": compute_price_momentum(series),
+        "volume": {
+            "quotes":      quotes,
+            "prev_quotes": prev_quotes,
+            "change_pct":  round((quotes - prev_quotes) / prev_quotes * 100, 2) if prev_quotes else None,
+            "per_day":     round(quotes / days, 2),
+        },
+        "series":  series,
+        "members": [_member(name, member, since) for name, member in view["members"].items()],
+    }
+
+
+def _member(name: str, daily: pd.DataFrame, since: pd.Timestamp) -> dict:
+    """Latest price, window change and quote count of one district/state."""
+    window = daily[daily[COL_DATE] >= since] if len(daily) else daily
+    if window.empty:
+        return {"name": name, "date": None, "price": None, "change_pct": None, "quotes": 0}
+    first, last = float(window["median"].iloc[0]), float(window["median"].iloc[-1])
+    count = "quotes" if "quotes" in window.columns else "count"
+    return {
+        "name":       name,
+        "date":       f"{window[COL_DATE].iloc[-1]:%Y-%m-%d}",
+        "price":      round(last, 2),
+        "change_pct": round((last - first) / first * 100, 2) if first else None,
+        "quotes":     int(window[count].sum()),
+    }
@@ -9,28 +9,33 @@ CSV Columns: State, District, Market, Commodity, Variety, Grade,
 """
 
 import os
-import glob
+import threading
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 from pathlib import Path
-from functools import lru_cache
+
+from config import MARKET_CACHE_MAX_BYTES, MARKET_CSV_CHUNK_ROWS, MARKET_STREAM_MIN_BYTES
+
+from .market_cache import ByteBudgetCache
+from .market_columns import (  # expected column names (after normalisation)
+    COL_STATE, COL_DISTRICT, COL_MARKET, COL_COMMODITY, COL_VARIETY,
+    COL_GRADE, COL_DATE, COL_MIN, COL_MAX, COL_MODAL,
+)
+from .market_executor import run_in_market_pool
+from .market_downsample import CHART_POINTS, PERIODS, lttb_indices, pick_resolution, window_ohlc
+from .market_forecast import fit_seasonal, forecast_points
+from .market_index import RegionData, window_bounds
+from .market_indicators import to_overlays
+from .market_manifest import known_date_format, remember_date_format, sync_manifest
+from .market_seasonality import to_seasonal_profile
+from .market_store import read_columnar, write_columnar, write_columnar_chunks, record_load
+from .market_transformers import to_record_rows
 
 # ── CSV file location ──────────────────────────────────────────────────────
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 
-# Expected column names (after normalisation)
-COL_STATE     = "State"
-COL_DISTRICT  = "District"
-COL_MARKET    = "Market"
-COL_COMMODITY = "Commodity"
-COL_VARIETY   = "Variety"
-COL_GRADE     = "Grade"
-COL_DATE      = "Arrival_Date"
-COL_MIN       = "Min_Price"
-COL_MAX       = "Max_Price"
-COL_MODAL     = "Modal_Price"
-
-
 # Coordinate lookup for known states/districts
 # We use this to map a selected Region (File) to a lat/lon
 REGION_COORDS = {
@@ -60,53 +65,266 @@ def resolve_coords_for_state(region_name: str) -> tuple[float, float]:
     return (10.85, 76.27) # Default
 
 
-@lru_cache(maxsize=10)
-def _load_csv(filename: str) -> pd.DataFrame:
+# Loaded regions, bounded by memory rather than entry count
+_REGION_CACHE = ByteBudgetCache(MARKET_CACHE_MAX_BYTES)
+_load_locks: dict[str, threading.RLock] = {}
+# Columns the manifest summarises a region from
+SUMMARY_COLUMNS = [COL_COMMODITY, COL_MARKET, COL_DATE]
+
+
+def _load_region(filename: str) -> RegionData:
+    """
+    Load and cache a region file together with its commodity index.
+    The cached copy is dropped as soon as the file's mtime or size changes.
+    """
+    path = DATA_DIR / filename
+    if not path.exists():
+        raise FileNotFoundError(f"Region file {filename} not found")
+
+    stat    = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    region  = _REGION_CACHE.get(filename, version)
+    if region is not None:
+        return region
+
+    # One load per region at a time; concurrent requests wait for it instead of re-parsing
+    with region_lock(filename):
+        region = _REGION_CACHE.get(filename, version)
+        if region is None:
+            region = RegionData(_load_csv(filename, stat), version)
+            _cache_region(filename, version, region)
+    return region
+
+
+def _cache_region(filename: str, version: tuple, region: RegionData) -> None:
+    """Put a region in the cache and re-charge its entry whenever its memos change size."""
+    _REGION_CACHE.put(filename, version, region, region.nbytes)
+    region.on_resize = lambda nbytes: _REGION_CACHE.resize(filename, version, nbytes)
+
+
+def resident_region(filename: str, version: tuple) -> RegionData | None:
+    """The cached region for filename if it is resident at this version; never loads."""
+    return _REGION_CACHE.get(filename, version)
+
+
+def region_lock(filename: str) -> threading.RLock:
+    """Lock serialising loads of (and appends to) one region file."""
+    return _load_locks.setdefault(filename, threading.RLock())
+
+
+def _summary_frame(filename: str) -> pd.DataFrame:
+    """
+    Commodity, market and date columns of a region for the manifest, read
+    from the sidecar (else the CSV) without loading the region into the cache.
+    """
+    path = DATA_DIR / filename
+    if not path.exists():
+        raise FileNotFoundError(f"Region file {filename} not found")
+
+    df = read_columnar(path, path.stat(), SUMMARY_COLUMNS)
+    if df is None:
+        raw = pd.read_csv(path, dtype=str, usecols=lambda c: RENAME_MAP.get(c.strip(), c.strip()) in SUMMARY_COLUMNS)
+        df  = _normalise_columns(raw)
+        date_format = _region_date_format(path, df[COL_DATE]) if COL_DATE in df.columns else None
+        df  = normalise_frame(df, date_format)
+    return df
+
+
+def get_region_cache_stats() -> dict:
+    """Hit/miss/eviction/invalidation counters and resident bytes of the region cache."""
+    return _REGION_CACHE.stats()
+
+
+def _load_csv(filename: str, stat: os.stat_result | None = None) -> pd.DataFrame:
+    """
+    Load a specific CSV file by name.
+    Served from the columnar sidecar when it matches the CSV's mtime/size,
+    otherwise parsed and normalised from the CSV and the sidecar rewritten.
+    """
+    path = DATA_DIR / filename
+    if not path.exists():
+        raise FileNotFoundError(f"Region file {filename} not found")
+
+    started = time.perf_counter()
+    stat    = stat or path.stat()  # taken before parsing so a concurrent rewrite is not masked
+
+    df     = read_columnar(path, stat)
+    source = "columnar"
+    if df is None and stat.st_size >= MARKET_STREAM_MIN_BYTES:
+        # Large file: normalise chunk by chunk straight into the sidecar, then read that back
+        if write_columnar_chunks(path, stat, _iter_csv_chunks(path)):
+            df     = read_columnar(path, stat)
+            source = "csv-stream"
+    if df is None:
+        df     = _parse_csv(path)
+        source = "csv"
+        write_columnar(path, stat, df)
+
+    record_load(filename, source, time.perf_counter() - started, len(df))
+    return df
+
+
+def read_region_frame(filename: str, date_format: str | None = None) -> pd.DataFrame:
     """
-    Load and cache a specific CSV file by name.
+    Load a region file without writing anything: the columnar sidecar when it
+    matches the CSV, otherwise the CSV parsed with date_format (sniffed, but
+    not recorded, when None). For pool processes, which must leave the
+    manifest and the sidecars to the server process.
     """
     path = DATA_DIR / filename
     if not path.exists():
         raise FileNotFoundError(f"Region file {filename} not found")
 
-    df = pd.read_csv(path)
+    df = read_columnar(path, path.stat())
+    if df is None:
+        df = normalise_frame(pd.read_csv(path, dtype=str), date_format)
+    return df
+
+
+# Common alternate column names → normalised names
+RENAME_MAP = {
+    "Arrival_Date":   COL_DATE,
+    "ArrivalDate":    COL_DATE,
+    "arrival_date":   COL_DATE,
+    "Min_Price":      COL_MIN,
+    "MinPrice":       COL_MIN,
+    "min_price":      COL_MIN,
+    "Max_Price":      COL_MAX,
+    "MaxPrice":       COL_MAX,
+    "max_price":      COL_MAX,
+    "Modal_Price":    COL_MODAL,
+    "ModalPrice":     COL_MODAL,
+    "modal_price":    COL_MODAL,
+    "Modal_Pri":      COL_MODAL,   # truncated
+    "Commodi":        COL_COMMODITY, # typo handling
+}
+
+
+# Arrival_Date formats seen in Agmarknet exports, in order of preference
+DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d", "%m/%d/%Y")
+DATE_SAMPLE_SIZE = 1000
+
+
+def sniff_date_format(values: pd.Series) -> str | None:
+    """
+    The DATE_FORMATS entry matching the most values in an evenly spaced
+    sample of the column (earlier formats win ties), or None if none match.
+    """
+    sample = _date_sample(values)
+    best, best_hits = None, 0
+    for fmt in DATE_FORMATS:
+        hits = int(pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum())
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+            if hits == len(sample):
+                break
+    return best
+
+
+def _date_sample(values: pd.Series) -> pd.Series:
+    values = values.dropna().astype(str).str.strip()
+    values = values[values != ""]
+    step   = max(len(values) // DATE_SAMPLE_SIZE, 1)
+    return values.iloc[::step]
 
+
+def _region_date_format(path: Path, values: pd.Series) -> str | None:
+    """
+    Date format for a region file: the one recorded in the manifest when it
+    still fits a sample of the data, otherwise freshly sniffed and recorded.
+    """
+    known = known_date_format(DATA_DIR, path.stem)
+    if known:
+        sample = _date_sample(values)
+        if pd.to_datetime(sample, format=known, errors="coerce").notna().all():
+            return known
+    date_format = sniff_date_format(values)
+    remember_date_format(DATA_DIR, path.stem, date_format)
+    return date_format
+
+
+def _parse_dates(values: pd.Series, date_format: str | None = None) -> pd.Series:
+    """
+    One vectorised parse with date_format (sniffed when not given). Values it
+    rejects — files mixing formats — are re-parsed with each other format in
+    turn, touching only the values still unparsed, then by per-value inference.
+    Arrival dates repeat heavily, so only the distinct strings are parsed and
+    the result is broadcast back through the factorised codes.
+    """
+    if date_format is None:
+        date_format = sniff_date_format(values)
+
+    codes, uniques = pd.factorize(values.astype(str).str.strip(), use_na_sentinel=True)
+    uniques = np.asarray(uniques, dtype=object)
+    parsed  = np.full(len(uniques), np.datetime64("NaT"), dtype="datetime64[ns]")
+    if date_format:
+        parsed[:] = pd.to_datetime(uniques, format=date_format, errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+    pending = np.flatnonzero(np.isnat(parsed) & (uniques != "") & (uniques != "nan"))
+    for fmt in DATE_FORMATS:
+        if len(pending) == 0:
+            break
+        if fmt == date_format:
+            continue
+        attempt = pd.to_datetime(uniques[pending], format=fmt, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        ok = ~np.isnat(attempt)
+        parsed[pending[ok]] = attempt[ok]
+        pending = pending[~ok]
+    if len(pending):
+        parsed[pending] = pd.to_datetime(uniques[pending], format="mixed", dayfirst=True, errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+    result = parsed[codes] if len(parsed) else np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[ns]")
+    result[codes < 0] = np.datetime64("NaT")
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def _parse_csv(path: Path) -> pd.DataFrame:
+    """
+    Read a region CSV and normalise it. Everything is read as text, like the
+    streamed chunks, so a region's column types do not depend on its size.
+    """
+    df = _normalise_columns(pd.read_csv(path, dtype=str))
+    date_format = _region_date_format(path, df[COL_DATE]) if COL_DATE in df.columns else None
+    return normalise_frame(df, date_format)
+
+
+def _iter_csv_chunks(path: Path):
+    """
+    Yield normalised chunks of MARKET_CSV_CHUNK_ROWS rows. Everything is read
+    as text so every chunk gets the same column types, and the date format is
+    determined once from the head of the file so all chunks parse alike.
+    """
+    head = _normalise_columns(pd.read_csv(path, nrows=DATE_SAMPLE_SIZE, dtype=str))
+    date_format = _region_date_format(path, head[COL_DATE]) if COL_DATE in head.columns else None
+
+    for chunk in pd.read_csv(path, chunksize=MARKET_CSV_CHUNK_ROWS, dtype=str):
+        yield normalise_frame(chunk, date_format)
+
+
+def _normalise_columns(df: pd.DataFrame) -> pd.DataFrame:
     # Strip whitespace from column names
     df.columns = [c.strip() for c in df.columns]
 
     # Normalise common alternate column names
-    rename_map = {
-        "Arrival_Date":   COL_DATE,
-        "ArrivalDate":    COL_DATE,
-        "arrival_date":   COL_DATE,
-        "Min_Price":      COL_MIN,
-        "MinPrice":       COL_MIN,
-        "min_price":      COL_MIN,
-        "Max_Price":      COL_MAX,
-        "MaxPrice":       COL_MAX,
-        "max_price":      COL_MAX,
-        "Modal_Price":    COL_MODAL,
-        "ModalPrice":     COL_MODAL,
-        "modal_price":    COL_MODAL,
-        "Modal_Pri":      COL_MODAL,   # truncated
-        "Commodi":        COL_COMMODITY, # typo handling
-    }
-    df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns}, inplace=True)
+    df.rename(columns={k: v for k, v in RENAME_MAP.items() if k in df.columns}, inplace=True)
+    return df
+
+
+def normalise_frame(df: pd.DataFrame, date_format: str | None = None) -> pd.DataFrame:
+    """
+    Normalise raw CSV rows: column names, dates, prices and strings.
+    date_format is the expected Arrival_Date format (sniffed when None);
+    rows in other formats fall back to a per-row parse.
+    """
+    df = _normalise_columns(df)
 
     # Parse date column
-    for fmt in ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d", "%m/%d/%Y"):
-        try:
-            df[COL_DATE] = pd.to_datetime(df[COL_DATE], format=fmt, errors="raise")
-            break
-        except Exception:
-            continue
-    else:
-        df[COL_DATE] = pd.to_datetime(df[COL_DATE], infer_datetime_format=True, errors="coerce")
+    df[COL_DATE] = _parse_dates(df[COL_DATE], date_format)
 
-    # Coerce numeric
+    # Coerce numeric (always float64, so chunks and appended rows share one dtype)
     for col in [COL_MIN, COL_MAX, COL_MODAL]:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col].astype(str).str.replace(",", ""), errors="coerce")
+            df[col] = pd.to_numeric(df[col].astype(str).str.replace(",", ""), errors="coerce").astype("float64")
             
     # Strip strings
     for col in [COL_STATE, COL_DISTRICT, COL_MARKET, COL_COMMODITY, COL_VARIETY]:
@@ -116,9 +334,14 @@ def _load_csv(filename: str) -> pd.DataFrame:
     return df
 
 
+# Last filters response, keyed by the manifest generation it was built from
+_filters_cache: tuple[int, dict] | None = None
+
+
 def get_available_filters() -> dict:
     """
-    Scans backend/data/*.csv and returns structured topology:
+    Returns structured topology for backend/data/*.csv, answered from the
+    region manifest (only new or changed files are loaded to refresh it):
     {
        "topology": {
            "Kerala": ["Kottayam", "Kozhikode", ...],
@@ -128,122 +351,128 @@ def get_available_filters() -> dict:
        "commodities": {
            "Kerala_Kottayam": ["Banana", ...],
            ...
+       },
+       "regions": {
+           "Kerala_Kottayam": {"rows": 16832, "date_min": "2022-01-01", "date_max": "2024-09-26"},
+           ...
        }
     }
     """
-    csv_files = glob.glob(str(DATA_DIR / "*.csv"))
-    topology = {}
-    commodities_map = {}
-
-    for path in csv_files:
-        p = Path(path)
-        if p.name == "market_prices.csv": continue # Skip sample
-
-        region_id = p.stem  # e.g. "Kerala_Kottayam"
-        
-        # Parse State_District from filename
-        parts = region_id.split('_')
-        if len(parts) >= 2:
-            state    = parts[0]
-            district = parts[1]
-        else:
-            state    = "Unknown"
-            district = region_id
+    global _filters_cache
+    manifest, generation = sync_manifest(DATA_DIR, _summary_frame)
+    if _filters_cache and _filters_cache[0] == generation:
+        return _filters_cache[1]
 
-        if state not in topology:
-            topology[state] = []
-        if district not in topology[state]:
-            topology[state].append(district)
-        
-        # Load commodities
-        try:
-            df = _load_csv(p.name)
-            if COL_COMMODITY in df.columns:
-                commodities_map[region_id] = sorted(df[COL_COMMODITY].dropna().unique().tolist())
-            else:
-                commodities_map[region_id] = []
-        except Exception:
-            commodities_map[region_id] = []
-
-    # Sort lists
-    for state in topology:
-        topology[state].sort()
-    
-    # Sort topology keys
-    sorted_topology = {k: topology[k] for k in sorted(topology.keys())}
-
-    return {
-        "topology":    sorted_topology,
-        "commodities": commodities_map
+    topology = {}
+    for entry in manifest.values():
+        topology.setdefault(entry["state"], set()).add(entry["district"])
+
+    region_ids = sorted(manifest)
+    filters = {
+        "topology":    {state: sorted(topology[state]) for state in sorted(topology)},
+        "commodities": {r: manifest[r]["commodities"] for r in region_ids},
+        "regions": {
+            r: {k: manifest[r][k] for k in ("rows", "date_min", "date_max")}
+            for r in region_ids
+        },
     }
+    _filters_cache = (generation, filters)
+    return filters
 
 
 async def get_market_data(
     region:    str,  # e.g. "Kerala_Kottayam"
     commodity: str,  # e.g. "Banana"
     market:    str = "", # filtered if provided, else use latest
+    end:       pd.Timestamp | None = None,  # latest as of this day if provided
 ) -> dict:
     """
     Fetch market data from the specific region CSV file.
+    Runs on the market worker pool so a cold load does not block the event loop.
     """
+    return await run_in_market_pool(get_market_data_sync, region, commodity, market, end)
+
+
+def get_market_data_sync(region: str, commodity: str, market: str = "", end: pd.Timestamp | None = None) -> dict:
+    """Blocking implementation of get_market_data."""
     try:
-        filename = f"{region}.csv"
-        df = _load_csv(filename)
-        
-        # Filter by Commodity
-        if COL_COMMODITY in df.columns:
-            df = df[df[COL_COMMODITY].str.lower() == commodity.lower()]
+        return market_snapshot(_load_region(f"{region}.csv"), region, commodity, end, market)
+    except Exception as e:
+        return _error_result(region, commodity, str(e))
 
-        if df.empty:
-            return _error_result(region, commodity, "No data for this commodity")
 
-        # Sort by Date descending
-        df = df.sort_values(COL_DATE, ascending=False)
-        
-        latest = df.iloc[0]
-        prev   = df.iloc[1] if len(df) > 1 else None
+def market_snapshot(
+    data:      RegionData,
+    region:    str,
+    commodity: str,
+    end:       pd.Timestamp | None = None,
+    market:    str = "",
+) -> dict:
+    """
+    Latest price card fields for one commodity of an already loaded region,
+    as of `end` (inclusive) when given, and from one market's rows when
+    `market` is given (looked up through the commodity's drill-down groups).
+    On a without_anomalies() view, flagged quotes are skipped.
+    """
+    stop = data.size(commodity) if end is None else data.seek(commodity, end, side="right")
+    if market:
+        groups    = data.series_groups(commodity)
+        positions = groups.positions(groups.match(market=market))
+        positions = positions[positions < stop]
+        if data.exclude_anomalies:
+            positions = positions[~data.anomaly_flags(commodity)[positions]]
+        df = data.take(commodity, positions[-2:])
+    elif data.exclude_anomalies:
+        df = data.take(commodity, data.latest_positions(commodity, stop))
+    else:
+        df = data.rows(commodity, max(stop - 2, 0), stop)
 
-        modal_price = float(latest.get(COL_MODAL, 0) or 0)
-        min_price   = float(latest.get(COL_MIN,   modal_price) or modal_price)
-        max_price   = float(latest.get(COL_MAX,   modal_price) or modal_price)
+    if df.empty:
+        reason = f"No data for this commodity at {market}" if market else "No data for this commodity"
+        return _error_result(region, commodity, reason)
 
-        if prev is not None:
-            prev_price   = float(prev.get(COL_MODAL, modal_price) or modal_price)
-            price_change = round(modal_price - prev_price, 2)
-            trend        = "up" if price_change > 0 else ("down" if price_change < 0 else "stable")
-        else:
-            prev_price   = modal_price
-            price_change = 0.0
-            trend        = "stable"
-            
-        arrival_date = latest[COL_DATE]
-        if pd.notna(arrival_date):
-            arrival_date = arrival_date.strftime("%d %b %Y")
-        else:
-            arrival_date = "Unknown"
+    # Partition is date-ascending, so the latest rows are at the end
+    latest = df.iloc[-1]
+    prev   = df.iloc[-2] if len(df) > 1 else None
 
-        return {
-            "commodity":    str(latest.get(COL_COMMODITY, commodity)),
-            "variety":      str(latest.get(COL_VARIETY, "—")),
-            "grade":        str(latest.get(COL_GRADE, "—")),
-            "market_name":  str(latest.get(COL_MARKET, "—")),
-            "district":     str(latest.get(COL_DISTRICT, "—")),
-            "state_name":   str(latest.get(COL_STATE, "—")),
-            "mandi_price":  modal_price,
-            "min_price":    min_price,
-            "max_price":    max_price,
-            "prev_price":   prev_price,
-            "price_change": price_change,
-            "arrival":      0.0,
-            "trend":        trend,
-            "arrival_date": arrival_date,
-            "source":       f"{region}.csv",
-            "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
-            "status":       "success",
-        }
+    modal_price = _price(latest, COL_MODAL, 0.0)
+    min_price   = _price(latest, COL_MIN,   modal_price)
+    max_price   = _price(latest, COL_MAX,   modal_price)
 
-    except Exception as e:
-        return _error_result(region, commodity, str(e))
+    if prev is not None:
+        prev_price   = _price(prev, COL_MODAL, modal_price)
+        price_change = round(modal_price - prev_price, 2)
+        trend        = "up" if price_change > 0 else ("down" if price_change < 0 else "stable")
+    else:
+        prev_price   = modal_price
+        price_change = 0.0
+        trend        = "stable"
+        
+    arrival_date = latest[COL_DATE]
+    if pd.notna(arrival_date):
+        arrival_date = arrival_date.strftime("%d %b %Y")
+    else:
+        arrival_date = "Unknown"
+
+    return {
+        "commodity":    str(latest.get(COL_COMMODITY, commodity)),
+        "variety":      str(latest.get(COL_VARIETY, "—")),
+        "grade":        str(latest.get(COL_GRADE, "—")),
+        "market_name":  str(latest.get(COL_MARKET, "—")),
+        "district":     str(latest.get(COL_DISTRICT, "—")),
+        "state_name":   str(latest.get(COL_STATE, "—")),
+        "mandi_price":  modal_price,
+        "min_price":    min_price,
+        "max_price":    max_price,
+        "prev_price":   prev_price,
+        "price_change": price_change,
+        "arrival":      0.0,
+        "trend":        trend,
+        "arrival_date": arrival_date,
+        "source":       f"{region}.csv",
+        "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
+        "status":       "success",
+    }
 
 
 async def get_price_trend_series(
@@ -251,101 +480,322 @@ async def get_price_trend_series(
     commodity: str,
     market:    str = "",
     days:      int = 14,
+    start:     pd.Timestamp | None = None,
+    end:       pd.Timestamp | None = None,
 ) -> list[dict]:
+    """
+    Daily median modal price for the last `days` dated days (oldest→newest),
+    or for every dated day in [start, end] when start is given.
+    Runs on the market worker pool so a cold load does not block the event loop.
+    """
+    return await run_in_market_pool(get_price_trend_series_sync, region, commodity, market, days, start, end)
+
+
+def get_price_trend_series_sync(
+    region:    str,
+    commodity: str,
+    market:    str = "",
+    days:      int = 14,
+    start:     pd.Timestamp | None = None,
+    end:       pd.Timestamp | None = None,
+) -> list[dict]:
+    """Blocking implementation of get_price_trend_series."""
     try:
-        filename = f"{region}.csv"
-        df = _load_csv(filename)
-        
-        if COL_COMMODITY in df.columns:
-            df = df[df[COL_COMMODITY].str.lower() == commodity.lower()]
-            
-        if df.empty: return []
-
-        df = df.dropna(subset=[COL_DATE, COL_MODAL])
-        # Group by date, taking median price if multiple markets/varieties exist for same day
-        daily = (
-            df.groupby(COL_DATE)
-              .agg(price=(COL_MODAL, "median"), count=(COL_MODAL, "count"))
-              .reset_index()
-              .sort_values(COL_DATE)
-              .tail(days)
-        )
-        
-        return [
-            {
-                "date":    row[COL_DATE].strftime("%d %b"),
-                "price":   round(float(row["price"]), 2),
-                "arrival": int(row["count"])
-            }
-            for _, row in daily.iterrows()
-        ]
+        return trend_series(_load_region(f"{region}.csv"), commodity, days, start, end)
     except Exception:
         return []
 
 
+def trend_series(
+    data:      RegionData,
+    commodity: str,
+    days:      int = 14,
+    start:     pd.Timestamp | None = None,
+    end:       pd.Timestamp | None = None,
+) -> list[dict]:
+    """
+    Chart points of an already loaded region: every dated day in [start, end]
+    when start is given, else the last `days` dated days up to end.
+    """
+    # Daily median price across markets/varieties, materialised at load time
+    lo, hi = data.daily_window(commodity, start, end, days)
+    return _daily_points(data.daily(commodity).iloc[lo:hi], "%d %b")
+
+
+def chart_points(
+    data:       RegionData,
+    commodity:  str,
+    days:       int = 14,
+    start:      pd.Timestamp | None = None,
+    end:        pd.Timestamp | None = None,
+    resolution: str = "auto",
+    points:     int = CHART_POINTS,
+) -> tuple[str, list[dict], np.ndarray]:
+    """
+    Downsampled chart points over the same days as trend_series():
+    weekly/monthly OHLC bars (price = close, plus open/high/low) or an LTTB
+    selection of days. "auto" keeps daily points while they fit in `points`.
+    Returns the resolution used, the points, and the daily rollup position
+    each point closes on (to align indicator overlays).
+    """
+    lo, hi = data.daily_window(commodity, start, end, days)
+    window = data.daily(commodity).iloc[lo:hi]
+    dates  = window[COL_DATE]
+    if resolution == "auto":
+        first, last = (dates.iloc[0], dates.iloc[-1]) if len(window) else (None, None)
+        resolution  = pick_resolution(len(window), first, last, points)
+
+    if resolution in PERIODS:
+        bars = window_ohlc(data.ohlc(commodity, resolution), window, resolution)
+        positions = lo + np.searchsorted(dates.to_numpy(), bars["last_day"].to_numpy())
+        label = "%d %b %Y" if resolution == "week" else "%b %Y"
+        series = [
+            {"date": d, "price": c, "arrival": n, "open": o, "high": h, "low": l}
+            for d, o, h, l, c, n in zip(
+                bars[COL_DATE].dt.strftime(label).tolist(),
+                bars["open"].round(2).tolist(),
+                bars["high"].round(2).tolist(),
+                bars["low"].round(2).tolist(),
+                bars["close"].round(2).tolist(),
+                bars["count"].astype(int).tolist(),
+            )
+        ]
+        return resolution, series, positions
+
+    if resolution == "lttb":
+        days_since_epoch = dates.to_numpy().astype("datetime64[D]").astype(np.int64)
+        picked = lttb_indices(days_since_epoch, window["median"].to_numpy(), points)
+        return resolution, _daily_points(window.iloc[picked], "%d %b %Y"), lo + picked
+
+    return resolution, _daily_points(window, "%d %b"), lo + np.arange(len(window))
+
+
+def _daily_points(daily: pd.DataFrame, label: str) -> list[dict]:
+    dates  = daily[COL_DATE].dt.strftime(label).tolist()
+    prices = daily["median"].round(2).tolist()
+    counts = daily["count"].astype(int).tolist()
+    return [
+        {"date": d, "price": p, "arrival": c}
+        for d, p, c in zip(dates, prices, counts)
+    ]
+
+
+def trend_overlays(
+    data:      RegionData,
+    commodity: str,
+    days:      int = 14,
+    start:     pd.Timestamp | None = None,
+    end:       pd.Timestamp | None = None,
+    positions: np.ndarray | None = None,
+) -> dict[str, list]:
+    """
+    Rolling indicator overlays aligned point-for-point with trend_series(),
+    or with chart_points() when given its positions.
+    """
+    frame = data.indicators_for(commodity).frame
+    if positions is not None:
+        return to_overlays(frame.iloc[positions])
+    lo, hi = data.daily_window(commodity, start, end, days)
+    return to_overlays(frame.iloc[lo:hi])
+
+
+def trend_forecast(
+    data:      RegionData,
+    commodity: str,
+    horizon:   int,
+    end:       pd.Timestamp | None = None,
+) -> dict:
+    """
+    Seasonal forecast for the `horizon` days after the latest quote, from the
+    cached fit. With an end before the latest quote the series is refitted
+    up to end (uncached), so the forecast never sees later prices.
+    """
+    daily = data.daily(commodity)
+    if end is None or daily.empty or end >= daily[COL_DATE].iloc[-1]:
+        return forecast_points(data.forecast_fit(commodity), horizon)
+    _, hi = data.daily_window(commodity, None, end)
+    return forecast_points(fit_seasonal([daily.iloc[:hi]])[0], horizon)
+
+
+def trend_seasonal(data: RegionData, commodity: str, end: pd.Timestamp | None = None) -> dict | None:
+    """
+    Seasonal percentile of the latest daily median (as of end) against the
+    commodity's day-of-year bands: one binary search on the rollup and one
+    on the cached profile. The bands cover the full history. None when
+    there is no dated price.
+    """
+    daily  = data.daily(commodity)
+    _, hi  = data.daily_window(commodity, None, end)
+    if hi == 0:
+        return None
+    day, price = daily[COL_DATE].iloc[hi - 1], float(daily["median"].iloc[hi - 1])
+    return {"date": f"{day:%Y-%m-%d}", "price": round(price, 2), **data.seasonality_for(commodity).position(price, day)}
+
+
+def get_market_seasonality(region: str, commodity: str, exclude_anomalies: bool = False) -> dict:
+    """
+    Day-of-year and month price bands of one commodity over its full
+    history, plus where the latest price sits in them.
+    """
+    try:
+        data = _load_region(f"{region}.csv")
+        if exclude_anomalies:
+            data = data.without_anomalies()
+        return {
+            "region":    region,
+            "commodity": commodity,
+            "latest":    trend_seasonal(data, commodity),
+            **to_seasonal_profile(data.seasonality_for(commodity)),
+        }
+    except Exception as e:
+        return {"region": region, "commodity": commodity, "months": [], "days": [], "error": str(e)}
+
+
+def get_market_series(
+    region:    str,
+    commodity: str,
+    market:    str | None = None,
+    variety:   str | None = None,
+    grade:     str | None = None,
+    days:      int = 14,
+    start:     pd.Timestamp | None = None,
+    end:       pd.Timestamp | None = None,
+) -> dict:
+    """
+    Drill-down daily series for one commodity at any mix of market, variety
+    and grade (blank = all), plus the (market, variety, grade) groups that
+    matched. Answered from the commodity's cached groups: one group is a
+    slice of the prebuilt table, several re-aggregate only their own rows.
+    Days are chosen as in trend_series().
+    """
+    try:
+        data    = _load_region(f"{region}.csv")
+        groups  = data.series_groups(commodity)
+        matched = groups.match(market, variety, grade)
+
+        if not (market or variety or grade):
+            daily = data.daily(commodity)      # every group: the commodity rollup itself
+        elif len(matched) > 1:
+            daily = groups.daily(matched, data.take(commodity, groups.positions(matched)))
+        else:
+            daily = groups.daily(matched)
+
+        lo, hi = window_bounds(daily[COL_DATE].to_numpy(), start, end, days)
+        listed = groups.groups.iloc[matched]
+        return {
+            "region":    region,
+            "commodity": commodity,
+            "filters":   {"market": market or None, "variety": variety or None, "grade": grade or None},
+            "groups": [
+                {
+                    "market":       m,
+                    "variety":      v,
+                    "grade":        g,
+                    "rows":         int(n),
+                    "first_date":   f"{first:%Y-%m-%d}" if pd.notna(first) else None,
+                    "last_date":    f"{last:%Y-%m-%d}" if pd.notna(last) else None,
+                    "latest_price": round(float(price), 2) if pd.notna(price) else None,
+                }
+                for m, v, g, n, first, last, price in zip(
+                    listed[COL_MARKET], listed[COL_VARIETY], listed[COL_GRADE], listed["rows"],
+                    listed["first_day"], listed["last_day"], listed["latest_price"],
+                )
+            ],
+            "series": _daily_points(daily.iloc[lo:hi], "%d %b"),
+        }
+    except Exception as e:
+        return {"region": region, "commodity": commodity, "groups": [], "series": [], "error": str(e)}
+
+
 def get_market_records(
     region: str,
     commodity: str,
     page: int = 1,
     page_size: int = 50,
+    cursor: str | None = None,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
 ) -> dict:
     """
     Return paginated individual records from the CSV for a given region+commodity.
     Each record has: State, District, Market, Commodity, Variety, Grade,
     Arrival_Date, Min_Price, Max_Price, Modal_Price, Commodity_Code.
+
+    Records are most-recent-first. Pass the previous response's next_cursor as
+    cursor to page by keyset instead of page number — the cursor seeks into the
+    date index by binary search, so deep pages cost the same as the first and
+    rows appended between requests do not shift later pages.
+
+    start/end (inclusive) restrict the records to that date range; the bounds
+    are binary-searched too, and undated rows are left out when either is set.
     """
     try:
         filename = f"{region}.csv"
-        df = _load_csv(filename)
-
-        if COL_COMMODITY in df.columns:
-            df = df[df[COL_COMMODITY].str.lower() == commodity.lower()]
-
-        if df.empty:
-            return {"records": [], "total": 0, "page": page, "page_size": page_size}
-
-        # Sort by date descending (most recent first)
-        df = df.sort_values(COL_DATE, ascending=False)
-
-        total = len(df)
-
-        # Paginate
-        start = (page - 1) * page_size
-        end = start + page_size
-        page_df = df.iloc[start:end]
-
-        records = []
-        for _, row in page_df.iterrows():
-            arrival_date = row.get(COL_DATE)
-            if pd.notna(arrival_date):
-                arrival_date = arrival_date.strftime("%d/%m/%Y")
-            else:
-                arrival_date = "—"
-
-            records.append({
-                "state": str(row.get(COL_STATE, "—")),
-                "district": str(row.get(COL_DISTRICT, "—")),
-                "market": str(row.get(COL_MARKET, "—")),
-                "commodity": str(row.get(COL_COMMODITY, "—")),
-                "variety": str(row.get(COL_VARIETY, "Other")),
-                "grade": str(row.get(COL_GRADE, "—")),
-                "arrival_date": arrival_date,
-                "min_price": float(row.get(COL_MIN, 0) or 0),
-                "max_price": float(row.get(COL_MAX, 0) or 0),
-                "modal_price": float(row.get(COL_MODAL, 0) or 0),
-                "commodity_code": str(row.get("Commodity_Code", "—")),
-            })
+        region_data = _load_region(filename)
+        size = region_data.size(commodity)
+
+        if not size:
+            return {"records": [], "total": 0, "page": page, "page_size": page_size, "next_cursor": None}
+
+        # Partition rows [lo, hi) fall inside the requested date range
+        if start is not None:
+            lo = region_data.seek(commodity, start)
+        elif end is not None:
+            lo = region_data.seek(commodity, None)  # skip the undated rows
+        else:
+            lo = 0
+        hi = region_data.seek(commodity, end, side="right") if end is not None else size
+        hi = max(hi, lo)
+        total = hi - lo
+
+        # Rows are sliced from the end of the date-ascending range; stop is exclusive
+        if cursor:
+            stop = min(max(_seek_cursor(region_data, commodity, cursor), lo), hi)
+        else:
+            stop = max(hi - (page - 1) * page_size, lo)
+        first = max(stop - page_size, lo)
+        page_df = region_data.rows(commodity, first, stop).iloc[::-1]
 
         return {
-            "records": records,
+            "records": to_record_rows(page_df),
             "total": total,
-            "page": page,
+            "page": None if cursor else page,
             "page_size": page_size,
+            "next_cursor": _make_cursor(region_data, commodity, first) if first > lo else None,
         }
     except Exception as e:
         return {"records": [], "total": 0, "page": page, "page_size": page_size, "error": str(e)}
 
 
+# ── Keyset cursors ──
+# A cursor names the last row already returned as "<YYYY-MM-DD>:<k>": every row
+# dated after that day has been seen, plus the first k rows of that day.
+# Undated rows (listed last) use "undated:<k>".
+
+def _make_cursor(region_data: RegionData, commodity: str, pos: int) -> str:
+    day = region_data.rows(commodity, pos, pos + 1)[COL_DATE].iloc[0]
+    if pd.isna(day):
+        return f"undated:{region_data.seek(commodity, None) - pos}"
+    return f"{day:%Y-%m-%d}:{region_data.seek(commodity, day, side='right') - pos}"
+
+
+def _seek_cursor(region_data: RegionData, commodity: str, cursor: str) -> int:
+    day, _, seen = cursor.rpartition(":")
+    if not day or not seen.isdigit():
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if day == "undated":
+        day_end = region_data.seek(commodity, None)
+    else:
+        day_end = region_data.seek(commodity, pd.Timestamp(day), side="right")
+    return max(day_end - int(seen), 0)
+
+
+def _price(row: pd.Series, col: str, default: float) -> float:
+    """row[col] as a float, or default when the column is missing, blank (NaN) or zero."""
+    value = row.get(col)
+    return float(value) if pd.notna(value) and value else default
+
+
 def _error_result(region: str, commodity: str, reason: str) -> dict:
     return {
         "commodity":    commodity,
@@ -0,0 +1,112 @@
+"""
+Market Anomalies — Domain Layer
+Recent outlier quotes across every region, from the anomaly tables the
+load-time outlier pass keeps on each RegionData (see market_outliers).
+
+Nothing is rescored per request: each region's tables are concatenated
+once per region version and memoised beside its screener blocks, then
+filtered to the last `days` days and sorted.
+"""
+
+import asyncio
+
+import pandas as pd
+
+from .market_analyze import _load_region, get_available_filters
+from .market_columns import COL_DATE, COL_GRADE, COL_MARKET, COL_VARIETY
+from .market_executor import run_in_market_pool
+from .market_index import RegionData, commodity_key
+from .market_manifest import split_region_id
+from .market_outliers import ANOMALY_COLUMNS
+
+REPORT_COLUMNS = ["region", "state", "district", "commodity", *ANOMALY_COLUMNS]
+
+
+async def get_market_anomalies(
+    days:      int = 30,
+    state:     str | None = None,
+    region:    str | None = None,
+    commodity: str | None = None,
+    limit:     int = 100,
+) -> dict:
+    """
+    Outlier quotes dated within the last `days` days up to the newest quote
+    of the selected regions, newest (then most extreme) first.
+    """
+    filters = await run_in_market_pool(get_available_filters)
+    regions = [
+        r for r in sorted(filters["regions"])
+        if (not region or r.lower() == region.lower())
+        and (not state or split_region_id(r)[0].lower() == state.lower())
+    ]
+    blocks = await asyncio.gather(*(run_in_market_pool(region_anomalies, r) for r in regions))
+    return await run_in_market_pool(_select, list(blocks), days, commodity, limit)
+
+
+def region_anomalies(region: str) -> tuple[pd.DataFrame, pd.Timestamp | None]:
+    """Every flagged quote of one region plus its newest quote day (memoised per region version)."""
+    try:
+        data = _load_region(f"{region}.csv")
+    except FileNotFoundError:
+        return pd.DataFrame(columns=REPORT_COLUMNS), None
+
+    block = data.derived.get("anomalies")
+    if block is None:
+        block = _collect(data, region)
+        data.derived["anomalies"] = block
+    return block
+
+
+def _collect(data: RegionData, region: str) -> tuple[pd.DataFrame, pd.Timestamp | None]:
+    names = {commodity_key(name): name for name in data.commodities()}
+    state, district = split_region_id(region)
+    tables = [
+        table.assign(region=region, state=state, district=district, commodity=names.get(key, key))
+        for key, table in data.anomalies.items() if len(table)
+    ]
+    frame = pd.concat(tables, ignore_index=True)[REPORT_COLUMNS] if tables else pd.DataFrame(columns=REPORT_COLUMNS)
+
+    last_days = [daily[COL_DATE].iloc[-1] for daily in data.rollups.values() if len(daily)]
+    return frame, max(last_days) if last_days else None
+
+
+def _select(
+    blocks: list[tuple[pd.DataFrame, pd.Timestamp | None]],
+    days: int,
+    commodity: str | None,
+    limit: int,
+) -> dict:
+    last_days = [last for _, last in blocks if last is not None]
+    frames    = [frame for frame, _ in blocks if len(frame)]
+    if not last_days or not frames:
+        return {"days": days, "since": None, "total": 0, "count": 0, "results": []}
+
+    since = max(last_days) - pd.Timedelta(days=days - 1)
+    frame = pd.concat(frames, ignore_index=True)
+    mask  = (frame[COL_DATE] >= since).to_numpy()
+    if commodity:
+        mask = mask & (frame["commodity"].str.lower() == commodity.strip().lower()).to_numpy()
+    frame = frame[mask].sort_values([COL_DATE, "score"], ascending=False, kind="stable")
+
+    page = frame.head(limit)
+    rows = pd.DataFrame({
+        "region":        page["region"],
+        "state":         page["state"],
+        "district":      page["district"],
+        "commodity":     page["commodity"],
+        "date":          page[COL_DATE].dt.strftime("%Y-%m-%d"),
+        "market":        page[COL_MARKET],
+        "variety":       page[COL_VARIETY],
+        "grade":         page[COL_GRADE],
+        "price":         page["price"].round(2),
+        "expected":      page["expected"].round(2),
+        "deviation_pct": page["deviation_pct"].round(2),
+        "score":         page["score"].round(2),
+    })
+    return {
+        "days":    days,
+        "since":   f"{since:%Y-%m-%d}",
+        "total":   int(len(frame)),
+        "count":   int(len(rows)),
+        "results": rows.astype(object).where(rows.notna(), None).to_dict(orient="records"),
+    }
@@ -0,0 +1,283 @@
+"""
+Market Backtest — Domain Layer
+Replays compute_trade_recommendation over the full daily history of every
+(region, commodity) series and measures what followed each BUY / HOLD /
+SELL.
+
+For every dated day the signal is rebuilt exactly as the price card would
+have shown it that day: trend from the last two quotes on/before it,
+momentum over the last `days` daily medians, and the same scoring, all
+through the column-wise screen_* functions. Forward returns and adverse
+moves are read off a calendar-day grid of daily medians: the exit is the
+first quote on/after day + horizon, and the adverse move is the worst
+excursion against the action within (day, day + horizon].
+
+Per-region signal tables are memoised on the region like screener blocks;
+a request only filters and aggregates them.
+"""
+
+import asyncio
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .market_analyze import _load_region, get_available_filters
+from .market_columns import COL_DATE, COL_MODAL
+from .market_executor import run_in_market_pool
+from .market_index import RegionData
+from .market_manifest import split_region_id
+from .market_signals import screen_buyer_signal, screen_trade_recommendation
+
+HORIZONS    = (7, 14, 30)
+RISK_LEVELS = ("Low", "Moderate", "High")
+ACTIONS     = ("BUY", "HOLD", "SELL")
+EXIT_GAP    = 7         # an exit quote may come at most this many days after day + horizon
+
+EVENT_COLUMNS = ["region", "state", "district", "commodity", "date", "action", "score"]
+
+
+async def get_market_backtest(
+    days:       int = 14,
+    horizons:   tuple[int, ...] = HORIZONS,
+    risk_level: str = "Low",
+    hold_band:  float = 2.0,
+    state:      str | None = None,
+    region:     str | None = None,
+    commodity:  str | None = None,
+    exclude_anomalies: bool = False,
+) -> dict:
+    """
+    Forward returns, hit rate and adverse moves per action and per score,
+    for every horizon, over every dated day of the selected series.
+    A BUY hits when the price rose, a SELL when it fell, and a HOLD when it
+    moved less than hold_band percent either way.
+    """
+    if risk_level not in RISK_LEVELS:
+        raise ValueError(f"risk_level must be one of {', '.join(RISK_LEVELS)}")
+    horizons = tuple(sorted(set(horizons)))
+    if not horizons or min(horizons) < 1 or max(horizons) > 365:
+        raise ValueError("horizons must be between 1 and 365 days")
+
+    filters = await run_in_market_pool(get_available_filters)
+    regions = [
+        r for r in sorted(filters["regions"])
+        if (not region or r.lower() == region.lower())
+        and (not state or split_region_id(r)[0].lower() == state.lower())
+    ]
+    blocks = await asyncio.gather(*(
+        run_in_market_pool(region_backtest, r, days, horizons, risk_level, exclude_anomalies) for r in regions
+    ))
+    return await run_in_market_pool(_report, list(blocks), days, horizons, risk_level, hold_band, commodity)
+
+
+def region_backtest(
+    region: str,
+    days: int = 14,
+    horizons: tuple[int, ...] = HORIZONS,
+    risk_level: str = "Low",
+    exclude_anomalies: bool = False,
+) -> pd.DataFrame:
+    """One row per (commodity, dated day) of one region (memoised per region version)."""
+    try:
+        data = _load_region(f"{region}.csv")
+    except FileNotFoundError:
+        return _empty_events(horizons)
+    if exclude_anomalies:
+        data = data.without_anomalies()
+
+    memo  = ("backtest", days, horizons, risk_level)
+    block = data.derived.get(memo)
+    if block is None:
+        block = _replay(data, region, days, horizons, risk_level)
+        data.derived[memo] = block
+    return block
+
+
+def _empty_events(horizons: tuple[int, ...]) -> pd.DataFrame:
+    return pd.DataFrame(columns=EVENT_COLUMNS + [f"{kind}_{h}" for h in horizons for kind in ("return", "adverse")])
+
+
+def _replay(data: RegionData, region: str, days: int, horizons: tuple[int, ...], risk_level: str) -> pd.DataFrame:
+    series = []
+    for name in data.commodities():
+        daily = data.daily(name)
+        if len(daily):
+            series.append((name, daily, *_quotes_as_of(data, name, daily[COL_DATE].to_numpy())))
+    if not series:
+        return _empty_events(horizons)
+
+    # Signals for every day of every series in one pass
+    dates  = np.concatenate([daily[COL_DATE].to_numpy() for _, daily, _, _ in series])
+    latest = np.concatenate([latest for _, _, latest, _ in series])
+    prev   = np.concatenate([prev for _, _, _, prev in series])
+    change = np.concatenate([_momentum_change(daily["median"].to_numpy(dtype=np.float64), days) for _, daily, _, _ in series])
+
+    price_change = np.round(latest - prev, 2)
+    trend    = np.where(price_change > 0, "up", np.where(price_change < 0, "down", "stable"))
+    momentum = np.where(change > 2, "rising", np.where(change < -2, "falling", "neutral"))
+    buyer    = screen_buyer_signal(np.zeros(len(trend)), trend)   # no arrival volumes in the CSVs
+    signal   = screen_trade_recommendation(trend, buyer, momentum, risk_level)
+    action   = signal["action"].to_numpy()
+
+    state, district = split_region_id(region)
+    events = pd.DataFrame({
+        "region":    region,
+        "state":     state,
+        "district":  district,
+        "commodity": np.concatenate([np.full(len(daily), name, dtype=object) for name, daily, _, _ in series]),
+        "date":      dates,
+        "action":    action,
+        "score":     signal["score"].to_numpy(),
+    })
+
+    start = 0
+    outcomes = {f"{kind}_{h}": np.full(len(events), np.nan) for h in horizons for kind in ("return", "adverse")}
+    for _, daily, _, _ in series:
+        stop = start + len(daily)
+        for h in horizons:
+            ret, low, high = _forward(daily, h)
+            acted = action[start:stop]
+            outcomes[f"return_{h}"][start:stop] = ret
+            outcomes[f"adverse_{h}"][start:stop] = np.select(
+                [acted == "BUY", acted == "SELL"],
+                [np.maximum(-low, 0.0), np.maximum(high, 0.0)],
+                default=np.maximum(np.abs(low), np.abs(high)),
+            )
+        start = stop
+    return events.assign(**outcomes)
+
+
+def _quotes_as_of(data: RegionData, commodity: str, days: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Latest and previous quote on/before each day, as market_snapshot() would pick them."""
+    part  = data.partition(commodity)
+    modal = part[COL_MODAL].to_numpy(dtype=np.float64)
+    dates = part[COL_DATE].to_numpy()
+    if data.exclude_anomalies:
+        keep = ~data.anomaly_flags(commodity)
+        modal, dates = modal[keep], dates[keep]
+    undated = int(pd.isna(dates).sum())
+    stop = undated + np.searchsorted(dates[undated:], days, side="right")
+    latest = modal[stop - 1]
+    prev   = np.where(stop >= 2, modal[np.maximum(stop - 2, 0)], latest)
+    return latest, prev
+
+
+def _momentum_change(median: np.ndarray, days: int) -> np.ndarray:
+    """compute_price_momentum's change_pct over the last `days` daily medians, at every day."""
+    prices = median.round(2)
+    first  = prices[np.maximum(np.arange(len(prices)) - days + 1, 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.round((prices - first) / first * 100, 2)
+    change[0] = 0.0                                   # a single price has no momentum
+    return np.nan_to_num(change, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _forward(daily: pd.DataFrame, horizon: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    % return to the first quote on/after day + horizon, and the lowest and
+    highest % move within (day, day + horizon], for every day of daily.
+    NaN where the horizon runs past the data.
+    """
+    dates  = daily[COL_DATE].to_numpy()
+    pos    = (dates - dates[0]) // np.timedelta64(1, "D")
+    grid   = np.full(int(pos[-1]) + 1, np.nan)
+    grid[pos] = daily["median"].to_numpy(dtype=np.float64)
+    entry  = grid[pos]
+
+    exits = pd.Series(grid).bfill(limit=EXIT_GAP).to_numpy()
+    ret   = np.full(len(pos), np.nan)
+    low   = np.full(len(pos), np.nan)
+    high  = np.full(len(pos), np.nan)
+    ok    = pos + horizon < len(grid)
+    if not ok.any():
+        return ret, low, high
+    ret[ok] = (exits[pos[ok] + horizon] / entry[ok] - 1) * 100
+
+    windows = np.lib.stride_tricks.sliding_window_view(grid, horizon)[pos[ok] + 1]   # (day, day + horizon]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)      # windows without a quote stay NaN
+        low[ok]  = (np.nanmin(windows, axis=1) / entry[ok] - 1) * 100
+        high[ok] = (np.nanmax(windows, axis=1) / entry[ok] - 1) * 100
+    return ret, low, high
+
+
+def _report(
+    blocks: list[pd.DataFrame],
+    days: int,
+    horizons: tuple[int, ...],
+    risk_level: str,
+    hold_band: float,
+    commodity: str | None,
+) -> dict:
+    blocks = [b for b in blocks if len(b)]
+    events = pd.concat(blocks, ignore_index=True) if blocks else _empty_events(horizons)
+    if commodity:
+        events = events[events["commodity"].str.lower() == commodity.strip().lower()]
+
+    actions, scores, baseline = [], [], []
+    for h in horizons:
+        ret = events[f"return_{h}"].astype(float)
+        done = events[ret.notna()]
+        r    = ret[ret.notna()]
+        hit  = np.select(
+            [done["action"] == "BUY", done["action"] == "SELL"],
+            [r > 0, r < 0],
+            default=r.abs() <= hold_band,
+        )
+        frame = pd.DataFrame({
+            "action": done["action"], "score": done["score"].astype(int),
+            "ret": r, "hit": hit, "up": r > 0, "adverse": done[f"adverse_{h}"].astype(float),
+        })
+        baseline.append({
+            "horizon":     h,
+            "evaluated":   int(len(frame)),
+            "mean_return": _num(frame["ret"].mean()),
+            "up_rate":     _pct(frame["up"].mean()),
+        })
+        by_action = frame.groupby("action")
+        for act in ACTIONS:
+            if act not in by_action.groups:
+                actions.append({"action": act, "horizon": h, "evaluated": 0})
+                continue
+            g = by_action.get_group(act)
+            actions.append({
+                "action":        act,
+                "horizon":       h,
+                "evaluated":     int(len(g)),
+                "mean_return":   _num(g["ret"].mean()),
+                "median_return": _num(g["ret"].median()),
+                "hit_rate":      _pct(g["hit"].mean()),
+                "mean_adverse":  _num(g["adverse"].mean()),
+                "max_adverse":   _num(g["adverse"].max()),
+            })
+        for score, g in frame.groupby("score", sort=True):
+            scores.append({
+                "score":       int(score),
+                "horizon":     h,
+                "evaluated":   int(len(g)),
+                "mean_return": _num(g["ret"].mean()),
+                "up_rate":     _pct(g["up"].mean()),
+            })
+
+    counts = events["action"].value_counts()
+    return {
+        "days":       days,
+        "horizons":   list(horizons),
+        "risk_level": risk_level,
+        "hold_band":  hold_band,
+        "series":     int(events[["region", "commodity"]].drop_duplicates().shape[0]),
+        "signals":    int(len(events)),
+        "signal_counts": {act: int(counts.get(act, 0)) for act in ACTIONS},
+        "baseline":   baseline,
+        "actions":    actions,
+        "scores":     scores,
+    }
+
+
+def _num(value) -> float | None:
+    return round(float(value), 2) if pd.notna(value) else None
+
+
+def _pct(value) -> float | None:
+    return round(float(value) * 100, 1) if pd.notna(value) else None
@@ -0,0 +1,226 @@
+"""
+Market Cache — Domain Layer
+Byte-budgeted LRU cache for loaded regions, and the memo tables they grow by.
+
+Entries are sized with DataFrame.memory_usage(deep=True) and tagged with
+the source file's version (mtime, size); a lookup with a different version
+drops the stale entry. Least-recently-used regions are evicted until the
+total fits MARKET_CACHE_MAX_BYTES. A resident entry that grows (a region
+adding memos) is re-sized in place with resize(), which evicts the same
+way.
+
+MemoTable is the per-region memo those entries grow by: a dict that keeps
+the estimated bytes of its values and, when given a limit, drops its
+least-recently-used entries beyond that many.
+"""
+
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+class ByteBudgetCache:
+    """
+    LRU cache bounded by total bytes rather than entry count.
+    A single value larger than the whole budget is still kept (alone), so a
+    huge region stays hot instead of being re-loaded on every request.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[Hashable, Any, int]] = OrderedDict()  # key → (version, value, nbytes)
+        self._bytes = 0
+        self._lock  = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: str, version: Hashable) -> Any | None:
+        """Return the cached value for key if it was stored for this version."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] != version:
+                self._drop(key)
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, version: Hashable, value: Any, nbytes: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (version, value, nbytes)
+            self._bytes += nbytes
+            self._evict()
+
+    def resize(self, key: str, version: Hashable, nbytes: int) -> None:
+        """Re-charge a resident entry at its new size; a no-op if it is gone or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return
+            self._bytes += nbytes - entry[2]
+            self._entries[key] = (entry[0], entry[1], nbytes)
+            self._evict()
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one entry, or every entry when key is None."""
+        with self._lock:
+            keys = list(self._entries) if key is None else [key]
+            for k in keys:
+                if k in self._entries:
+                    self._drop(k)
+                    self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_bytes":     self.max_bytes,
+                "bytes":         self._bytes,
+                "entries":       len(self._entries),
+                "hits":          self.hits,
+                "misses":        self.misses,
+                "evictions":     self.evictions,
+                "invalidations": self.invalidations,
+                "resident":      {k: nbytes for k, (_, _, nbytes) in self._entries.items()},
+            }
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+
+class MemoTable:
+    """
+    Memo dict that tracks the estimated bytes of its values (estimate_nbytes,
+    not counting objects in `shared`, which the owner already pays for) and
+    keeps at most `limit` entries, least-recently-used first out. on_change
+    is called after every insert or removal, outside the table's lock.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[tuple[Hashable, Any]] = (),
+        limit: int | None = None,
+        shared: Callable[[], set[int]] | None = None,
+        on_change: Callable[[], None] | None = None,
+    ):
+        self.limit  = limit
+        self.shared = shared
+        self.on_change = on_change
+        self.nbytes = 0
+        self._lock  = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()  # key → (value, nbytes)
+        for key, value in items:
+            self._set(key, value)
+
+    def copy(
+        self,
+        shared: Callable[[], set[int]] | None = None,
+        on_change: Callable[[], None] | None = None,
+    ) -> "MemoTable":
+        """Same entries (sizes included) with new hooks."""
+        memo = MemoTable(limit=self.limit, shared=shared, on_change=on_change)
+        with self._lock:
+            memo._entries = OrderedDict(self._entries)
+            memo.nbytes   = self.nbytes
+        return memo
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries[key][0]
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._set(key, value)
+        self._changed()
+
+    def update(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        for key, value in items:
+            self._set(key, value)
+        self._changed()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.nbytes -= entry[1]
+        self._changed()
+        return entry[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _set(self, key: Hashable, value: Any) -> None:
+        # Sized before locking: walking a large value is the slow part
+        nbytes = estimate_nbytes(value, set(self.shared()) if self.shared else set())
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.limit is not None and len(self._entries) > self.limit:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self.nbytes -= dropped
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+
+def estimate_nbytes(value: Any, seen: set[int] | None = None) -> int:
+    """
+    Approximate memory held by value: frames and arrays by their buffers,
+    containers and plain objects by walking their contents. Objects whose
+    id is in seen are not counted (again).
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(estimate_nbytes(k, seen) + estimate_nbytes(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        return size + sum(estimate_nbytes(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_nbytes(vars(value), seen)
+    slots = getattr(type(value), "__slots__", ())
+    return size + sum(estimate_nbytes(getattr(value, name, None), seen) for name in slots)
@@ -0,0 +1,21 @@
+"""
+Market Columns — Domain Layer
+Canonical column names for normalised region frames, shared by every
+market module so none of them has to import market_analyze.
+"""
+
+COL_STATE     = "State"
+COL_DISTRICT  = "District"
+COL_MARKET    = "Market"
+COL_COMMODITY = "Commodity"
+COL_VARIETY   = "Variety"
+COL_GRADE     = "Grade"
+COL_DATE      = "Arrival_Date"
+COL_MIN       = "Min_Price"
+COL_MAX       = "Max_Price"
+COL_MODAL     = "Modal_Price"
+
+# Column types once normalised: text labels, Arrival_Date as datetime64[ns]
+# and prices as float64 (columns outside these are carried as text)
+TEXT_COLUMNS  = [COL_STATE, COL_DISTRICT, COL_MARKET, COL_COMMODITY, COL_VARIETY, COL_GRADE]
+PRICE_COLUMNS = [COL_MIN, COL_MAX, COL_MODAL]
@@ -0,0 +1,197 @@
+"""
+Market Correlation — Domain Layer
+How commodities move together: correlation and covariance of daily log
+returns for every commodity of a region, or of a whole state.
+
+Returns are taken on a calendar-day grid (a return only where both days
+are quoted); a state's return for a commodity on a day is the mean over
+its districts. All pairs come from a handful of matrix products over the
+day × commodity return matrix, using only the days both commodities were
+quoted (pairwise-complete). The result is cached per scope and window,
+tagged with the versions of every region it was built from.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from .market_analyze import _load_region, get_available_filters
+from .market_cache import ByteBudgetCache
+from .market_columns import COL_DATE
+from .market_executor import run_in_market_pool
+from .market_index import commodity_key
+from .market_manifest import split_region_id
+
+CORRELATION_CACHE_BYTES = 32 * 1024 * 1024
+
+_CORRELATION_CACHE = ByteBudgetCache(CORRELATION_CACHE_BYTES)
+
+
+async def get_market_correlation(
+    region:      str | None = None,
+    state:       str | None = None,
+    days:        int = 180,
+    commodity:   str | None = None,
+    top:         int = 5,
+    min_overlap: int = 20,
+    exclude_anomalies: bool = True,
+) -> dict:
+    """
+    Correlation/covariance matrices of daily log returns over the last
+    `days` days, for one region or every region of a state. With a
+    commodity, also its `top` most correlated commodities and its `top`
+    best diversifiers (lowest correlation). Pairs quoted together on fewer
+    than min_overlap days are left empty. Outlier quotes are excluded by
+    default, since a single one dominates a return correlation.
+    """
+    if not region and not state:
+        raise ValueError("region or state is required")
+    filters = await run_in_market_pool(get_available_filters)
+    if region:
+        scope, name = "region", region
+        regions = [r for r in sorted(filters["regions"]) if r.lower() == region.lower()]
+    else:
+        scope, name = "state", state
+        regions = [r for r in sorted(filters["regions"]) if split_region_id(r)[0].lower() == state.lower()]
+    if not regions:
+        raise ValueError(f"No market data for {scope} '{name}'")
+
+    loaded = await asyncio.gather(*(run_in_market_pool(_region_dailies, r, exclude_anomalies) for r in regions))
+    return await run_in_market_pool(
+        _correlation, scope, name, regions, loaded, days, commodity, top, min_overlap, exclude_anomalies,
+    )
+
+
+def get_correlation_cache_stats() -> dict:
+    """Hit/miss/eviction/invalidation counters of the correlation cache."""
+    return _CORRELATION_CACHE.stats()
+
+
+def _region_dailies(region: str, exclude_anomalies: bool) -> tuple[tuple, dict[str, pd.DataFrame]]:
+    data = _load_region(f"{region}.csv")
+    if exclude_anomalies:
+        data = data.without_anomalies()
+    return data.version, {name: data.daily(name) for name in data.commodities()}
+
+
+def _correlation(
+    scope: str,
+    name: str,
+    regions: list[str],
+    loaded: list[tuple[tuple, dict[str, pd.DataFrame]]],
+    days: int,
+    commodity: str | None,
+    top: int,
+    min_overlap: int,
+    exclude_anomalies: bool,
+) -> dict:
+    version = tuple((region, v) for region, (v, _) in zip(regions, loaded))
+    key     = f"{scope}:{name.lower()}:{days}:{int(exclude_anomalies)}"
+    matrix  = _CORRELATION_CACHE.get(key, version)
+    if matrix is None:
+        matrix = correlation_matrix([dailies for _, dailies in loaded], days)
+        nbytes = sum(a.nbytes for a in matrix.values() if isinstance(a, np.ndarray))
+        _CORRELATION_CACHE.put(key, version, matrix, nbytes)
+
+    thin = matrix["overlap"] < min_overlap
+    corr = np.where(thin, np.nan, matrix["correlation"])
+    cov  = np.where(thin, np.nan, matrix["covariance"])
+    result = {
+        "scope":       scope,
+        "name":        name,
+        "regions":     regions,
+        "days":        days,
+        "window":      matrix["window"],
+        "commodities": matrix["commodities"],
+        "correlation": _grid(corr, 4),
+        "covariance":  _grid(cov, 8),
+        "overlap":     matrix["overlap"].tolist(),
+    }
+    if commodity:
+        result.update(_neighbours(matrix["commodities"], corr, matrix["overlap"], commodity, top))
+    return result
+
+
+def correlation_matrix(region_dailies: list[dict[str, pd.DataFrame]], days: int) -> dict:
+    """
+    Pairwise-complete correlation and covariance of daily log returns.
+    region_dailies holds one {commodity name: daily rollup} per region;
+    commodities are matched across regions case-insensitively.
+    """
+    names: dict[str, str] = {}
+    for dailies in region_dailies:
+        for commodity, daily in dailies.items():
+            if len(daily):
+                names.setdefault(commodity_key(commodity), commodity)
+    keys = sorted(names)
+    last = [daily[COL_DATE].iloc[-1] for dailies in region_dailies for daily in dailies.values() if len(daily)]
+    if not keys or not last:
+        empty = np.empty((0, 0))
+        return {"commodities": [], "window": None, "correlation": empty, "covariance": empty,
+                "overlap": np.empty((0, 0), dtype=np.int64)}
+
+    # day × commodity mean return over regions, accumulated one region at a time
+    # on the calendar grid (one extra day for the first return)
+    end    = max(last)
+    first  = end - pd.Timedelta(days=days)
+    column = {key: i for i, key in enumerate(keys)}
+    total  = np.zeros((days, len(keys)))
+    counts = np.zeros((days, len(keys)), dtype=np.int64)
+    grid   = np.empty((days + 1, len(keys)))
+    for dailies in region_dailies:
+        grid.fill(np.nan)
+        for commodity, daily in dailies.items():
+            dates = daily[COL_DATE].to_numpy()
+            lo    = int(np.searchsorted(dates, np.datetime64(first, "ns")))
+            pos   = (dates[lo:] - np.datetime64(first, "ns")) // np.timedelta64(1, "D")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                grid[pos, column[commodity_key(commodity)]] = np.log(daily["median"].to_numpy(dtype=np.float64)[lo:])
+        region_returns = np.diff(grid, axis=0)            # NaN unless both days quoted
+        quoted = np.isfinite(region_returns)
+        total  += np.where(quoted, region_returns, 0.0)
+        counts += quoted
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.where(counts > 0, total / np.maximum(counts, 1), np.nan)
+
+    # Pairwise sums over the days both commodities have a return
+    quoted = np.isfinite(returns).astype(np.float64)
+    x      = np.where(quoted > 0, returns, 0.0)
+    n      = quoted.T @ quoted                            # [i, j] days both quoted
+    sx     = x.T @ quoted                                 # [i, j] Σ x_i over those days
+    sxx    = (x * x).T @ quoted                           # [i, j] Σ x_i² over those days
+    sxy    = x.T @ x                                      # [i, j] Σ x_i·x_j
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov  = (sxy - sx * sx.T / n) / (n - 1)
+        var  = (sxx - sx * sx / n) / (n - 1)              # var of i over the days shared with j
+        corr = cov / np.sqrt(var * var.T)
+    cov  = np.where(n > 1, cov, np.nan)
+    corr = np.where(n > 1, np.clip(corr, -1.0, 1.0), np.nan)
+
+    return {
+        "commodities": [names[key] for key in keys],
+        "window":      {"from": f"{first + pd.Timedelta(days=1):%Y-%m-%d}", "to": f"{end:%Y-%m-%d}"},
+        "correlation": corr,
+        "covariance":  cov,
+        "overlap":     n.astype(np.int64),
+    }
+
+
+def _neighbours(names: list[str], corr: np.ndarray, overlap: np.ndarray, commodity: str, top: int) -> dict:
+    """Most and least correlated other commodities of one commodity."""
+    keys = [commodity_key(name) for name in names]
+    if commodity_key(commodity) not in keys:
+        return {"commodity": commodity, "similar": [], "diversifiers": []}
+    i      = keys.index(commodity_key(commodity))
+    others = [j for j in range(len(names)) if j != i and np.isfinite(corr[i, j])]
+    ranked = sorted(others, key=lambda j: corr[i, j], reverse=True)
+    rows   = [
+        {"commodity": names[j], "correlation": round(float(corr[i, j]), 4), "overlap": int(overlap[i, j])}
+        for j in ranked
+    ]
+    return {"commodity": names[i], "similar": rows[:top], "diversifiers": rows[::-1][:top]}
+
+
+def _grid(values: np.ndarray, digits: int) -> list[list[float | None]]:
+    rounded = np.round(values, digits)
+    return [[float(v) if np.isfinite(v) else None for v in row] for row in rounded]
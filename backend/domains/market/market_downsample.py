@@ -0,0 +1,139 @@
+"""
+Market Downsampling — Domain Layer
+Keeps long-range charts to a bounded number of points.
+
+week / month — OHLC bars built from a commodity's daily rollup: open and
+               close are the first and last daily medians of the period,
+               high and low the extreme modal quotes, count the quotes.
+               Built once per commodity and refreshed from the appended
+               period onwards, like the daily rollups themselves.
+lttb         — largest-triangle-three-buckets: picks the daily points that
+               best preserve the visual shape, for a fixed point budget.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .market_columns import COL_DATE
+
+RESOLUTIONS  = ("auto", "day", "week", "month", "lttb")
+PERIODS      = {"week": "W", "month": "M"}
+CHART_POINTS = 300   # default point budget for "auto" and "lttb"
+
+OHLC_COLUMNS = [COL_DATE, "open", "high", "low", "close", "count", "last_day"]
+
+
+def empty_ohlc() -> pd.DataFrame:
+    return pd.DataFrame({
+        COL_DATE:   pd.Series(dtype="datetime64[ns]"),
+        "open":     pd.Series(dtype="float64"),
+        "high":     pd.Series(dtype="float64"),
+        "low":      pd.Series(dtype="float64"),
+        "close":    pd.Series(dtype="float64"),
+        "count":    pd.Series(dtype="int64"),
+        "last_day": pd.Series(dtype="datetime64[ns]"),
+    })
+
+
+def period_start(day: pd.Timestamp, resolution: str) -> pd.Timestamp:
+    """First day of the week (Monday) or month containing day."""
+    return day.to_period(PERIODS[resolution]).start_time
+
+
+def build_ohlc(daily: pd.DataFrame, resolution: str) -> pd.DataFrame:
+    """One OHLC bar per week/month of a daily rollup, labelled by period start."""
+    if daily.empty:
+        return empty_ohlc()
+    period = daily[COL_DATE].dt.to_period(PERIODS[resolution])
+    groups = daily.groupby(period.to_numpy(), sort=True)
+    bars = pd.DataFrame({
+        "open":     groups["median"].first(),
+        "high":     groups["max"].max(),
+        "low":      groups["min"].min(),
+        "close":    groups["median"].last(),
+        "count":    groups["count"].sum(),
+        "last_day": groups[COL_DATE].max(),
+    })
+    bars.insert(0, COL_DATE, bars.index.to_timestamp().as_unit("ns"))
+    return bars.reset_index(drop=True)[OHLC_COLUMNS]
+
+
+def merge_ohlc(bars: pd.DataFrame, daily: pd.DataFrame, since: pd.Timestamp, resolution: str) -> pd.DataFrame:
+    """Refresh bars after an append: periods from the one containing since are rebuilt."""
+    first = period_start(since, resolution)
+    lo    = int(daily[COL_DATE].searchsorted(first, side="left"))
+    kept  = bars[bars[COL_DATE] < first]
+    return pd.concat([kept, build_ohlc(daily.iloc[lo:], resolution)], ignore_index=True)[OHLC_COLUMNS]
+
+
+def window_ohlc(bars: pd.DataFrame, window: pd.DataFrame, resolution: str) -> pd.DataFrame:
+    """
+    OHLC bars for a slice of the daily rollup. Periods wholly inside the
+    slice come from the prebuilt bars; the partial periods at either edge
+    are rebuilt from the slice.
+    """
+    if window.empty:
+        return empty_ohlc()
+    first_day = window[COL_DATE].iloc[0]
+    last_day  = window[COL_DATE].iloc[-1]
+
+    starts = bars[COL_DATE].to_numpy()
+    lo = int(np.searchsorted(starts, np.datetime64(first_day, "ns"), side="left"))
+    hi = lo + int(np.searchsorted(bars["last_day"].to_numpy()[lo:], np.datetime64(last_day, "ns"), side="right"))
+    inner = bars.iloc[lo:hi]   # periods starting on/after first_day and ending by last_day
+    if inner.empty:
+        return build_ohlc(window, resolution)
+
+    dates = window[COL_DATE]
+    head  = window[dates < inner[COL_DATE].iloc[0]]
+    tail  = window[dates > inner["last_day"].iloc[-1]]
+    return pd.concat(
+        [build_ohlc(head, resolution), inner, build_ohlc(tail, resolution)], ignore_index=True,
+    )[OHLC_COLUMNS]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Positions of the points kept by largest-triangle-three-buckets.
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    n = len(y)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)   # points-2 buckets over (0, n-1)
+    kept  = np.empty(points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    prev = 0
+    for b in range(points - 2):
+        start, stop = edges[b], edges[b + 1]
+        nxt_start, nxt_stop = stop, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[nxt_start:nxt_stop].mean()
+        avg_y = y[nxt_start:nxt_stop].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        prev = start + int(area.argmax())
+        kept[b + 1] = prev
+    return kept
+
+
+def pick_resolution(n_days: int, first_day: pd.Timestamp | None, last_day: pd.Timestamp | None, points: int) -> str:
+    """
+    Resolution for resolution="auto": daily when it fits the point budget,
+    else the finest of week/month that does, else LTTB over the days.
+    """
+    if n_days <= points or first_day is None:
+        return "day"
+    span = (last_day - first_day).days
+    if span // 7 + 1 <= points:
+        return "week"
+    if (last_day.year - first_day.year) * 12 + last_day.month - first_day.month + 1 <= points:
+        return "month"
+    return "lttb"
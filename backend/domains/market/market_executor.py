@@ -0,0 +1,59 @@
+"""
+Market Executor — Domain Layer
+Bounded worker pool for blocking pandas work in the market domain.
+
+CSV parsing, grouping and sorting are synchronous; running them inside an
+async endpoint stalls every other request on the worker (climate,
+satellite, vision). Market coroutines hand that work to this pool instead.
+A thread pool is used rather than a process pool so the region cache stays
+shared; pandas releases the GIL for most of its heavy kernels.
+
+Work that needs no shared state — loading and reducing a region file that
+is not resident — can go to a separate process pool instead, so many files
+are parsed in parallel. Its workers are spawned (not forked, since this
+process runs threads) on first use and kept for later calls.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from config import MARKET_PROCESSES, MARKET_WORKERS
+
+_executor = ThreadPoolExecutor(max_workers=MARKET_WORKERS, thread_name_prefix="market")
+_processes: ProcessPoolExecutor | None = None
+_processes_lock = threading.Lock()
+
+
+async def run_in_market_pool(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run fn(*args, **kwargs) on the market pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_in_market_processes(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a module-level fn(*args, **kwargs) on the market process pool, or on
+    the thread pool when MARKET_PROCESSES is 0. Arguments and result must
+    pickle. A pool broken by a dead worker is replaced on the next call.
+    """
+    global _processes
+    if MARKET_PROCESSES <= 0:
+        return await run_in_market_pool(fn, *args, **kwargs)
+
+    with _processes_lock:
+        if _processes is None:
+            _processes = ProcessPoolExecutor(max_workers=MARKET_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+        pool = _processes
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+    except BrokenProcessPool:
+        with _processes_lock:
+            if _processes is pool:
+                _processes = None
+        raise
@@ -0,0 +1,110 @@
+"""
+Market Forecast — Domain Layer
+Short-range price forecasts from a commodity's daily median: a weekly
+seasonal-naive model with drift, with 80% and 95% prediction intervals.
+
+    price(T + h) = price(T + h - 7·(k + 1)) + 7·(k + 1) · drift,   k = (h - 1) // 7
+
+Fits are batched: every commodity of a region is placed on a calendar-day
+grid (gaps forward-filled) in one day × commodity matrix, and drift,
+seasonal profile and residual spread come out of a few column-wise array
+operations. The fits are cached on RegionData beside the rollups and
+dropped only for the commodities an append touches, so a forecast is a
+lookup plus h additions.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .market_columns import COL_DATE
+
+SEASON_DAYS  = 7       # weekly seasonality of mandi trading
+FIT_DAYS     = 365     # calendar days of history each fit uses
+MIN_FIT_DAYS = 2 * SEASON_DAYS
+MODEL_NAME   = "seasonal_naive_drift"
+
+_Z80, _Z95 = 1.2816, 1.9600
+
+
+class SeasonalFit(NamedTuple):
+    """Fitted seasonal-naive-with-drift model of one daily series."""
+    last_day: pd.Timestamp
+    season:   np.ndarray     # the last SEASON_DAYS grid prices, oldest first
+    drift:    float          # average change per calendar day
+    sigma:    float          # std-dev of one-season-ahead residuals
+    days:     int            # calendar days the fit covered
+
+    def forecast(self, horizon: int) -> pd.DataFrame:
+        """Point forecast and intervals (floored at zero) for the `horizon` days after last_day."""
+        h     = np.arange(1, horizon + 1)
+        k     = (h - 1) // SEASON_DAYS
+        price = self.season[(h - 1) % SEASON_DAYS] + SEASON_DAYS * (k + 1) * self.drift
+        width = self.sigma * np.sqrt(k + 1)
+        return pd.DataFrame({
+            COL_DATE:   self.last_day + pd.to_timedelta(h, unit="D"),
+            "price":    price,
+            "lower_80": np.maximum(price - _Z80 * width, 0.0),    # prices are never negative
+            "upper_80": price + _Z80 * width,
+            "lower_95": np.maximum(price - _Z95 * width, 0.0),
+            "upper_95": price + _Z95 * width,
+        })
+
+
+def fit_seasonal(dailies: list[pd.DataFrame]) -> list[SeasonalFit | None]:
+    """
+    Fit every daily rollup at once. Each series is right-aligned on its own
+    last day, so row FIT_DAYS-1 of the grid is "today" for every column.
+    Series spanning fewer than MIN_FIT_DAYS calendar days get None.
+    """
+    grid = np.full((FIT_DAYS, len(dailies)), np.nan)
+    last_days = []
+    for col, daily in enumerate(dailies):
+        if daily.empty:
+            last_days.append(None)
+            continue
+        dates = daily[COL_DATE].to_numpy()
+        last  = dates[-1]
+        pos   = FIT_DAYS - 1 - (last - dates) // np.timedelta64(1, "D")
+        keep  = pos >= 0
+        grid[pos[keep], col] = daily["median"].to_numpy(dtype=np.float64)[keep]
+        last_days.append(pd.Timestamp(last))
+    if not dailies:
+        return []
+
+    grid   = pd.DataFrame(grid).ffill().to_numpy()
+    filled = np.isfinite(grid)
+    span   = filled.sum(axis=0)
+    first  = np.where(span > 0, FIT_DAYS - span, 0)
+    cols   = np.arange(len(dailies))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drift = (grid[-1] - grid[first, cols]) / (span - 1)
+        resid = grid[SEASON_DAYS:] - grid[:-SEASON_DAYS] - SEASON_DAYS * drift
+        count = np.isfinite(resid).sum(axis=0)
+        sigma = np.sqrt(np.nansum(resid ** 2, axis=0) / (count - 1))
+
+    return [
+        SeasonalFit(last_days[i], grid[-SEASON_DAYS:, i].copy(), float(drift[i]), float(sigma[i]), int(span[i]))
+        if span[i] >= MIN_FIT_DAYS else None
+        for i in cols
+    ]
+
+
+def forecast_points(fit: SeasonalFit | None, horizon: int) -> dict:
+    """Forecast response block: model description plus one point per day."""
+    if fit is None:
+        return {"model": MODEL_NAME, "horizon": horizon, "fitted_to": None, "points": []}
+    frame = fit.forecast(horizon)
+    dates = frame[COL_DATE].dt.strftime("%Y-%m-%d").tolist()
+    bands = frame.drop(columns=COL_DATE).round(2)
+    return {
+        "model":      MODEL_NAME,
+        "horizon":    horizon,
+        "fitted_to":  f"{fit.last_day:%Y-%m-%d}",
+        "fit_days":   fit.days,
+        "drift":      round(fit.drift, 2),
+        "sigma":      round(fit.sigma, 2),
+        "points":     [{"date": d, **row} for d, row in zip(dates, bands.to_dict("records"))],
+    }
@@ -0,0 +1,395 @@
+"""
+Market Geo — Domain Layer
+Nearest mandis to a farm: a spatial index over every Market that appears in
+the region files, answering k-nearest queries with each market's latest
+prices.
+
+Markets are located from a local gazetteer CSV (MARKET_GAZETTEER_FILE,
+resolved against backend/data/) with columns
+
+    State, District, Market, Latitude, Longitude
+
+matched on (district, market) and then on the market name alone when it is
+unique in the gazetteer; names are compared case-, space- and
+punctuation-insensitively. A market missing from the gazetteer falls back
+to its region's REGION_COORDS entry (located = "district"); otherwise it
+is left out of the index and counted as unlocated.
+
+The index buckets markets into CELL_DEG × CELL_DEG grid cells. A query
+walks the occupied cells ring by ring outwards from the farm's cell and
+stops as soon as no unvisited ring can hold anything closer than the k-th
+market found, so a lookup only measures distances to a handful of nearby
+markets.
+
+The index is built from the market lists in the region manifest, so no
+region frame is loaded to build it. Each region's located markets are kept
+per manifest entry version and only regions whose entry changed (an ingest,
+a new or edited file) are located again; a gazetteer change relocates all
+of them. Ingests show up on the next lookup; files changed outside the API
+are picked up by a manifest sync at most every SYNC_INTERVAL_S seconds.
+Latest prices are read from a per-region memo at query time, for the
+regions of the markets returned only.
+"""
+
+import re
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import MARKET_GAZETTEER_FILE
+
+from .market_analyze import DATA_DIR, REGION_COORDS, _load_region, _summary_frame
+from .market_columns import COL_DATE, COL_MARKET, COL_MAX, COL_MIN, COL_MODAL
+from .market_executor import run_in_market_pool
+from .market_index import RegionData, commodity_key
+from .market_manifest import current_manifest, sync_manifest
+
+CELL_DEG = 0.5                # grid cell size in degrees (~55 km of latitude)
+EARTH_KM = 6371.0088
+SYNC_INTERVAL_S = 30.0        # how often lookups re-scan data/ for files changed outside the API
+
+GAZETTEER_COLUMNS = {
+    "state": "state", "district": "district", "market": "market",
+    "latitude": "latitude", "lat": "latitude",
+    "longitude": "longitude", "lon": "longitude", "lng": "longitude", "long": "longitude",
+}
+
+
+def gazetteer_path() -> Path:
+    return DATA_DIR / MARKET_GAZETTEER_FILE
+
+
+def _name_key(value) -> str:
+    return re.sub(r"[^a-z0-9]", "", str(value).lower())
+
+
+def load_gazetteer(path: Path) -> pd.DataFrame:
+    """Normalised gazetteer rows (district, market, latitude, longitude, keys); empty if absent."""
+    empty = pd.DataFrame(columns=["district", "market", "latitude", "longitude", "district_key", "market_key"])
+    if not path.exists():
+        return empty
+    raw = pd.read_csv(path, dtype=str)
+    raw = raw.rename(columns={c: GAZETTEER_COLUMNS.get(c.strip().lower(), c.strip().lower()) for c in raw.columns})
+    if not {"market", "latitude", "longitude"} <= set(raw.columns):
+        print(f"Market gazetteer: {path.name} needs Market, Latitude and Longitude columns")
+        return empty
+
+    frame = pd.DataFrame({
+        "district":  raw["district"].fillna("") if "district" in raw.columns else "",
+        "market":    raw["market"].fillna(""),
+        "latitude":  pd.to_numeric(raw["latitude"], errors="coerce"),
+        "longitude": pd.to_numeric(raw["longitude"], errors="coerce"),
+    })
+    valid = frame["latitude"].between(-90, 90) & frame["longitude"].between(-180, 180) & frame["market"].str.strip().ne("")
+    frame = frame[valid].reset_index(drop=True)
+    frame["district_key"] = frame["district"].map(_name_key)
+    frame["market_key"]   = frame["market"].map(_name_key)
+    return frame
+
+
+def haversine_km(lat1: float, lon1: float, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from one point to many (all in radians)."""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class MarketIndex:
+    """
+    Located markets bucketed by grid cell. records holds one dict per market
+    (region, state, district, market, latitude, longitude, located), sorted
+    by cell; commodities[i] is the set of commodity keys market i quotes.
+    """
+
+    def __init__(self, records: list[dict], commodities: list[frozenset]):
+        lat = np.fromiter((r["latitude"] for r in records), dtype=np.float64, count=len(records))
+        lon = np.fromiter((r["longitude"] for r in records), dtype=np.float64, count=len(records))
+        cell_i = np.floor(lat / CELL_DEG).astype(np.int64)
+        cell_j = np.floor(lon / CELL_DEG).astype(np.int64)
+        order  = np.lexsort((cell_j, cell_i))
+
+        self.records     = [records[i] for i in order]
+        self.commodities = [commodities[i] for i in order]
+        self.lat = np.radians(lat[order])
+        self.lon = np.radians(lon[order])
+
+        # One entry per occupied cell: its grid position and [start, stop) in markets
+        cells = np.stack([cell_i[order], cell_j[order]], axis=1)
+        new   = np.ones(len(cells), dtype=bool)
+        new[1:] = (cells[1:] != cells[:-1]).any(axis=1)
+        self.starts = np.flatnonzero(new)
+        self.stops  = np.append(self.starts[1:], len(cells))
+        self.cell_i = cells[self.starts, 0] if len(cells) else np.zeros(0, dtype=np.int64)
+        self.cell_j = cells[self.starts, 1] if len(cells) else np.zeros(0, dtype=np.int64)
+        self._masks: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def quotes(self, commodity: str) -> np.ndarray:
+        """Per-market flag: does the market quote this commodity (cached per commodity)."""
+        key  = commodity_key(commodity)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = np.fromiter((key in names for names in self.commodities), dtype=bool, count=len(self))
+            self._masks[key] = mask
+        return mask
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_km: float | None = None,
+        commodity: str | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Positions and km distances of the k nearest markets, closest first."""
+        if not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        ci, cj = int(np.floor(lat / CELL_DEG)), int(np.floor(lon / CELL_DEG))
+        rings  = np.maximum(np.abs(self.cell_i - ci), np.abs(self.cell_j - cj))
+        order  = np.argsort(rings, kind="stable")
+        bounds = np.flatnonzero(np.diff(rings[order], prepend=-1))   # first cell of each occupied ring
+        accept = self.quotes(commodity) if commodity else None
+        rlat, rlon = np.radians(lat), np.radians(lon)
+
+        found, dist = np.zeros(0, dtype=np.int64), np.zeros(0)
+        for b, first in enumerate(bounds):
+            ring = int(rings[order[first]])
+            # Any market in this ring or beyond is at least (ring - 1) cells away in latitude or longitude
+            edge = np.radians(min(abs(lat) + (ring + 1) * CELL_DEG, 90.0))
+            span = np.radians(min(max(ring - 1, 0) * CELL_DEG, 180.0))
+            gap  = 2 * EARTH_KM * np.arcsin(np.cos(edge) * np.sin(span / 2))
+            if (max_km is not None and gap > max_km) or (len(found) >= k and dist[k - 1] <= gap):
+                break
+            last  = bounds[b + 1] if b + 1 < len(bounds) else len(order)
+            cells = order[first:last]
+            idx   = np.concatenate([np.arange(self.starts[c], self.stops[c]) for c in cells])
+            if accept is not None:
+                idx = idx[accept[idx]]
+            if not len(idx):
+                continue
+            found = np.concatenate([found, idx])
+            dist  = np.concatenate([dist, haversine_km(rlat, rlon, self.lat[idx], self.lon[idx])])
+            keep  = np.argsort(dist, kind="stable")[:k]
+            found, dist = found[keep], dist[keep]
+
+        if max_km is not None:
+            within = dist <= max_km
+            found, dist = found[within], dist[within]
+        return found, dist
+
+
+# Built index, keyed by (manifest generation, gazetteer version) it was built from
+_index: tuple[tuple, MarketIndex, int] | None = None
+_index_lock = threading.Lock()
+_synced_at  = float("-inf")
+_gazetteer_version: tuple | None = None
+
+# Gazetteer coordinates by (district key, market key) and by unique market key, per gazetteer version
+_coords: tuple[tuple | None, dict] | None = None
+# region → (manifest entry version, located market records, their commodity keys, unlocated count)
+_blocks: dict[str, tuple[tuple, list[dict], list[frozenset], int]] = {}
+
+
+def market_index() -> tuple[MarketIndex, int]:
+    """Current market index and the number of markets that could not be located."""
+    global _index, _synced_at, _gazetteer_version
+    if time.monotonic() - _synced_at >= SYNC_INTERVAL_S:
+        with _index_lock:
+            if time.monotonic() - _synced_at >= SYNC_INTERVAL_S:
+                sync_manifest(DATA_DIR, _summary_frame)
+                path = gazetteer_path()
+                stat = path.stat() if path.exists() else None
+                _gazetteer_version = (stat.st_mtime_ns, stat.st_size) if stat else None
+                _synced_at = time.monotonic()
+
+    manifest, generation = current_manifest(DATA_DIR)
+    version = (generation, _gazetteer_version)
+    index = _index
+    if index and index[0] == version:
+        return index[1], index[2]
+
+    with _index_lock:
+        if _index is None or _index[0] != version:
+            _index = (version, *_build_index(manifest, version[1]))
+    return _index[1], _index[2]
+
+
+def _build_index(manifest: dict[str, dict], gazetteer_version: tuple | None) -> tuple[MarketIndex, int]:
+    """Index of every region's located markets, locating only regions whose manifest entry changed."""
+    global _coords
+    if _coords is None or _coords[0] != gazetteer_version:
+        _coords = (gazetteer_version, _gazetteer_coords(load_gazetteer(gazetteer_path())))
+        _blocks.clear()
+    for region in set(_blocks) - set(manifest):
+        del _blocks[region]
+
+    records, commodities, unlocated = [], [], 0
+    for region in sorted(manifest):
+        entry = manifest[region]
+        stamp = (entry["mtime_ns"], entry["size"])
+        block = _blocks.get(region)
+        if block is None or block[0] != stamp:
+            block = (stamp, *_locate_markets(region, entry, _coords[1]))
+            _blocks[region] = block
+        records += block[1]
+        commodities += block[2]
+        unlocated += block[3]
+    return MarketIndex(records, commodities), unlocated
+
+
+def _gazetteer_coords(gazetteer: pd.DataFrame) -> dict:
+    counts = gazetteer["market_key"].value_counts()
+    coords = {}
+    for d, m, lat, lon in zip(gazetteer["district_key"], gazetteer["market_key"],
+                              gazetteer["latitude"], gazetteer["longitude"]):
+        coords[d, m] = (float(lat), float(lon))
+        if counts[m] == 1:
+            coords[m] = (float(lat), float(lon))
+    return coords
+
+
+def _locate_markets(region: str, entry: dict, coords: dict) -> tuple[list[dict], list[frozenset], int]:
+    """Records and commodity keys of a region's markets that can be located, and how many cannot."""
+    records, commodities, unlocated = [], [], 0
+    state, district = entry["state"], entry["district"]
+    for market, keys in sorted(entry.get("markets", {}).items()):
+        hit = coords.get((_name_key(district), _name_key(market))) or coords.get(_name_key(market))
+        if hit is not None:
+            (lat, lon), located = hit, "market"
+        elif region in REGION_COORDS:
+            (lat, lon), located = REGION_COORDS[region], "district"
+        else:
+            unlocated += 1
+            continue
+        records.append({
+            "region": region, "state": state, "district": district, "market": market,
+            "latitude": float(lat), "longitude": float(lon), "located": located,
+        })
+        commodities.append(frozenset(keys))
+    return records, commodities, unlocated
+
+
+def region_markets(region: str, exclude_anomalies: bool = False) -> dict[str, list[dict]]:
+    """
+    Latest prices of every market of one region, one row per commodity: the
+    median, min and max over the market's quotes on its latest dated day for
+    that commodity (memoised per region version).
+    """
+    data = _load_region(f"{region}.csv")
+    if exclude_anomalies:
+        data = data.without_anomalies()
+
+    block = data.derived.get("markets")
+    if block is None:
+        block = _latest_prices(data)
+        data.derived["markets"] = block
+    return block
+
+
+def _latest_prices(data: RegionData) -> dict[str, list[dict]]:
+    if COL_MARKET not in data.columns:
+        return {}
+    tables = []
+    for name in data.commodities():
+        part  = data.partition(name)
+        dated = part[COL_DATE].notna().to_numpy()
+        if data.exclude_anomalies:
+            dated = dated & ~data.anomaly_flags(name)
+        rows = part[dated]
+        if rows.empty:
+            continue
+        market = rows[COL_MARKET].astype(str).str.strip()
+        latest = rows[COL_DATE].eq(rows[COL_DATE].groupby(market).transform("max"))
+        rows, market = rows[latest], market[latest]
+        table = pd.DataFrame({
+            "date":      rows[COL_DATE],
+            "price":     rows[COL_MODAL].astype(np.float64),
+            "min_price": rows[COL_MIN].astype(np.float64) if COL_MIN in rows.columns else np.nan,
+            "max_price": rows[COL_MAX].astype(np.float64) if COL_MAX in rows.columns else np.nan,
+        }).groupby(market.to_numpy()).agg(
+            date=("date", "max"), price=("price", "median"), min_price=("min_price", "min"),
+            max_price=("max_price", "max"), quotes=("price", "size"),
+        )
+        tables.append(table.rename_axis("market").reset_index().assign(commodity=name))
+    if not tables:
+        return {}
+
+    # JSON-ready rows, so a lookup only picks them
+    frame = pd.concat(tables, ignore_index=True)
+    rows  = pd.DataFrame({
+        "commodity": frame["commodity"],
+        "date":      frame["date"].dt.strftime("%Y-%m-%d"),
+        "price":     frame["price"].round(2),
+        "min_price": frame["min_price"].round(2),
+        "max_price": frame["max_price"].round(2),
+        "quotes":    frame["quotes"].astype(int),
+    })
+    records = rows.astype(object).where(rows.notna(), None).to_dict(orient="records")
+    markets: dict[str, list[dict]] = {}
+    for market, record in zip(frame["market"], records):
+        markets.setdefault(market, []).append(record)
+    return markets
+
+
+async def get_nearest_markets(
+    lat:       float,
+    lon:       float,
+    k:         int = 5,
+    commodity: str | None = None,
+    max_km:    float | None = None,
+    exclude_anomalies: bool = True,
+) -> dict:
+    """
+    The k markets nearest to (lat, lon), closest first, each with its latest
+    price per commodity. With a commodity, only markets quoting it are
+    considered and only its price is returned; max_km caps the distance.
+    """
+    return await run_in_market_pool(nearest_markets, lat, lon, k, commodity, max_km, exclude_anomalies)
+
+
+def nearest_markets(
+    lat:       float,
+    lon:       float,
+    k:         int = 5,
+    commodity: str | None = None,
+    max_km:    float | None = None,
+    exclude_anomalies: bool = True,
+) -> dict:
+    """Blocking implementation of get_nearest_markets."""
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("lat must be within ±90 and lon within ±180")
+    index, unlocated = market_index()
+    found, dist = index.nearest(lat, lon, k, max_km, commodity)
+
+    wanted  = commodity_key(commodity) if commodity else None
+    tables  = {}
+    results = []
+    for i, km in zip(found.tolist(), dist.tolist()):
+        market = index.records[i]
+        region = market["region"]
+        if region not in tables:
+            tables[region] = region_markets(region, exclude_anomalies)
+        prices = tables[region].get(market["market"], [])
+        if wanted:
+            prices = [p for p in prices if commodity_key(p["commodity"]) == wanted]
+        results.append({
+            **market,
+            "latitude":    round(market["latitude"], 5),
+            "longitude":   round(market["longitude"], 5),
+            "distance_km": round(km, 2),
+            "prices":      prices,
+        })
+    return {
+        "lat":       lat,
+        "lon":       lon,
+        "k":         k,
+        "commodity": commodity,
+        "indexed":   len(index),
+        "unlocated": unlocated,
+        "count":     len(results),
+        "results":   results,
+    }
@@ -0,0 +1,113 @@
+"""
+Market Groups — Domain Layer
+Per-mandi drill-down of one commodity: daily Modal_Price statistics keyed
+by (Market, Variety, Grade) instead of the cross-market district median.
+
+Built from one multi-key groupby over the commodity partition and cached
+beside it on RegionData, together with each group's partition row
+positions. A single group's series is a slice of the prebuilt table; a
+partial drill-down (e.g. one market, every variety) re-aggregates only the
+rows of the matching groups, never the whole partition.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .market_columns import COL_DATE, COL_GRADE, COL_MARKET, COL_MODAL, COL_VARIETY
+from .market_rollups import ROLLUP_COLUMNS, empty_rollup
+
+GROUP_COLUMNS = [COL_MARKET, COL_VARIETY, COL_GRADE]
+STAT_COLUMNS  = ["median", "min", "max", "count"]
+
+
+def _group_labels(part: pd.DataFrame) -> pd.DataFrame:
+    labels = pd.DataFrame(index=part.index)
+    for col in GROUP_COLUMNS:
+        labels[col] = part[col].astype(str).str.strip() if col in part.columns else "—"
+    return labels
+
+
+class SeriesGroups:
+    """
+    One commodity's (Market, Variety, Grade) groups.
+
+    groups — one row per group: the three labels, rows (quotes), first_day,
+             last_day, latest_price, and [start, stop) into table
+    table  — daily median/min/max/count per group, grouped then date-ordered
+    """
+
+    def __init__(self, part: pd.DataFrame):
+        part   = part.reset_index(drop=True)
+        labels = _group_labels(part)
+
+        # Partition rows are date-ordered, so each group's positions are too
+        indices = labels.groupby(GROUP_COLUMNS, sort=True).indices
+        keys = sorted(indices)
+        self._positions = [indices[key] for key in keys]
+
+        usable = (part[COL_DATE].notna() & part[COL_MODAL].notna()).to_numpy() \
+            if COL_DATE in part.columns and COL_MODAL in part.columns else np.zeros(len(part), dtype=bool)
+        quotes = labels[usable].assign(**{COL_DATE: part.loc[usable, COL_DATE], COL_MODAL: part.loc[usable, COL_MODAL]})
+        self.table = (
+            quotes.groupby(GROUP_COLUMNS + [COL_DATE], sort=True)[COL_MODAL]
+                  .agg(STAT_COLUMNS)
+                  .reset_index()
+        )
+
+        # Row range of every group within table (groups with no dated quotes get an empty range)
+        table_keys = list(zip(*(self.table[col] for col in GROUP_COLUMNS)))
+        bounds: dict[tuple, list[int]] = {}
+        for i, key in enumerate(table_keys):
+            bounds.setdefault(key, [i, i])[1] = i + 1
+
+        modal = part[COL_MODAL].to_numpy(dtype=np.float64) if COL_MODAL in part.columns else None
+        rows = []
+        for key, positions in zip(keys, self._positions):
+            start, stop = bounds.get(key, (0, 0))
+            last = positions[-1]
+            rows.append({
+                COL_MARKET:     key[0],
+                COL_VARIETY:    key[1],
+                COL_GRADE:      key[2],
+                "rows":         len(positions),
+                "first_day":    self.table[COL_DATE].iloc[start] if stop > start else pd.NaT,
+                "last_day":     self.table[COL_DATE].iloc[stop - 1] if stop > start else pd.NaT,
+                "latest_price": float(modal[last]) if modal is not None else np.nan,
+                "start":        start,
+                "stop":         stop,
+            })
+        self.groups = pd.DataFrame(rows, columns=GROUP_COLUMNS + [
+            "rows", "first_day", "last_day", "latest_price", "start", "stop",
+        ])
+
+    def match(self, market: str | None = None, variety: str | None = None, grade: str | None = None) -> np.ndarray:
+        """Indices of the groups matching every given label (case-insensitive)."""
+        mask = np.ones(len(self.groups), dtype=bool)
+        for col, value in zip(GROUP_COLUMNS, (market, variety, grade)):
+            if value:
+                mask &= (self.groups[col].str.lower() == value.strip().lower()).to_numpy()
+        return np.flatnonzero(mask)
+
+    def positions(self, matched: np.ndarray) -> np.ndarray:
+        """Partition row positions (date-ordered) of the matched groups."""
+        if not len(matched):
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate([self._positions[i] for i in matched]))
+
+    def daily(self, matched: np.ndarray, rows: pd.DataFrame | None = None) -> pd.DataFrame:
+        """
+        Daily rollup (same columns as the commodity rollup) of the matched
+        groups. One group is a table slice; several are re-aggregated from
+        rows, the partition rows at positions(matched).
+        """
+        if not len(matched):
+            return empty_rollup()
+        if len(matched) == 1:
+            start, stop = self.groups[["start", "stop"]].iloc[matched[0]]
+            return self.table.iloc[start:stop][ROLLUP_COLUMNS].reset_index(drop=True)
+        usable = rows[rows[COL_DATE].notna() & rows[COL_MODAL].notna()]
+        return (
+            usable.groupby(COL_DATE, sort=True)[COL_MODAL]
+                  .agg(STAT_COLUMNS)
+                  .reset_index()[ROLLUP_COLUMNS]
+        )
@@ -0,0 +1,465 @@
+"""
+Market Index — Domain Layer
+Holds a loaded region as a commodity-keyed index of partitions built once
+at load time. Each partition holds one commodity's rows in date order, so
+a lookup is a dict hit instead of a full-frame string scan and sort, and
+appending rows only touches the commodities they belong to.
+
+With MARKET_COMPACT_FRAMES=1 the resident partitions are stored compactly
+(categorical strings, float32 prices, int32 day numbers) and expanded back
+to the normal dtypes when read, so callers always see the same columns
+and values.
+"""
+
+import copy
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from config import MARKET_COMPACT_FRAMES
+
+from .market_cache import MemoTable
+from .market_columns import (
+    COL_STATE, COL_DISTRICT, COL_MARKET, COL_COMMODITY, COL_VARIETY,
+    COL_GRADE, COL_DATE, PRICE_COLUMNS,
+)
+from .market_downsample import PERIODS, build_ohlc, merge_ohlc
+from .market_forecast import SeasonalFit, fit_seasonal
+from .market_groups import SeriesGroups
+from .market_indicators import IndicatorSeries
+from .market_outliers import COL_ANOMALY, mark_anomalies
+from .market_rollups import build_daily_rollups, empty_rollup, merge_daily_rollup
+from .market_seasonality import SeasonalProfile
+
+# Compact representation
+CATEGORY_COLUMNS = [COL_STATE, COL_DISTRICT, COL_MARKET, COL_COMMODITY, COL_VARIETY, COL_GRADE]
+UNDATED_DAY      = np.iinfo(np.int32).min  # sorts before every real day, like NaT-first
+
+DERIVED_MEMO_LIMIT = 32   # derived results kept per region (keys vary with days/horizon)
+
+
+def commodity_key(commodity: str) -> str:
+    """Case- and whitespace-insensitive key used for commodity lookups."""
+    return str(commodity).strip().lower()
+
+
+class RegionData:
+    """
+    A normalised region, indexed by commodity.
+
+    partitions — commodity key → that commodity's rows sorted by Arrival_Date
+                 (undated rows first, so the last row is the latest)
+    rollups    — commodity key → daily Modal_Price median/min/max/count table
+    anomalies  — commodity key → quotes flagged by the load-time outlier pass
+                 (each partition also carries the per-row COL_ANOMALY flag)
+    clean_rollups — rollups without the flagged quotes (the same table when
+                 a commodity has none); served by without_anomalies()
+    version    — source file version (mtime_ns, size) the data was loaded from
+    groups     — commodity key → (Market, Variety, Grade) drill-down series,
+                 built on first use and rebuilt after an append touches it
+    bars       — (commodity key, "week"|"month") → OHLC bars over its rollup,
+                 built on first use and refreshed from the appended period
+    indicators — commodity key → rolling indicator table over its rollup,
+                 built on first use and extended in place of a rebuild when
+                 appended days all fall after its last day
+    seasonality — commodity key → day-of-year / month price bands over its
+                 rollup, built on first use and extended like indicators
+    forecasts  — commodity key → seasonal forecast fit of its rollup; every
+                 unfitted commodity is fitted in one batch on first use, and
+                 an append drops the fits of the commodities it dates
+    derived    — memo of results computed from this version (e.g. screener
+                 blocks), keeping the DERIVED_MEMO_LIMIT most recently used;
+                 an appended copy starts with an empty memo
+
+    The memos are MemoTables, so nbytes counts them (and the memos of the
+    without_anomalies() view) on top of the partitions and rollups. When a
+    memo changes, on_resize (set by whoever caches the region) is called
+    with the new nbytes.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: tuple = (), compact: bool = MARKET_COMPACT_FRAMES):
+        self.version = version
+        self.compact = compact
+        self.exclude_anomalies = False
+        self.partitions:  dict[str, pd.DataFrame] = {}
+        self.first_dated: dict[str, int] = {}         # number of undated rows at the front
+        self._dates:      dict[str, np.ndarray] = {}  # partition dates, for binary search
+        self._bytes:      dict[str, int] = {}
+        self._flags:      dict[str, np.ndarray] = {}  # partition anomaly flags
+        self._clean_view: RegionData | None = None
+        self._root:       RegionData | None = None    # region a without_anomalies() view belongs to
+        self.on_resize:   Callable[[int], None] | None = None
+        self._new_memos()
+
+        frame, ranges = _sort_by_commodity(df)
+        frame, self.anomalies = mark_anomalies(frame, ranges)
+        self.columns = list(frame.columns)
+        self.rollups = build_daily_rollups(frame, ranges)
+        flagged = {key: bounds for key, bounds in ranges.items() if len(self.anomalies[key])}
+        self.clean_rollups = {
+            **self.rollups,
+            **build_daily_rollups(frame, flagged, frame[COL_ANOMALY].to_numpy()),
+        }
+        for key, (start, stop) in ranges.items():
+            self._set_partition(key, frame.iloc[start:stop])
+
+    @property
+    def nbytes(self) -> int:
+        clean = [daily for key, daily in self.clean_rollups.items() if daily is not self.rollups.get(key)]
+        views = [self] if self._clean_view is None else [self, self._clean_view]
+        return sum(self._bytes.values()) + sum(
+            int(daily.memory_usage(deep=True).sum()) for daily in [*self.rollups.values(), *clean]
+        ) + sum(memo.nbytes for view in views for memo in view._memos())
+
+    def partition(self, commodity: str) -> pd.DataFrame:
+        """Date-ordered rows for one commodity (empty frame if unknown)."""
+        part = self.partitions.get(self._key(commodity))
+        if part is None:
+            return pd.DataFrame(columns=self.columns)
+        return expand_frame(part) if self.compact else part
+
+    def take(self, commodity: str, positions: np.ndarray) -> pd.DataFrame:
+        """Partition rows at the given positions, expanding only those rows when compact."""
+        part = self.partitions.get(self._key(commodity))
+        if part is None:
+            return pd.DataFrame(columns=self.columns)
+        part = part.iloc[positions]
+        return expand_frame(part) if self.compact else part
+
+    def series_groups(self, commodity: str) -> SeriesGroups:
+        """(Market, Variety, Grade) groups of one commodity, built on first use."""
+        key    = self._key(commodity)
+        groups = self.groups.get(key)
+        if groups is None:
+            groups = SeriesGroups(self.partition(commodity))
+            self.groups[key] = groups
+        return groups
+
+    def size(self, commodity: str) -> int:
+        """Number of rows for one commodity."""
+        part = self.partitions.get(self._key(commodity))
+        return 0 if part is None else len(part)
+
+    def rows(self, commodity: str, start: int, stop: int) -> pd.DataFrame:
+        """Rows [start, stop) of one commodity's partition, expanding only those rows when compact."""
+        part = self.partitions.get(self._key(commodity))
+        if part is None:
+            return pd.DataFrame(columns=self.columns)
+        part = part.iloc[start:stop]
+        return expand_frame(part) if self.compact else part
+
+    def daily(self, commodity: str) -> pd.DataFrame:
+        """Materialised daily rollup for one commodity, oldest→newest."""
+        return self.rollups.get(self._key(commodity), empty_rollup())
+
+    def daily_window(
+        self,
+        commodity: str,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+        days: int | None = None,
+    ) -> tuple[int, int]:
+        """
+        Row range [lo, hi) of daily(commodity) dated within [start, end], found
+        by binary search on the rollup's dates. Without start, the range is the
+        last `days` rows up to end (all of them when days is None).
+        """
+        return window_bounds(self.daily(commodity)[COL_DATE].to_numpy(), start, end, days)
+
+    def ohlc(self, commodity: str, resolution: str) -> pd.DataFrame:
+        """Weekly or monthly OHLC bars of daily(commodity), built on first use."""
+        key  = (self._key(commodity), resolution)
+        bars = self.bars.get(key)
+        if bars is None:
+            bars = build_ohlc(self.daily(commodity), resolution)
+            self.bars[key] = bars
+        return bars
+
+    def indicators_for(self, commodity: str) -> IndicatorSeries:
+        """Rolling indicators aligned with daily(commodity), built on first use."""
+        key    = self._key(commodity)
+        series = self.indicators.get(key)
+        if series is None:
+            series = IndicatorSeries.build(self.rollups.get(key, empty_rollup()))
+            self.indicators[key] = series
+        return series
+
+    def seasonality_for(self, commodity: str) -> SeasonalProfile:
+        """Seasonal price bands of daily(commodity), built on first use."""
+        key     = self._key(commodity)
+        profile = self.seasonality.get(key)
+        if profile is None:
+            profile = SeasonalProfile.build(self.rollups.get(key, empty_rollup()))
+            self.seasonality[key] = profile
+        return profile
+
+    def forecast_fit(self, commodity: str) -> SeasonalFit | None:
+        """
+        Seasonal forecast fit of daily(commodity). On a miss, every commodity
+        without a fit is fitted in the same batch.
+        """
+        key = self._key(commodity)
+        if key not in self.forecasts:
+            pending = [k for k in self.rollups if k not in self.forecasts]
+            if key not in pending:
+                pending.append(key)
+            fits = fit_seasonal([self.rollups.get(k, empty_rollup()) for k in pending])
+            self.forecasts.update(zip(pending, fits))
+        return self.forecasts[key]
+
+    def without_anomalies(self) -> "RegionData":
+        """
+        View of this region whose rollups (and everything built from them:
+        bars, indicators, forecasts, screener blocks) leave out flagged
+        quotes, and whose latest rows skip them. Built once per version.
+        """
+        view = self._clean_view
+        if view is None:
+            view = copy.copy(self)
+            view.exclude_anomalies = True
+            view.rollups    = self.clean_rollups
+            view._root      = self
+            view._new_memos(groups=self.groups)
+            view._clean_view = view
+            self._clean_view = view
+        return view
+
+    def anomaly_flags(self, commodity: str) -> np.ndarray:
+        """Per-row outlier flags of one commodity's partition."""
+        return self._flags.get(self._key(commodity), np.zeros(0, dtype=bool))
+
+    def latest_positions(self, commodity: str, stop: int, count: int = 2) -> np.ndarray:
+        """
+        Partition positions of the last `count` rows before stop, skipping
+        flagged rows when this is a without_anomalies() view.
+        """
+        if not self.exclude_anomalies:
+            return np.arange(max(stop - count, 0), stop)
+        flags  = self.anomaly_flags(commodity)
+        picked = []
+        pos = stop - 1
+        while pos >= 0 and len(picked) < count:
+            if not flags[pos]:
+                picked.append(pos)
+            pos -= 1
+        return np.array(picked[::-1], dtype=np.int64)
+
+    def seek(self, commodity: str, day: pd.Timestamp | None, side: str = "left") -> int:
+        """
+        Binary-search a commodity partition by date and return a row position
+        within it: the first row dated on/after day (side="left") or after day
+        (side="right"). day=None returns the number of undated rows.
+        """
+        key = self._key(commodity)
+        if key not in self.partitions:
+            return 0
+        dated_start = self.first_dated[key]
+        if day is None:
+            return dated_start
+        target = _day_number(day) if self.compact else np.datetime64(day, "ns")
+        return dated_start + int(np.searchsorted(self._dates[key][dated_start:], target, side=side))
+
+    def commodities(self) -> list[str]:
+        """Distinct commodity names as they appear in the data, sorted."""
+        if COL_COMMODITY not in self.columns:
+            return []
+        names = [str(part[COL_COMMODITY].iloc[0]) for part in self.partitions.values() if len(part)]
+        return sorted(name for name in names if name and name != "nan")
+
+    def append(self, rows: pd.DataFrame, version: tuple) -> "RegionData":
+        """
+        Return a new RegionData with normalised rows merged in. Only the
+        partitions and rollups of the commodities present in rows are rebuilt,
+        and each rollup only from the earliest appended day onwards; untouched
+        partitions are shared with this instance, which stays valid for readers.
+        """
+        merged = copy.copy(self)
+        merged.version     = version
+        merged.columns     = self.columns + [c for c in rows.columns if c not in self.columns]
+        merged.partitions  = dict(self.partitions)
+        merged.first_dated = dict(self.first_dated)
+        merged._dates      = dict(self._dates)
+        merged._bytes      = dict(self._bytes)
+        merged._flags      = dict(self._flags)
+        merged._clean_view = None
+        merged.on_resize   = None
+        merged.rollups     = dict(self.rollups)
+        merged.clean_rollups = dict(self.clean_rollups)
+        merged.anomalies   = dict(self.anomalies)
+        hooks = (merged._shared_ids, merged._memo_changed)
+        merged._new_memos(
+            groups=self.groups.copy(*hooks),
+            bars=self.bars.copy(*hooks),
+            indicators=self.indicators.copy(*hooks),
+            seasonality=self.seasonality.copy(*hooks),
+            forecasts=self.forecasts.copy(*hooks),
+        )
+
+        keys = _commodity_keys(rows)
+        for key, chunk in rows.groupby(keys, sort=False):
+            existing = self.partitions.get(key)
+            if existing is not None and self.compact:
+                existing = expand_frame(existing)
+            combined = chunk if existing is None else pd.concat([existing, chunk], ignore_index=True)
+            combined = combined.sort_values(COL_DATE, kind="stable", na_position="first")
+            combined, found = mark_anomalies(combined, {key: (0, len(combined))})
+            merged.anomalies[key] = found[key]
+            merged._set_partition(key, combined)
+            merged.groups.pop(key, None)
+
+            new_days = chunk[COL_DATE].dropna()
+            if new_days.empty:
+                continue
+            since = new_days.min()
+            merged.forecasts.pop(key, None)
+            first = int(combined[COL_DATE].isna().sum())
+            start = first + int(np.searchsorted(combined[COL_DATE].to_numpy()[first:], np.datetime64(since, "ns")))
+            tail = combined.iloc[start:]
+            merged.rollups[key] = merge_daily_rollup(self.rollups.get(key, empty_rollup()), tail, since)
+            merged.clean_rollups[key] = merge_daily_rollup(
+                self.clean_rollups.get(key, empty_rollup()), tail[~tail[COL_ANOMALY]], since,
+            ) if len(found[key]) else merged.rollups[key]
+
+            for resolution in PERIODS:
+                bars = merged.bars.get((key, resolution))
+                if bars is not None:
+                    merged.bars[key, resolution] = merge_ohlc(bars, merged.rollups[key], since, resolution)
+
+            # Days after the indicators' last day only need pushing through the running state
+            indicators = merged.indicators.pop(key, None)
+            if indicators is not None and indicators.last_day is not None and since > indicators.last_day:
+                merged.indicators[key] = indicators.extend(merged.rollups[key])
+            profile = merged.seasonality.pop(key, None)
+            if profile is not None and profile.last_day is not None and since > profile.last_day:
+                merged.seasonality[key] = profile.extend(merged.rollups[key])
+        return merged
+
+    def _new_memos(
+        self,
+        groups: MemoTable | None = None,
+        bars: MemoTable | None = None,
+        indicators: MemoTable | None = None,
+        seasonality: MemoTable | None = None,
+        forecasts: MemoTable | None = None,
+    ) -> None:
+        def memo(limit: int | None = None) -> MemoTable:
+            return MemoTable(limit=limit, shared=self._shared_ids, on_change=self._memo_changed)
+
+        self.groups:      MemoTable = groups if groups is not None else memo()   # commodity key → SeriesGroups
+        self.bars:        MemoTable = bars if bars is not None else memo()       # (key, period) → OHLC frame
+        self.indicators:  MemoTable = indicators if indicators is not None else memo()
+        self.seasonality: MemoTable = seasonality if seasonality is not None else memo()
+        self.forecasts:   MemoTable = forecasts if forecasts is not None else memo()
+        self.derived:     MemoTable = memo(DERIVED_MEMO_LIMIT)
+
+    def _memos(self) -> list[MemoTable]:
+        memos = [self.bars, self.indicators, self.seasonality, self.forecasts, self.derived]
+        # A without_anomalies() view shares its region's groups
+        return memos if self._root is not None else [self.groups, *memos]
+
+    def _shared_ids(self) -> set[int]:
+        """Objects already counted in nbytes, which a memo value may reference."""
+        root = self._root or self
+        return {id(frame) for frame in [*root.partitions.values(), *root.rollups.values(), *root.clean_rollups.values()]}
+
+    def _memo_changed(self) -> None:
+        root = self._root or self
+        if root.on_resize is not None:
+            root.on_resize(root.nbytes)
+
+    def _key(self, commodity: str) -> str:
+        return commodity_key(commodity) if COL_COMMODITY in self.columns else ""
+
+    def _set_partition(self, key: str, part: pd.DataFrame) -> None:
+        if self.compact:
+            part = compact_frame(part)
+        dates = part[COL_DATE].to_numpy() if COL_DATE in part.columns else np.array([], dtype="datetime64[ns]")
+        undated = dates == UNDATED_DAY if self.compact else pd.isna(dates)
+        self.partitions[key]  = part
+        self._dates[key]      = dates
+        self.first_dated[key] = int(undated.sum())
+        self._flags[key]      = part[COL_ANOMALY].to_numpy(dtype=bool) if COL_ANOMALY in part.columns \
+            else np.zeros(len(part), dtype=bool)
+        self._bytes[key]      = int(part.memory_usage(deep=True).sum())
+
+
+def window_bounds(
+    dates: np.ndarray,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    days: int | None = None,
+) -> tuple[int, int]:
+    """[lo, hi) of sorted dates within [start, end], or the last `days` up to end."""
+    hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(end, "ns"), side="right"))
+    if start is not None:
+        lo = int(np.searchsorted(dates, np.datetime64(start, "ns"), side="left"))
+    else:
+        lo = 0 if days is None else max(hi - days, 0)
+    return lo, max(lo, hi)
+
+
+def _commodity_keys(df: pd.DataFrame) -> np.ndarray:
+    if COL_COMMODITY not in df.columns:
+        return np.full(len(df), "", dtype=object)
+    return df[COL_COMMODITY].astype(str).str.strip().str.lower().to_numpy(dtype=object)
+
+
+def _sort_by_commodity(df: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, tuple[int, int]]]:
+    """Sort by (commodity key, date) and return each commodity's contiguous row range."""
+    frame = (
+        df.assign(_key=_commodity_keys(df))
+          .sort_values(["_key", COL_DATE], kind="stable", na_position="first")
+          .reset_index(drop=True)
+    )
+    keys = frame.pop("_key").to_numpy()
+
+    bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    stops  = np.concatenate((bounds, [len(keys)]))
+    ranges = {keys[start]: (start, stop) for start, stop in zip(starts.tolist(), stops.tolist()) if stop > start}
+    return frame, ranges
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a normalised frame for residency: repeated strings become
+    categoricals, prices float32 and Arrival_Date int32 days since epoch
+    (UNDATED_DAY for missing dates).
+    """
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
+    if COL_DATE in df.columns:
+        dates = df[COL_DATE].to_numpy(dtype="datetime64[D]")
+        days  = dates.astype(np.int64)
+        days[np.isnat(dates)] = UNDATED_DAY
+        df[COL_DATE] = days.astype(np.int32)
+    return df
+
+
+def expand_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Inverse of compact_frame for a (small) slice: normal dtypes, same values."""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(object)
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            # float32 keeps ~7 significant digits; rounding restores 2-decimal prices exactly
+            df[col] = df[col].astype(np.float64).round(2)
+    if COL_DATE in df.columns:
+        days  = df[COL_DATE].to_numpy()
+        dates = days.astype("datetime64[D]").astype("datetime64[ns]")
+        dates[days == UNDATED_DAY] = np.datetime64("NaT")
+        df[COL_DATE] = dates
+    return df
+
+
+def _day_number(day: pd.Timestamp) -> np.int32:
+    return np.int32(np.datetime64(day, "D").astype(np.int64))
+
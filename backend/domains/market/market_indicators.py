@@ -0,0 +1,201 @@
+"""
+Market Indicators — Domain Layer
+Rolling technical indicators over a commodity's daily median price:
+SMA and EMA at several windows, rolling volatility of daily returns,
+Bollinger-style bands and rate of change.
+
+The full history is computed column-wise once; the running state at the
+last day (window sums, EMA values, recent prices) is kept beside it, so
+rows for newly appended days are produced with O(1) work per indicator
+instead of recomputing every window.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .market_columns import COL_DATE
+
+SMA_WINDOWS     = (7, 14, 30)
+EMA_SPANS       = (7, 14, 30)
+VOLATILITY_DAYS = 14     # std-dev of daily % returns over this many returns
+BAND_WINDOW     = 20     # Bollinger mid = SMA(20), bands = mid ± BAND_WIDTH·σ
+BAND_WIDTH      = 2.0
+ROC_DAYS        = 7      # % change against the price ROC_DAYS days earlier
+
+INDICATOR_COLUMNS = (
+    [f"sma_{n}" for n in SMA_WINDOWS]
+    + [f"ema_{n}" for n in EMA_SPANS]
+    + [f"volatility_{VOLATILITY_DAYS}", "band_mid", "band_upper", "band_lower", f"roc_{ROC_DAYS}"]
+)
+
+_RESYNC_EVERY = 1024     # re-add window sums periodically so float drift cannot build up
+
+
+class RollingWindow:
+    """Fixed-size window over a stream, with running sum / sum of squares."""
+
+    __slots__ = ("size", "values", "total", "total_sq", "pushes")
+
+    def __init__(self, size: int, values=()):
+        self.size   = size
+        self.values = deque(maxlen=size)
+        self.total = self.total_sq = 0.0
+        self.pushes = 0
+        for value in values:
+            self.push(value)
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.size:
+            old = self.values[0]
+            self.total    -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        self.total    += value
+        self.total_sq += value * value
+        self.pushes   += 1
+        if self.pushes % _RESYNC_EVERY == 0:
+            self.total    = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> float:
+        return self.total / self.size if self.full else math.nan
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), NaN until the window is full."""
+        if not self.full or self.size < 2:
+            return math.nan
+        var = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(max(var, 0.0))
+
+    def copy(self) -> "RollingWindow":
+        clone = RollingWindow(self.size)
+        clone.values.extend(self.values)
+        clone.total, clone.total_sq, clone.pushes = self.total, self.total_sq, self.pushes
+        return clone
+
+
+class IndicatorState:
+    """Running indicator state after the last pushed day."""
+
+    def __init__(self):
+        self.sma     = {n: RollingWindow(n) for n in SMA_WINDOWS}
+        self.ema     = {n: math.nan for n in EMA_SPANS}
+        self.count   = 0
+        self.returns = RollingWindow(VOLATILITY_DAYS)
+        self.band    = RollingWindow(BAND_WINDOW)
+        self.recent  = deque(maxlen=ROC_DAYS + 1)
+
+    @classmethod
+    def from_history(cls, prices: np.ndarray, ema: dict[int, float]) -> "IndicatorState":
+        """State equivalent to pushing every price, primed from the tail of the history."""
+        state = cls()
+        state.count = len(prices)
+        state.ema   = dict(ema)
+        state.sma   = {n: RollingWindow(n, prices[-n:]) for n in SMA_WINDOWS}
+        state.band  = RollingWindow(BAND_WINDOW, prices[-BAND_WINDOW:])
+        tail = prices[-(VOLATILITY_DAYS + 1):]
+        state.returns = RollingWindow(VOLATILITY_DAYS, tail[1:] / tail[:-1] - 1.0)
+        state.recent.extend(prices[-(ROC_DAYS + 1):])
+        return state
+
+    def push(self, price: float) -> list[float]:
+        """Add one day and return its row of INDICATOR_COLUMNS values."""
+        if self.recent:
+            self.returns.push(price / self.recent[-1] - 1.0)
+        self.recent.append(price)
+        self.count += 1
+
+        row = []
+        for window in self.sma.values():
+            window.push(price)
+            row.append(window.mean())
+        for n, value in self.ema.items():
+            alpha = 2.0 / (n + 1)
+            self.ema[n] = price if math.isnan(value) else value + alpha * (price - value)
+            row.append(self.ema[n] if self.count >= n else math.nan)
+
+        self.band.push(price)
+        mid, sigma = self.band.mean(), self.band.std()
+        roc = (price / self.recent[0] - 1.0) * 100 if len(self.recent) == ROC_DAYS + 1 else math.nan
+        row += [self.returns.std() * 100, mid, mid + BAND_WIDTH * sigma, mid - BAND_WIDTH * sigma, roc]
+        return row
+
+    def copy(self) -> "IndicatorState":
+        clone = IndicatorState()
+        clone.sma     = {n: w.copy() for n, w in self.sma.items()}
+        clone.ema     = dict(self.ema)
+        clone.count   = self.count
+        clone.returns = self.returns.copy()
+        clone.band    = self.band.copy()
+        clone.recent  = deque(self.recent, maxlen=ROC_DAYS + 1)
+        return clone
+
+
+class IndicatorSeries:
+    """
+    Indicator table for one commodity, aligned row-for-row with its daily
+    rollup (Arrival_Date + INDICATOR_COLUMNS), plus the state after its last day.
+    """
+
+    def __init__(self, frame: pd.DataFrame, state: IndicatorState):
+        self.frame = frame
+        self.state = state
+
+    @property
+    def last_day(self) -> pd.Timestamp | None:
+        return self.frame[COL_DATE].iloc[-1] if len(self.frame) else None
+
+    @classmethod
+    def build(cls, daily: pd.DataFrame) -> "IndicatorSeries":
+        """Compute the whole history column-wise from a daily rollup."""
+        prices = daily["median"].to_numpy(dtype=np.float64)
+        close  = pd.Series(prices)
+        frame  = {COL_DATE: daily[COL_DATE].to_numpy()}
+        for n in SMA_WINDOWS:
+            frame[f"sma_{n}"] = close.rolling(n).mean().to_numpy()
+        ema = {}
+        for n in EMA_SPANS:
+            values = close.ewm(span=n, adjust=False).mean().to_numpy(copy=True)
+            ema[n] = values[-1] if len(values) else math.nan
+            values[: n - 1] = np.nan
+            frame[f"ema_{n}"] = values
+        frame[f"volatility_{VOLATILITY_DAYS}"] = (close.pct_change().rolling(VOLATILITY_DAYS).std() * 100).to_numpy()
+        mid   = close.rolling(BAND_WINDOW).mean()
+        sigma = close.rolling(BAND_WINDOW).std()
+        frame["band_mid"]   = mid.to_numpy()
+        frame["band_upper"] = (mid + BAND_WIDTH * sigma).to_numpy()
+        frame["band_lower"] = (mid - BAND_WIDTH * sigma).to_numpy()
+        frame[f"roc_{ROC_DAYS}"] = ((close / close.shift(ROC_DAYS) - 1.0) * 100).to_numpy()
+        return cls(pd.DataFrame(frame), IndicatorState.from_history(prices, ema))
+
+    def extend(self, daily: pd.DataFrame) -> "IndicatorSeries":
+        """
+        New series with rows for the days of daily after last_day, pushed
+        through a copy of the running state (this instance is unchanged).
+        The caller guarantees the days up to last_day did not change.
+        """
+        last  = self.last_day
+        fresh = daily if last is None else daily.iloc[int(daily[COL_DATE].searchsorted(last, side="right")):]
+        if fresh.empty:
+            return self
+        state = self.state.copy()
+        rows  = [state.push(float(price)) for price in fresh["median"].to_numpy(dtype=np.float64)]
+        added = pd.DataFrame(rows, columns=INDICATOR_COLUMNS)
+        added.insert(0, COL_DATE, fresh[COL_DATE].to_numpy())
+        return IndicatorSeries(pd.concat([self.frame, added], ignore_index=True), state)
+
+
+def to_overlays(frame: pd.DataFrame) -> dict[str, list]:
+    """Indicator columns as chart overlays: 2-decimal values, None while warming up."""
+    overlays = {}
+    for col in INDICATOR_COLUMNS:
+        values = frame[col].round(2)
+        overlays[col] = values.astype(object).where(values.notna(), None).tolist()
+    return overlays
@@ -0,0 +1,218 @@
+"""
+Market Ingest — Domain Layer
+Appends new mandi rows (e.g. a day's Agmarknet export) to an existing
+region without re-parsing its history.
+
+Only the new rows are validated and normalised. They are appended to the
+region CSV in its own column order and date format, recorded as a delta
+beside the columnar sidecar, merged into the resident commodity partitions
+and rollups, and folded into the filter manifest.
+"""
+
+import csv
+from pathlib import Path
+
+import pandas as pd
+
+from .market_analyze import (
+    DATA_DIR,
+    DATE_SAMPLE_SIZE,
+    RENAME_MAP,
+    _cache_region,
+    _load_region,
+    _normalise_columns,
+    _region_date_format,
+    get_available_filters,
+    normalise_frame,
+    region_lock,
+)
+from .market_columns import (
+    COL_COMMODITY, COL_DATE, COL_DISTRICT, COL_MARKET, COL_MODAL, COL_STATE, PRICE_COLUMNS, TEXT_COLUMNS,
+)
+from .market_index import RegionData, commodity_key
+from .market_manifest import note_append
+from .market_store import append_columnar
+
+REQUIRED_COLUMNS = [COL_COMMODITY, COL_DATE, COL_MODAL]
+KNOWN_COLUMNS    = {*TEXT_COLUMNS, COL_DATE, *PRICE_COLUMNS}
+MISSING_TEXT     = {"", "nan", "None"}
+
+
+def ingest_rows(region: str, raw: pd.DataFrame) -> dict:
+    """
+    Validate, normalise and append raw rows to a region.
+    Rows without a parseable date, a numeric Modal_Price or a commodity are rejected.
+    Only regions listed in the manifest are accepted. State and District
+    always come from the region's existing rows; Market may be omitted only
+    when the region has a single market.
+    """
+    path     = _region_path(region)
+    filename = path.name
+
+    rows = _normalise_columns(raw.copy())
+    missing = [col for col in REQUIRED_COLUMNS if col not in rows.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    # Dates are parsed with the region file's own format first
+    rows = normalise_frame(rows, date_format=_file_date_format(path))
+    rows = _fill_from_region(rows, _load_region(filename), _read_header(path))
+
+    valid = (
+        rows[COL_DATE].notna()
+        & rows[COL_MODAL].notna()
+        & ~rows[COL_COMMODITY].isin(["", "nan"])
+    )
+    accepted = rows[valid].reset_index(drop=True)
+    result = {"region": region, "accepted": int(len(accepted)), "rejected": int((~valid).sum())}
+    if accepted.empty:
+        return result
+
+    with region_lock(filename):
+        current = _load_region(filename)
+        header  = _read_header(path)
+        accepted = accepted[[col for col in accepted.columns if col in header.values()]]
+
+        before = path.stat()
+        _append_to_csv(path, header, accepted)
+        after = path.stat()
+
+        version = (after.st_mtime_ns, after.st_size)
+        append_columnar(path, before, after, accepted)
+        updated = current.append(accepted, version)
+        _cache_region(filename, version, updated)
+        note_append(DATA_DIR, region, after, accepted)
+
+    dates = accepted[COL_DATE]
+    return {
+        **result,
+        "commodities": sorted(accepted[COL_COMMODITY].unique().tolist()),
+        "date_min":    dates.min().strftime("%Y-%m-%d"),
+        "date_max":    dates.max().strftime("%Y-%m-%d"),
+    }
+
+
+def _region_path(region: str) -> Path:
+    """CSV path of a known region id; anything else is rejected before touching the filesystem."""
+    if not region or "/" in region or "\\" in region or ".." in region:
+        raise ValueError(f"Invalid region '{region}'")
+    if region not in get_available_filters()["regions"]:
+        raise FileNotFoundError(f"Region file {region}.csv not found")
+    path = DATA_DIR / f"{region}.csv"
+    if path.resolve().parent != DATA_DIR.resolve():
+        raise ValueError(f"Invalid region '{region}'")
+    return path
+
+
+def _fill_from_region(rows: pd.DataFrame, current: RegionData, header: dict[str, str]) -> pd.DataFrame:
+    """
+    State/District of the region's existing rows on every row, the region's
+    only Market where the upload has none, and each commodity's existing
+    value of any other file column (e.g. Commodity_Code) the upload lacks.
+    """
+    existing = [current.rows(name, current.size(name) - 1, current.size(name)) for name in current.commodities()]
+    existing = pd.concat(existing, ignore_index=True) if existing else pd.DataFrame(columns=current.columns)
+    if existing.empty:
+        raise ValueError("Region has no rows to take State/District from")
+    rows = rows.copy()
+    for col in (COL_STATE, COL_DISTRICT):
+        if col in existing.columns:
+            rows[col] = str(existing[col].iloc[-1])
+
+    if COL_MARKET in current.columns:
+        markets = sorted({str(m) for name in current.commodities() for m in current.partition(name)[COL_MARKET].unique()})
+        given   = rows[COL_MARKET].astype(str) if COL_MARKET in rows.columns else pd.Series("", index=rows.index)
+        blank   = given.isin(MISSING_TEXT)
+        if blank.any():
+            if len(markets) != 1:
+                raise ValueError(f"Market is required for this region (one of: {', '.join(markets)})")
+            given = given.mask(blank, markets[0])
+        rows[COL_MARKET] = given
+
+    for col in header.values():
+        if col in KNOWN_COLUMNS or col not in existing.columns:
+            continue
+        if col not in rows.columns:
+            codes = dict(zip(existing[COL_COMMODITY].map(commodity_key), existing[col]))
+            rows[col] = rows[COL_COMMODITY].map(commodity_key).map(codes)
+        rows[col] = _match_dtype(rows[col], existing[col].dtype)
+    return rows
+
+
+def _match_dtype(values: pd.Series, dtype) -> pd.Series:
+    """
+    values in the region's dtype for a file column such as Commodity_Code:
+    text when the region holds text, or its integer dtype when every value
+    is whole, so the append does not mix or widen the column's type.
+    """
+    if pd.api.types.is_string_dtype(dtype):
+        return values.map(str, na_action="ignore").astype(dtype)
+    if not pd.api.types.is_integer_dtype(dtype):
+        return values
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers.isna().any() or (numbers % 1 != 0).any():
+        return values
+    return numbers.astype(dtype)
+
+
+def _read_header(path) -> dict[str, str]:
+    """Raw CSV header → normalised column name, in file order."""
+    with open(path, newline="", encoding="utf-8") as f:
+        raw = next(csv.reader(f))
+    return {name: RENAME_MAP.get(name.strip(), name.strip()) for name in raw}
+
+
+def _append_to_csv(path, header: dict[str, str], rows: pd.DataFrame) -> None:
+    """
+    Append normalised rows to the CSV using its own column order, date format
+    and number style (whole numbers without decimals, thousands separators
+    when the file has them); missing values are written as empty fields.
+    """
+    fmt      = _file_date_format(path) or "%Y-%m-%d"
+    numbers  = [raw for raw, col in header.items() if col in rows.columns and pd.api.types.is_numeric_dtype(rows[col])]
+    sample   = pd.read_csv(path, nrows=DATE_SAMPLE_SIZE, usecols=numbers, dtype=str) if numbers else pd.DataFrame()
+    grouped  = bool(numbers) and sample.stack().str.contains(",", regex=False).any()
+
+    out = {}
+    for raw, col in header.items():
+        if col == COL_DATE:
+            out[raw] = rows[COL_DATE].dt.strftime(fmt)
+        elif col not in rows.columns:
+            out[raw] = ""
+        elif raw in numbers:
+            out[raw] = rows[col].map(lambda v: _format_number(v, grouped))
+        else:
+            text = rows[col].astype(str)
+            out[raw] = text.mask(text.isin(MISSING_TEXT) | rows[col].isna(), "")
+    out = pd.DataFrame(out)
+
+    needs_newline = False
+    with open(path, "rb") as f:
+        if f.seek(0, 2) > 0:
+            f.seek(-1, 2)
+            needs_newline = f.read(1) != b"\n"
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        if needs_newline:
+            f.write("\n")
+        out.to_csv(f, header=False, index=False)
+
+
+def _format_number(value, grouped: bool) -> str:
+    if pd.isna(value):
+        return ""
+    value = float(value)
+    if value.is_integer():
+        return f"{value:,.0f}" if grouped else f"{value:.0f}"
+    text = f"{value:,.2f}" if grouped else f"{value:.2f}"
+    return text.rstrip("0")
+
+
+def _file_date_format(path) -> str | None:
+    """Date format of an existing region CSV (recorded in the manifest, else sniffed from its head)."""
+    header   = _read_header(path)
+    date_col = _raw_name(header, COL_DATE)
+    sample   = pd.read_csv(path, nrows=DATE_SAMPLE_SIZE, usecols=[date_col], dtype=str)
+    return _region_date_format(path, sample[date_col])
+
+
+def _raw_name(header: dict[str, str], col: str) -> str:
+    return next(raw for raw, name in header.items() if name == col)
@@ -0,0 +1,216 @@
+"""
+Market Intelligence — Domain Layer
+Composes the price card, trend chart, momentum and trade recommendation
+for one (region, commodity) pair, or for many pairs at once.
+
+A batch is grouped by region: each region is loaded (or fetched from the
+region cache) once, and every commodity in it is summarised from its
+resident partition and daily rollup. Regions run concurrently on the
+market worker pool.
+"""
+
+import asyncio
+from typing import NamedTuple
+
+import pandas as pd
+
+from .market_analyze import (
+    _error_result,
+    _load_region,
+    chart_points,
+    market_snapshot,
+    trend_forecast,
+    trend_overlays,
+    trend_seasonal,
+    trend_series,
+)
+from .market_downsample import CHART_POINTS
+from .market_executor import run_in_market_pool
+from .market_forecast import forecast_points
+from .market_signals import compute_price_momentum, compute_trade_recommendation, enrich_market_data
+from .market_transformers import to_chart_series, to_market_summary
+
+ALL_COMMODITIES = "*"
+
+
+class ChartOptions(NamedTuple):
+    """Which days the intelligence chart covers and how it is drawn."""
+    days:       int = 14
+    start:      pd.Timestamp | None = None
+    end:        pd.Timestamp | None = None
+    overlays:   bool = False           # attach rolling indicator overlays
+    resolution: str = "auto"           # auto | day | week | month | lttb
+    points:     int = CHART_POINTS     # point budget for auto / lttb
+    forecast:   int = 0                # days of seasonal forecast to attach (0 = none)
+    exclude_anomalies: bool = False    # leave flagged outlier quotes out of signals and chart
+    seasonal:   bool = False           # add the seasonal percentile to the price card
+
+
+def build_intelligence(
+    raw: dict,
+    series: list[dict],
+    overlays: dict[str, list] | None = None,
+    chart: tuple[str, list[dict]] | None = None,
+) -> dict:
+    """
+    Intelligence summary from a market snapshot and its daily trend series.
+    Signals always use the daily series; chart=(resolution, points) draws a
+    downsampled chart instead of the daily one.
+    """
+    enriched       = enrich_market_data(raw, series)
+    momentum       = compute_price_momentum(series)
+    enriched["momentum"] = momentum
+    recommendation = compute_trade_recommendation(
+        trend        = enriched.get("trend", "stable"),
+        buyer_signal = enriched.get("buyer_signal", "Stable"),
+        momentum     = momentum.get("momentum", "neutral"),
+    )
+    summary = to_market_summary(enriched, recommendation)
+    if chart is None:
+        summary["chart"] = to_chart_series(series, overlays)
+    else:
+        resolution, points = chart
+        summary["chart"] = to_chart_series(points, overlays)
+        summary["chart"]["resolution"] = resolution
+    return summary
+
+
+def get_market_intelligence_sync(region: str, commodity: str, options: ChartOptions = ChartOptions()) -> dict:
+    """Blocking implementation of get_market_intelligence."""
+    (_, _, summary), = _region_intelligence(region, [commodity], options)[0]
+    return summary
+
+
+async def get_market_intelligence(
+    region:     str,
+    commodity:  str,
+    days:       int = 14,
+    overlays:   bool = False,
+    start:      pd.Timestamp | None = None,
+    end:        pd.Timestamp | None = None,
+    resolution: str = "auto",
+    points:     int = CHART_POINTS,
+    forecast:   int = 0,
+    exclude_anomalies: bool = False,
+    seasonal:   bool = False,
+) -> dict:
+    """
+    Full market intelligence for one (region, commodity) pair.
+    overlays=True adds rolling indicators (SMA/EMA, volatility, bands, ROC)
+    to the chart. With start/end the chart covers that date range and the
+    price card is as of end. resolution "auto" keeps daily chart points
+    while they fit in `points` and otherwise downsamples (weekly/monthly
+    OHLC, then LTTB); "day", "week", "month" and "lttb" force one.
+    forecast=N adds an N-day seasonal price forecast with 80%/95% intervals,
+    read from the region's cached fit. exclude_anomalies=True computes the
+    card, signals, chart and forecast without the load-time outlier quotes.
+    seasonal=True adds to the price card where the latest daily median sits
+    among the prices seen around the same day of year.
+    Runs on the market worker pool so a cold load does not block the event loop.
+    """
+    options = ChartOptions(days, start, end, overlays, resolution, points, forecast, exclude_anomalies, seasonal)
+    return await run_in_market_pool(get_market_intelligence_sync, region, commodity, options)
+
+
+async def get_market_intelligence_batch(
+    pairs:   list[tuple[str, str]],
+    options: ChartOptions = ChartOptions(),
+) -> list[dict]:
+    """
+    Intelligence summaries for many (region, commodity) pairs, in request order.
+    A commodity of "*" (or empty) expands to every commodity in that region.
+    Each summary also carries the region, commodity and status of its pair,
+    plus the error reason when the pair could not be resolved.
+    """
+    by_region: dict[str, list[str]] = {}
+    for region, commodity in pairs:
+        by_region.setdefault(region, []).append(commodity or ALL_COMMODITIES)
+
+    regions = list(by_region)
+    grouped = await asyncio.gather(*(
+        run_in_market_pool(_region_intelligence, region, by_region[region], options)
+        for region in regions
+    ))
+
+    # Each region answered its own requests in order; interleave them back
+    pending = {region: iter(answers) for region, answers in zip(regions, grouped)}
+    results = []
+    for region, _ in pairs:
+        for commodity, raw, summary in next(pending[region]):
+            item = {"region": region, "commodity": commodity, "status": raw.get("status", "error")}
+            if "error" in raw:
+                item["error"] = raw["error"]
+            results.append({**item, **summary})
+    return results
+
+
+def _region_intelligence(region: str, commodities: list[str], options: ChartOptions) -> list[list[tuple]]:
+    """
+    (commodity, raw, summary) triples for several requested commodities of one
+    region, from a single region load. Returns one list per request; "*"
+    yields one triple per commodity in the region.
+    """
+    try:
+        data = _load_region(f"{region}.csv")
+    except Exception as e:
+        answers = []
+        for commodity in commodities:
+            name = "" if commodity == ALL_COMMODITIES else commodity
+            raw  = _error_result(region, name, str(e))
+            summary = build_intelligence(raw, [], {} if options.overlays else None)
+            if options.forecast:
+                summary["forecast"] = forecast_points(None, options.forecast)
+            if options.seasonal:
+                summary["price_card"]["seasonal"] = None
+            answers.append([(name, raw, summary)])
+        return answers
+    if options.exclude_anomalies:
+        data = data.without_anomalies()
+
+    answers = []
+    for commodity in commodities:
+        names = data.commodities() if commodity == ALL_COMMODITIES else [commodity]
+        answers.append([(name, *_summarise(data, region, name, options)) for name in names])
+    return answers
+
+
+def _summarise(data, region: str, commodity: str, options: ChartOptions) -> tuple[dict, dict]:
+    days, start, end = options.days, options.start, options.end
+    try:
+        raw = market_snapshot(data, region, commodity, end)
+    except Exception as e:
+        raw = _error_result(region, commodity, str(e))
+    try:
+        series = trend_series(data, commodity, days, start, end)
+    except Exception:
+        series = []
+
+    chart, positions = None, None
+    if options.resolution != "day":
+        try:
+            resolution, points, positions = chart_points(
+                data, commodity, days, start, end, options.resolution, options.points,
+            )
+            chart = (resolution, points)
+        except Exception:
+            chart = (options.resolution, [])
+
+    overlays = None
+    if options.overlays:
+        try:
+            overlays = trend_overlays(data, commodity, days, start, end, positions)
+        except Exception:
+            overlays = {}
+
+    summary = build_intelligence(raw, series, overlays, chart)
+    if options.forecast:
+        try:
+            summary["forecast"] = trend_forecast(data, commodity, options.forecast, end)
+        except Exception:
+            summary["forecast"] = forecast_points(None, options.forecast)
+    if options.seasonal:
+        try:
+            summary["price_card"]["seasonal"] = trend_seasonal(data, commodity, end)
+        except Exception:
+            summary["price_card"]["seasonal"] = None
+    return raw, summary
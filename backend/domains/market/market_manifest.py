@@ -0,0 +1,221 @@
+"""
+Market Manifest — Domain Layer
+An incrementally maintained summary of every region file in backend/data/:
+state, district, commodity list, markets (each with the commodity keys it
+quotes), row count and date range, plus the Arrival_Date format sniffed
+for each file.
+
+The manifest lives in backend/data/.cache/manifest.json. Each sync only
+stats the CSVs and re-summarises the ones whose mtime or size changed, so
+filter discovery never has to load region frames it already knows about.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from .market_columns import COL_COMMODITY, COL_DATE, COL_MARKET
+from .market_store import CACHE_DIRNAME
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION  = 2
+SKIP_FILES        = {"market_prices.csv", "market_gazetteer.csv"}  # bundled sample and geocodes, not regions
+
+_manifest: dict[str, dict] | None = None   # region_id → entry
+_date_formats: dict[str, str] = {}         # region_id → sniffed Arrival_Date format
+_generation = 0                            # bumped whenever an entry changes
+
+# Syncs run one at a time, so each changed file is summarised once. The state
+# lock only guards the dicts above and the manifest file and is never held
+# while a region loads (a load records its date format under it).
+_sync_lock  = threading.Lock()
+_state_lock = threading.RLock()
+
+
+def split_region_id(region_id: str) -> tuple[str, str]:
+    """Parse State_District from a region filename stem."""
+    parts = region_id.split("_")
+    if len(parts) >= 2:
+        return parts[0], parts[1]
+    return "Unknown", region_id
+
+
+def summarise_frame(df: pd.DataFrame) -> dict:
+    """Commodity list, markets, row count and date range of a normalised region frame."""
+    commodities, markets = [], {}
+    if COL_COMMODITY in df.columns:
+        names  = df[COL_COMMODITY].astype(str).str.strip()
+        quoted = names.ne("") & names.ne("nan")
+        names  = names[quoted]
+        # One spelling per case-insensitive commodity key
+        commodities = sorted(names.groupby(names.str.lower()).first().tolist())
+
+        if COL_MARKET in df.columns:
+            market = df[COL_MARKET].astype(str).str.strip()[quoted]
+            pairs  = pd.DataFrame({"market": market, "key": names.str.lower()})
+            pairs  = pairs[pairs["market"].ne("") & pairs["market"].ne("nan")].drop_duplicates()
+            markets = {m: sorted(keys) for m, keys in pairs.groupby("market", sort=True)["key"]}
+
+    dates = df[COL_DATE].dropna() if COL_DATE in df.columns else pd.Series(dtype="datetime64[ns]")
+    return {
+        "commodities": commodities,
+        "markets":     markets,
+        "rows":        int(len(df)),
+        "date_min":    dates.min().strftime("%Y-%m-%d") if len(dates) else None,
+        "date_max":    dates.max().strftime("%Y-%m-%d") if len(dates) else None,
+    }
+
+
+def sync_manifest(data_dir: Path, load_frame: Callable[[str], pd.DataFrame]) -> tuple[dict[str, dict], int]:
+    """
+    Bring the manifest up to date with data_dir and return (entries, generation).
+    load_frame(filename) is only called for files that are new or have changed.
+    Concurrent callers wait for a running sync rather than repeating its loads.
+    """
+    global _generation
+    with _sync_lock:
+        _ensure_loaded(data_dir)
+
+        changed = False
+        seen = set()
+        with os.scandir(data_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".csv") or entry.name in SKIP_FILES or not entry.is_file():
+                    continue
+                region_id = entry.name[:-4]
+                seen.add(region_id)
+                stat = entry.stat()
+
+                current = _manifest.get(region_id)
+                if current and current["mtime_ns"] == stat.st_mtime_ns and current["size"] == stat.st_size:
+                    continue
+
+                state, district = split_region_id(region_id)
+                try:
+                    summary = summarise_frame(load_frame(entry.name))
+                except Exception as e:
+                    print(f"Market manifest: could not summarise {entry.name}: {e}")
+                    summary = {"commodities": [], "markets": {}, "rows": 0, "date_min": None, "date_max": None}
+
+                with _state_lock:
+                    _manifest[region_id] = {
+                        "file":     entry.name,
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size":     stat.st_size,
+                        "state":    state,
+                        "district": district,
+                        **summary,
+                    }
+                changed = True
+
+        with _state_lock:
+            for region_id in set(_manifest) - seen:
+                del _manifest[region_id]
+                changed = True
+
+            if changed:
+                _generation += 1
+                _write_manifest(data_dir, _manifest)
+            return dict(_manifest), _generation
+
+
+def current_manifest(data_dir: Path) -> tuple[dict[str, dict], int]:
+    """(entries, generation) as last synced or appended to, without scanning data_dir."""
+    with _state_lock:
+        _ensure_loaded(data_dir)
+        return dict(_manifest), _generation
+
+
+def known_date_format(data_dir: Path, region_id: str) -> str | None:
+    """Arrival_Date format recorded for a region by an earlier load, if any."""
+    with _state_lock:
+        _ensure_loaded(data_dir)
+        return _date_formats.get(region_id)
+
+
+def remember_date_format(data_dir: Path, region_id: str, date_format: str | None) -> None:
+    """Record the Arrival_Date format sniffed for a region so later parses skip detection."""
+    with _state_lock:
+        _ensure_loaded(data_dir)
+        if not date_format or _date_formats.get(region_id) == date_format:
+            return
+        _date_formats[region_id] = date_format
+        _write_manifest(data_dir, _manifest)
+
+
+def _ensure_loaded(data_dir: Path) -> None:
+    global _manifest, _generation
+    with _state_lock:
+        if _manifest is None:
+            _manifest = _read_manifest(data_dir)
+            _generation += 1
+
+
+def _manifest_path(data_dir: Path) -> Path:
+    return data_dir / CACHE_DIRNAME / MANIFEST_FILENAME
+
+
+def _read_manifest(data_dir: Path) -> dict[str, dict]:
+    path = _manifest_path(data_dir)
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("version") == MANIFEST_VERSION:
+            _date_formats.update(stored.get("date_formats", {}))
+            return stored.get("regions", {})
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Market manifest: ignoring unreadable {path.name}: {e}")
+    return {}
+
+
+def _write_manifest(data_dir: Path, regions: dict[str, dict]) -> None:
+    path = _manifest_path(data_dir)
+    tmp  = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "regions": regions, "date_formats": _date_formats},
+                f, indent=1, sort_keys=True,
+            )
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"Market manifest: could not write {path.name}: {e}")
+        tmp.unlink(missing_ok=True)
+
+
+def note_append(data_dir: Path, region_id: str, stat: os.stat_result, rows: pd.DataFrame) -> None:
+    """
+    Fold rows just appended to a region into its manifest entry, so the next
+    sync sees an up-to-date entry instead of re-summarising the whole file.
+    """
+    global _generation
+    summary = summarise_frame(rows)
+    with _state_lock:
+        if _manifest is None or region_id not in _manifest:
+            return
+
+        # Replaced rather than updated, so snapshots handed out by sync_manifest stay intact
+        entry   = _manifest[region_id]
+        known   = {name.lower() for name in entry["commodities"]}
+        markets = dict(entry["markets"])
+        for market, keys in summary["markets"].items():
+            markets[market] = sorted(set(markets.get(market, [])) | set(keys))
+        _manifest[region_id] = {
+            **entry,
+            "mtime_ns":    stat.st_mtime_ns,
+            "size":        stat.st_size,
+            "rows":        entry["rows"] + summary["rows"],
+            "commodities": sorted(entry["commodities"] + [c for c in summary["commodities"] if c.lower() not in known]),
+            "markets":     markets,
+            "date_min":    min(filter(None, [entry["date_min"], summary["date_min"]]), default=None),
+            "date_max":    max(filter(None, [entry["date_max"], summary["date_max"]]), default=None),
+        }
+        _generation += 1
+        _write_manifest(data_dir, _manifest)
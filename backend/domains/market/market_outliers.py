@@ -0,0 +1,103 @@
+"""
+Market Outliers — Domain Layer
+Load-time anomaly flags for Modal_Price quotes, e.g. a price typed with an
+extra zero.
+
+Each quote is compared with a trailing rolling median of its commodity's
+quotes, scaled by the rolling median absolute deviation (MAD). Quotes more
+than OUTLIER_Z robust standard deviations away are flagged in the
+COL_ANOMALY column of the partition. The window only looks back, so
+appending later days never changes the flags of earlier rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .market_columns import COL_DATE, COL_GRADE, COL_MARKET, COL_MODAL, COL_VARIETY
+
+COL_ANOMALY = "Anomaly"
+
+OUTLIER_WINDOW      = 21      # quotes in the trailing window, the current one included
+OUTLIER_MIN_PERIODS = 5       # quotes needed before anything is flagged
+OUTLIER_Z           = 5.0     # flag beyond this many robust σ
+MAD_FLOOR           = 0.05    # σ is at least 5% of the median, so flat series are not hair-trigger
+MAD_SCALE           = 1.4826  # MAD → σ for normally distributed prices
+
+ANOMALY_COLUMNS = [COL_DATE, COL_MARKET, COL_VARIETY, COL_GRADE, "price", "expected", "deviation_pct", "score"]
+
+
+def empty_anomalies() -> pd.DataFrame:
+    return pd.DataFrame({
+        COL_DATE:        pd.Series(dtype="datetime64[ns]"),
+        COL_MARKET:      pd.Series(dtype="object"),
+        COL_VARIETY:     pd.Series(dtype="object"),
+        COL_GRADE:       pd.Series(dtype="object"),
+        "price":         pd.Series(dtype="float64"),
+        "expected":      pd.Series(dtype="float64"),
+        "deviation_pct": pd.Series(dtype="float64"),
+        "score":         pd.Series(dtype="float64"),
+    })
+
+
+def robust_scores(prices: pd.Series, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (expected, score) for every quote: the trailing rolling median of its
+    series and the absolute deviation from it in robust σ. One grouped
+    rolling pass per statistic covers every series; NaN while warming up.
+    """
+    prices = prices.reset_index(drop=True).astype(np.float64)
+    median = _rolling_median(prices, keys)
+    dev    = (prices - median).abs()
+    mad    = _rolling_median(dev, keys)
+
+    sigma = np.maximum(MAD_SCALE * mad.to_numpy(), MAD_FLOOR * median.abs().to_numpy())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = dev.to_numpy() / sigma
+    return median.to_numpy(), score
+
+
+def _rolling_median(values: pd.Series, keys: np.ndarray) -> pd.Series:
+    grouped = values.groupby(keys, sort=False).rolling(OUTLIER_WINDOW, min_periods=OUTLIER_MIN_PERIODS)
+    return grouped.median().droplevel(0).sort_index()
+
+
+def mark_anomalies(frame: pd.DataFrame, ranges: dict[str, tuple[int, int]]) -> tuple[pd.DataFrame, dict[str, pd.DataFrame]]:
+    """
+    Add COL_ANOMALY to a frame sorted by (commodity, date) with the given row
+    ranges, and return it with each commodity key's table of flagged quotes.
+    """
+    flags  = np.zeros(len(frame), dtype=bool)
+    tables = {key: empty_anomalies() for key in ranges}
+    if COL_MODAL not in frame.columns or not len(frame):
+        return frame.assign(**{COL_ANOMALY: flags}), tables
+
+    keys = np.empty(len(frame), dtype=object)
+    for key, (start, stop) in ranges.items():
+        keys[start:stop] = key
+
+    # Undated rows are never flagged and stay out of the dated rows' windows
+    dated = frame[COL_DATE].notna().to_numpy() if COL_DATE in frame.columns else np.ones(len(frame), dtype=bool)
+    expected = np.full(len(frame), np.nan)
+    score    = np.full(len(frame), np.nan)
+    if dated.any():
+        expected[dated], score[dated] = robust_scores(frame.loc[dated, COL_MODAL], keys[dated])
+    flags = np.nan_to_num(score, nan=0.0) > OUTLIER_Z
+    frame = frame.assign(**{COL_ANOMALY: flags})
+
+    hits = np.flatnonzero(flags)
+    if len(hits):
+        found = frame.iloc[hits]
+        price = found[COL_MODAL].to_numpy(dtype=np.float64)
+        table = pd.DataFrame({
+            COL_DATE:        found[COL_DATE].to_numpy() if COL_DATE in found.columns else pd.NaT,
+            COL_MARKET:      found[COL_MARKET].astype(str).to_numpy() if COL_MARKET in found.columns else "—",
+            COL_VARIETY:     found[COL_VARIETY].astype(str).to_numpy() if COL_VARIETY in found.columns else "—",
+            COL_GRADE:       found[COL_GRADE].astype(str).to_numpy() if COL_GRADE in found.columns else "—",
+            "price":         price,
+            "expected":      expected[hits],
+            "deviation_pct": (price / expected[hits] - 1.0) * 100,
+            "score":         score[hits],
+        })
+        for key, group in table.groupby(keys[hits], sort=False):
+            tables[key] = group.reset_index(drop=True)
+    return frame, tables
@@ -0,0 +1,77 @@
+"""
+Market Rollups — Domain Layer
+Materialised daily statistics of Modal_Price per (region, commodity):
+median, min, max and count of quotes for every dated day.
+
+Built once when a region is loaded, so trend charts are a tail slice of a
+small table instead of a groupby over the raw rows on every request.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .market_columns import COL_DATE, COL_MODAL
+
+ROLLUP_COLUMNS = [COL_DATE, "median", "min", "max", "count"]
+
+
+def empty_rollup() -> pd.DataFrame:
+    return pd.DataFrame({
+        COL_DATE: pd.Series(dtype="datetime64[ns]"),
+        "median": pd.Series(dtype="float64"),
+        "min":    pd.Series(dtype="float64"),
+        "max":    pd.Series(dtype="float64"),
+        "count":  pd.Series(dtype="int64"),
+    })
+
+
+def build_daily_rollups(
+    frame: pd.DataFrame,
+    ranges: dict[str, tuple[int, int]],
+    exclude: np.ndarray | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    One date-ascending daily table per commodity key, from a frame sorted by
+    (commodity, date) with the given row ranges. A single grouped aggregation
+    covers every commodity; rows where exclude is True are left out.
+    """
+    if not ranges or COL_DATE not in frame.columns or COL_MODAL not in frame.columns:
+        return {}
+
+    keys = np.empty(len(frame), dtype=object)
+    for key, (start, stop) in ranges.items():
+        keys[start:stop] = key
+
+    usable = (frame[COL_DATE].notna() & frame[COL_MODAL].notna()).to_numpy()
+    if exclude is not None:
+        usable = usable & ~exclude
+    quotes = frame.loc[usable, [COL_DATE, COL_MODAL]].assign(_key=keys[usable])
+    daily  = (
+        quotes.groupby(["_key", COL_DATE], sort=True)[COL_MODAL]
+              .agg(["median", "min", "max", "count"])
+              .reset_index()
+    )
+    rollups = {
+        key: group.drop(columns="_key").reset_index(drop=True)
+        for key, group in daily.groupby("_key", sort=False)
+    }
+    # Commodities with no usable quotes still get a (empty) table
+    for key in ranges:
+        rollups.setdefault(key, empty_rollup())
+    return rollups
+
+
+def merge_daily_rollup(daily: pd.DataFrame, rows: pd.DataFrame, since: pd.Timestamp) -> pd.DataFrame:
+    """
+    Refresh a daily table after an append. rows must be every quote of the
+    commodity dated on/after since (a tail slice of the partition); days
+    before since are kept as they are.
+    """
+    usable = rows[rows[COL_DATE].notna() & rows[COL_MODAL].notna()]
+    fresh  = (
+        usable.groupby(COL_DATE, sort=True)[COL_MODAL]
+              .agg(["median", "min", "max", "count"])
+              .reset_index()
+    )
+    kept = daily[daily[COL_DATE] < since]
+    return pd.concat([kept, fresh], ignore_index=True)[ROLLUP_COLUMNS]
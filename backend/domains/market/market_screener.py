@@ -0,0 +1,194 @@
+"""
+Market Screener — Domain Layer
+Momentum and BUY/HOLD/SELL signals for every commodity in every region,
+computed column-wise instead of one series at a time.
+
+Per region, the last `days` daily medians of every commodity are pivoted
+into one date × commodity matrix and scored with the screen_* signal
+functions; the resulting block is memoised on the region's RegionData, so
+it is rebuilt only when that region is reloaded or appended to. Region
+blocks are concatenated, filtered and sorted per request.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from .market_analyze import _load_region, get_available_filters
+from .market_columns import COL_COMMODITY, COL_DATE, COL_MODAL
+from .market_executor import run_in_market_pool
+from .market_index import RegionData
+from .market_manifest import split_region_id
+from .market_rollups import empty_rollup
+from .market_signals import screen_buyer_signal, screen_price_momentum, screen_trade_recommendation
+
+SCREENER_COLUMNS = [
+    "region", "state", "district", "commodity", "date",
+    "price", "prev_price", "price_change", "trend",
+    "change_pct", "volatility", "high", "low", "period_days", "momentum",
+    "buyer_signal", "action", "confidence", "score",
+]
+SORT_KEYS = [
+    "abs_change", "change_pct", "price", "price_change", "volatility", "high", "low",
+    "period_days", "confidence", "score", "region", "commodity",
+]
+
+
+async def get_market_screener(
+    days:       int = 14,
+    sort:       str = "abs_change",
+    order:      str = "desc",
+    action:     str | None = None,
+    momentum:   str | None = None,
+    state:      str | None = None,
+    region:     str | None = None,
+    commodity:  str | None = None,
+    min_change: float = 0.0,
+    limit:      int = 50,
+    exclude_anomalies: bool = False,
+) -> dict:
+    """
+    Screen every (region, commodity) series over its last `days` dated days.
+    sort="abs_change" (default) ranks by absolute change_pct — the top movers.
+    Filters are exact, case-insensitive matches; min_change is on |change_pct|.
+    exclude_anomalies=True scores the series without their flagged outlier quotes.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+
+    filters = await run_in_market_pool(get_available_filters)
+    regions = [
+        r for r in sorted(filters["regions"])
+        if (not region or r.lower() == region.lower())
+        and (not state or split_region_id(r)[0].lower() == state.lower())
+    ]
+    blocks = await asyncio.gather(*(run_in_market_pool(region_screen, r, days, exclude_anomalies) for r in regions))
+    return await run_in_market_pool(
+        _select, list(blocks), days, sort, order, action, momentum, commodity, min_change, limit,
+    )
+
+
+def region_screen(region: str, days: int = 14, exclude_anomalies: bool = False) -> pd.DataFrame:
+    """Screener rows for every commodity of one region (memoised per region version)."""
+    try:
+        data = _load_region(f"{region}.csv")
+    except FileNotFoundError:
+        return pd.DataFrame(columns=SCREENER_COLUMNS)
+    if exclude_anomalies:
+        data = data.without_anomalies()
+
+    memo = ("screen", days)
+    block = data.derived.get(memo)
+    if block is None:
+        block = _screen(data, region, days)
+        data.derived[memo] = block
+    return block
+
+
+def _screen(data: RegionData, region: str, days: int) -> pd.DataFrame:
+    if COL_COMMODITY not in data.columns:
+        return pd.DataFrame(columns=SCREENER_COLUMNS)
+    named = {
+        key: str(part[COL_COMMODITY].iloc[0])
+        for key, part in data.partitions.items() if len(part)
+    }
+    # Latest and previous raw row per commodity decide the price trend; a
+    # commodity whose rows are all flagged has none left in a filtered view
+    quotes = {}
+    for key, name in named.items():
+        if name and name != "nan":
+            modal = data.partitions[key][COL_MODAL].to_numpy(dtype=np.float64)
+            quotes[key] = modal[data.latest_positions(key, len(modal))]
+    keys  = [key for key, modal in quotes.items() if len(modal)]
+    names = [named[key] for key in keys]
+    if not keys:
+        return pd.DataFrame(columns=SCREENER_COLUMNS)
+
+    latest = np.full(len(keys), np.nan)
+    prev   = np.full(len(keys), np.nan)
+    for i, key in enumerate(keys):
+        modal     = quotes[key]
+        latest[i] = modal[-1]
+        prev[i]   = modal[-2] if len(modal) > 1 else modal[-1]
+    if data.compact:
+        latest, prev = latest.round(2), prev.round(2)
+
+    # date × commodity matrix of the last `days` daily medians
+    long = pd.concat(
+        [data.rollups.get(key, empty_rollup()).tail(days)[[COL_DATE, "median"]].assign(series=i)
+         for i, key in enumerate(keys)],
+        ignore_index=True,
+    )
+    matrix = long.pivot(index=COL_DATE, columns="series", values="median").reindex(columns=range(len(keys)))
+    period_days = long.groupby("series").size().reindex(range(len(keys)), fill_value=0).to_numpy()
+
+    price_change = np.round(latest - prev, 2)
+    trend = np.where(price_change > 0, "up", np.where(price_change < 0, "down", "stable"))
+    buyer = screen_buyer_signal(np.zeros(len(keys)), trend)   # no arrival volumes in the CSVs
+    momentum = screen_price_momentum(matrix.to_numpy().round(2))
+    recommendation = screen_trade_recommendation(trend, buyer, momentum["momentum"].to_numpy())
+
+    last_day = long.groupby("series")[COL_DATE].max().reindex(range(len(keys)))
+    state, district = split_region_id(region)
+    block = pd.DataFrame({
+        "region":       region,
+        "state":        state,
+        "district":     district,
+        "commodity":    names,
+        "date":         last_day.dt.strftime("%Y-%m-%d").to_numpy(),
+        "price":        latest,
+        "prev_price":   prev,
+        "price_change": price_change,
+        "trend":        trend,
+        "period_days":  period_days,
+        "buyer_signal": buyer,
+    })
+    block = pd.concat([block, momentum, recommendation.drop(columns="reason")], axis=1)
+    return block[SCREENER_COLUMNS]
+
+
+def _select(
+    blocks: list[pd.DataFrame],
+    days: int,
+    sort: str,
+    order: str,
+    action: str | None,
+    momentum: str | None,
+    commodity: str | None,
+    min_change: float,
+    limit: int,
+) -> dict:
+    blocks = [b for b in blocks if len(b)]
+    frame  = pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame(columns=SCREENER_COLUMNS)
+
+    mask = np.ones(len(frame), dtype=bool)
+    if action:
+        mask &= (frame["action"] == action.upper()).to_numpy()
+    if momentum:
+        mask &= (frame["momentum"] == momentum.lower()).to_numpy()
+    if commodity:
+        mask &= (frame["commodity"].str.lower() == commodity.strip().lower()).to_numpy()
+    if min_change:
+        mask &= (frame["change_pct"].abs() >= min_change).to_numpy()
+    frame = frame[mask]
+
+    ascending = order == "asc"
+    if sort == "abs_change":
+        moved = frame["change_pct"].astype(float).abs().sort_values(ascending=ascending, kind="stable")
+        frame = frame.loc[moved.index]
+    else:
+        frame = frame.sort_values(sort, ascending=ascending, kind="stable", na_position="last")
+
+    page = frame.head(limit)
+    page = page.astype(object).where(page.notna(), None)
+    return {
+        "days":    days,
+        "sort":    sort,
+        "order":   order,
+        "total":   int(len(frame)),
+        "count":   int(len(page)),
+        "results": page.to_dict(orient="records"),
+    }
@@ -0,0 +1,139 @@
+"""
+Market Seasonality — Domain Layer
+"Is today's price high or low for this time of year?" from a commodity's
+full daily-median history.
+
+day of year — every day's median is pooled with the days within
+              SEASON_WINDOW days of it in any year (wrapping over the new
+              year); Feb 29 counts as Feb 28
+month       — every daily median of that calendar month in any year
+
+Each bucket keeps its observations sorted, so percentile bands are read
+straight off it and the seasonal percentile of a price is one binary
+search. Appended days are inserted into the buckets they touch and only
+those buckets' bands are recomputed.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .market_columns import COL_DATE
+
+SEASON_DAYS   = 365
+SEASON_WINDOW = 15                       # ± days of year pooled per bucket
+BAND_LEVELS   = (10, 25, 50, 75, 90)
+BAND_COLUMNS  = ["p10", "p25", "median", "p75", "p90"]
+
+_MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def season_day(dates) -> np.ndarray:
+    """0-based day of a 365-day year (Feb 29 shares Feb 28's day)."""
+    dates = pd.DatetimeIndex(np.atleast_1d(dates))
+    doy   = dates.dayofyear.to_numpy() - 1
+    late  = dates.is_leap_year & (doy >= 59)   # Feb 29 (doy 59) and later in leap years
+    return np.where(late, doy - 1, doy).astype(np.int64)
+
+
+def _bands(values: np.ndarray) -> np.ndarray:
+    if not len(values):
+        return np.full(len(BAND_LEVELS), np.nan)
+    return np.percentile(values, BAND_LEVELS)
+
+
+class SeasonalProfile:
+    """
+    Day-of-year and month buckets of one commodity's daily medians, with
+    their percentile bands. Instances are never modified; extend() returns
+    a new profile sharing the untouched buckets.
+    """
+
+    def __init__(self, days: list[np.ndarray], months: list[np.ndarray], last_day: pd.Timestamp | None,
+                 day_bands: np.ndarray | None = None, month_bands: np.ndarray | None = None):
+        self.days     = days        # SEASON_DAYS sorted arrays (window-pooled)
+        self.months   = months      # 12 sorted arrays
+        self.last_day = last_day
+        self.day_bands   = day_bands if day_bands is not None else np.array([_bands(v) for v in days])
+        self.month_bands = month_bands if month_bands is not None else np.array([_bands(v) for v in months])
+
+    @classmethod
+    def build(cls, daily: pd.DataFrame) -> "SeasonalProfile":
+        """Buckets and bands over the whole daily rollup."""
+        dates  = daily[COL_DATE]
+        prices = daily["median"].to_numpy(dtype=np.float64)
+        doy    = season_day(dates.to_numpy())
+        month  = dates.dt.month.to_numpy() - 1
+
+        per_day = [prices[doy == d] for d in range(SEASON_DAYS)]
+        days = [
+            np.sort(np.concatenate([per_day[(d + off) % SEASON_DAYS] for off in range(-SEASON_WINDOW, SEASON_WINDOW + 1)]))
+            for d in range(SEASON_DAYS)
+        ]
+        months = [np.sort(prices[month == m]) for m in range(12)]
+        return cls(days, months, dates.iloc[-1] if len(dates) else None)
+
+    def extend(self, daily: pd.DataFrame) -> "SeasonalProfile":
+        """
+        New profile with the days of daily after last_day added. The caller
+        guarantees the days up to last_day did not change.
+        """
+        dates = daily[COL_DATE]
+        fresh = daily if self.last_day is None else daily[dates > self.last_day]
+        if fresh.empty:
+            return self
+
+        days, months = list(self.days), list(self.months)
+        day_bands, month_bands = self.day_bands.copy(), self.month_bands.copy()
+        prices = fresh["median"].to_numpy(dtype=np.float64)
+        doy    = season_day(fresh[COL_DATE].to_numpy())
+        month  = fresh[COL_DATE].dt.month.to_numpy() - 1
+
+        touched_days = set()
+        for price, d in zip(prices, doy):
+            for off in range(-SEASON_WINDOW, SEASON_WINDOW + 1):
+                b = (d + off) % SEASON_DAYS
+                days[b] = np.insert(days[b], np.searchsorted(days[b], price), price)
+                touched_days.add(b)
+        for price, m in zip(prices, month):
+            months[m] = np.insert(months[m], np.searchsorted(months[m], price), price)
+        for b in touched_days:
+            day_bands[b] = _bands(days[b])
+        for m in set(month.tolist()):
+            month_bands[m] = _bands(months[m])
+        return SeasonalProfile(days, months, fresh[COL_DATE].iloc[-1], day_bands, month_bands)
+
+    def position(self, price: float, day: pd.Timestamp) -> dict:
+        """Seasonal percentile of a price on a given day, with that day's bands."""
+        d      = int(season_day(day)[0])
+        values = self.days[d]
+        if not len(values) or not np.isfinite(price):
+            return {"percentile": None, "level": None, "observations": 0, **dict.fromkeys(BAND_COLUMNS)}
+        below = np.searchsorted(values, price, side="left")
+        upto  = np.searchsorted(values, price, side="right")
+        pct   = (below + upto) / 2 / len(values) * 100     # mid-rank, so ties sit in the middle
+        level = "low" if pct < 25 else ("high" if pct > 75 else "normal")
+        return {
+            "percentile":   round(float(pct), 1),
+            "level":        level,
+            "observations": int(len(values)),
+            **{col: round(float(v), 2) for col, v in zip(BAND_COLUMNS, self.day_bands[d])},
+        }
+
+
+def _band_rows(bands: np.ndarray, buckets: list[np.ndarray], labels: list[str]) -> list[dict]:
+    return [
+        {"label": label, "observations": len(values),
+         **{col: (float(v) if np.isfinite(v) else None) for col, v in zip(BAND_COLUMNS, row)}}
+        for label, values, row in zip(labels, buckets, np.round(bands, 2))
+    ]
+
+
+def to_seasonal_profile(profile: SeasonalProfile) -> dict:
+    """Month and day-of-year band tables for the UI (None where a bucket is empty)."""
+    day_labels = pd.date_range("2001-01-01", periods=SEASON_DAYS, freq="D").strftime("%d %b").tolist()
+    return {
+        "window_days": SEASON_WINDOW,
+        "last_day":    f"{profile.last_day:%Y-%m-%d}" if profile.last_day is not None else None,
+        "months":      _band_rows(profile.month_bands, profile.months, _MONTH_LABELS),
+        "days":        _band_rows(profile.day_bands, profile.days, day_labels),
+    }
@@ -2,8 +2,20 @@
 Market Signals — Domain Layer
 Derives economic signals from raw market data.
 No API calls, no LLM — pure computation.
+
+The screen_* functions are column-wise versions of the compute_* functions
+for many series at once (one column per series), used by the screener.
 """
 
+import numpy as np
+import pandas as pd
+
+ACTION_REASONS = {
+    "BUY":  "Strong price momentum with high buyer demand.",
+    "SELL": "Falling prices and weak demand signal oversupply.",
+    "HOLD": "Mixed signals — monitor for 3–5 days before acting.",
+}
+
 
 def compute_buyer_signal(arrival: float, trend: str) -> str:
     """
@@ -89,13 +101,11 @@ def compute_trade_recommendation(
 
     if score >= 3:
         action = "BUY"
-        reason = "Strong price momentum with high buyer demand."
     elif score <= -2:
         action = "SELL"
-        reason = "Falling prices and weak demand signal oversupply."
     else:
         action = "HOLD"
-        reason = "Mixed signals — monitor for 3–5 days before acting."
+    reason = ACTION_REASONS[action]
 
     confidence = min(95, 50 + abs(score) * 10)
 
@@ -125,3 +135,83 @@ def enrich_market_data(raw: dict, series: list[dict] | None = None) -> dict:
         "buyer_signal":  buyer_signal,
         "momentum":      momentum_data,
     }
+
+
+# ── Column-wise (screener) versions ───────────────────────────────────────
+
+def screen_buyer_signal(arrival: np.ndarray, trend: np.ndarray) -> np.ndarray:
+    """compute_buyer_signal for arrays of arrivals and trends."""
+    high = np.asarray(arrival, dtype=float) > 50
+    up, down = trend == "up", trend == "down"
+    return np.select(
+        [high & up, high & down, ~high & up, ~high & down],
+        ["Strong Demand", "Oversupply", "Scarcity Premium", "Weak Demand"],
+        default="Stable",
+    )
+
+
+def screen_price_momentum(prices: np.ndarray) -> pd.DataFrame:
+    """
+    compute_price_momentum for a date × series matrix of daily prices
+    (oldest→newest, NaN where a series has no price that day).
+    Returns one row per series: momentum, change_pct, volatility, high, low.
+    high/low are NaN for series with fewer than two positive prices.
+    """
+    prices = np.asarray(prices, dtype=float)
+    if not len(prices):
+        prices = np.full((1, prices.shape[1]), np.nan)
+    n_days, n_series = prices.shape
+    valid = np.isfinite(prices) & (np.nan_to_num(prices) > 0)
+    count = valid.sum(axis=0)
+    cols  = np.arange(n_series)
+
+    first = prices[valid.argmax(axis=0), cols]
+    last  = prices[n_days - 1 - valid[::-1].argmax(axis=0), cols]
+    enough = count >= 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.where(enough, np.round((last - first) / first * 100, 2), 0.0)
+
+    # Mean absolute change between consecutive positive prices (gaps skipped)
+    kept = np.where(valid, prices, np.nan)
+    prev = pd.DataFrame(kept).ffill().shift(1).to_numpy()
+    steps = valid & np.isfinite(prev)
+    total = np.where(steps, np.abs(kept - prev), 0.0).sum(axis=0)
+    volatility = np.where(enough, np.round(total / np.maximum(steps.sum(axis=0), 1), 2), 0.0)
+
+    high = np.where(enough, np.where(valid, prices, -np.inf).max(axis=0, initial=-np.inf), np.nan)
+    low  = np.where(enough, np.where(valid, prices,  np.inf).min(axis=0, initial=np.inf), np.nan)
+    momentum = np.where(change_pct > 2, "rising", np.where(change_pct < -2, "falling", "neutral"))
+
+    return pd.DataFrame({
+        "momentum":   momentum,
+        "change_pct": change_pct,
+        "volatility": volatility,
+        "high":       high,
+        "low":        low,
+    })
+
+
+def screen_trade_recommendation(
+    trend: np.ndarray,
+    buyer_signal: np.ndarray,
+    momentum: np.ndarray,
+    risk_level: str = "Low",
+) -> pd.DataFrame:
+    """compute_trade_recommendation for arrays of signals (one shared risk level)."""
+    score = (
+        np.select([trend == "up", trend == "down"], [2, -2], default=0)
+        + np.select([momentum == "rising", momentum == "falling"], [1, -1], default=0)
+        + np.select(
+            [np.isin(buyer_signal, ["Strong Demand", "Scarcity Premium"]),
+             np.isin(buyer_signal, ["Oversupply", "Weak Demand"])],
+            [1, -1], default=0,
+        )
+        - {"High": 2, "Moderate": 1}.get(risk_level, 0)
+    )
+    action = np.select([score >= 3, score <= -2], ["BUY", "SELL"], default="HOLD")
+    return pd.DataFrame({
+        "action":     action,
+        "reason":     pd.Series(action).map(ACTION_REASONS).to_numpy(),
+        "confidence": np.minimum(95, 50 + np.abs(score) * 10),
+        "score":      score,
+    })
@@ -0,0 +1,191 @@
+"""
+Market Spread — Domain Layer
+Cross-region comparison of one commodity: pairwise price spreads, their
+volatility, and the latest arbitrage opportunities.
+
+Every region's daily median for the commodity is aligned on date in one
+outer join, and all region pairs are computed at once from masked matrix
+products over the date × region price matrix (spread[i, j] = price in j
+minus price in i, i.e. buy in i and sell in j), so memory stays at
+region × region however long the window. Each region is loaded once
+per request, usually from the region cache. The matrix is cached per
+commodity and window, tagged with the versions of every region it was
+built from, so it is recomputed as soon as any of them changes.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from .market_analyze import _load_region, get_available_filters
+from .market_cache import ByteBudgetCache
+from .market_columns import COL_DATE
+from .market_executor import run_in_market_pool
+from .market_index import commodity_key
+
+SPREAD_CACHE_BYTES = 64 * 1024 * 1024
+
+_SPREAD_CACHE = ByteBudgetCache(SPREAD_CACHE_BYTES)
+
+
+async def get_market_spread(commodity: str, days: int = 90, min_pct: float = 0.0, limit: int = 20) -> dict:
+    """
+    Spread matrix of a commodity across every region that trades it, over the
+    last `days` calendar days up to the latest quote in any region, plus the
+    `limit` widest current spreads of at least min_pct percent.
+    """
+    filters = await run_in_market_pool(get_available_filters)
+    key     = commodity_key(commodity)
+    regions = [
+        region for region, names in sorted(filters["commodities"].items())
+        if any(commodity_key(name) == key for name in names)
+    ]
+    loaded = await asyncio.gather(*(run_in_market_pool(_region_daily, r, commodity) for r in regions))
+    return await run_in_market_pool(_spread, commodity, regions, loaded, days, min_pct, limit)
+
+
+def get_spread_cache_stats() -> dict:
+    """Hit/miss/eviction/invalidation counters of the spread matrix cache."""
+    return _SPREAD_CACHE.stats()
+
+
+def _region_daily(region: str, commodity: str) -> tuple[tuple, pd.DataFrame]:
+    data = _load_region(f"{region}.csv")
+    return data.version, data.daily(commodity)
+
+
+def _spread(
+    commodity: str,
+    regions: list[str],
+    loaded: list[tuple[tuple, pd.DataFrame]],
+    days: int,
+    min_pct: float,
+    limit: int,
+) -> dict:
+    version = tuple((region, v) for region, (v, _) in zip(regions, loaded))
+    key     = f"{commodity_key(commodity)}:{days}"
+    matrix  = _SPREAD_CACHE.get(key, version)
+    if matrix is None:
+        matrix = spread_matrix(regions, [daily for _, daily in loaded], days)
+        nbytes = sum(a.nbytes for a in matrix.values() if isinstance(a, np.ndarray))
+        _SPREAD_CACHE.put(key, version, matrix, nbytes)
+
+    return {
+        "commodity":     commodity,
+        "days":          days,
+        "window":        matrix["window"],
+        "regions":       matrix["regions"],
+        "latest": {
+            region: {"price": _num(price), "date": day}
+            for region, price, day in zip(matrix["regions"], matrix["latest"], matrix["latest_date"])
+        },
+        "matrix": {name: _grid(matrix[name]) for name in ("spread", "spread_pct", "mean_spread", "volatility", "zscore")}
+                  | {"overlap_days": matrix["overlap_days"].tolist()},
+        "opportunities": _opportunities(matrix, min_pct, limit),
+    }
+
+
+def spread_matrix(regions: list[str], dailies: list[pd.DataFrame], days: int) -> dict:
+    """
+    Pairwise spread statistics for one commodity. Arrays are region × region,
+    indexed [buy, sell]; regions with no dated quotes are left out.
+    """
+    series = {
+        region: daily.set_index(COL_DATE)["median"]
+        for region, daily in zip(regions, dailies) if len(daily)
+    }
+    if not series:
+        empty = np.empty((0, 0))
+        return {
+            "regions": [], "window": None, "latest": np.empty(0), "latest_date": [], "fresh": np.empty(0, dtype=bool),
+            "spread": empty, "spread_pct": empty, "mean_spread": empty, "volatility": empty, "zscore": empty,
+            "overlap_days": np.empty((0, 0), dtype=np.int64),
+        }
+
+    prices = pd.concat(series, axis=1).sort_index()          # date × region, NaN where not traded
+    names  = list(prices.columns)
+    quoted = prices.notna().to_numpy()
+    values = prices.to_numpy(dtype=np.float64)
+
+    # Latest quote per region
+    last_pos = len(prices) - 1 - quoted[::-1].argmax(axis=0)
+    latest   = values[last_pos, np.arange(len(names))]
+    latest_day = prices.index[last_pos]
+
+    end   = prices.index[-1]
+    first = end - pd.Timedelta(days=days - 1)
+    lo    = int(prices.index.searchsorted(first))
+    window = values[lo:]
+
+    # Spread [buy, sell] = sell-region price − buy-region price, on dates both quoted.
+    # Its sums come from masked matrix products, so no date × region × region
+    # array is built; prices are centred per region first to keep the
+    # sums of squares well conditioned.
+    quoted_w = np.isfinite(window)
+    centre   = np.nanmean(np.where(quoted_w.any(axis=0), window, 0.0), axis=0)
+    m  = quoted_w.astype(np.float64)
+    x  = np.where(quoted_w, window - centre, 0.0)
+    x2 = x * x
+    overlap = (m.T @ m).astype(np.int64)                  # [i, j] days both quoted
+    sum_buy, sum_sell = x.T @ m, m.T @ x                  # Σ x_i, Σ x_j over those days
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shifted = (sum_sell - sum_buy) / overlap          # mean spread of the centred prices
+        squares = x2.T @ m + m.T @ x2 - 2 * (x.T @ x)     # Σ (x_j − x_i)²
+        var  = np.maximum(squares - overlap * shifted ** 2, 0.0) / (overlap - 1)
+        np.fill_diagonal(var, 0.0)
+        mean = np.where(overlap > 0, shifted + centre[None, :] - centre[:, None], np.nan)
+        vol  = np.where(overlap > 1, np.sqrt(var), np.nan)
+
+        spread     = latest[None, :] - latest[:, None]
+        spread_pct = spread / latest[:, None] * 100
+        zscore     = np.where(vol > 0, (spread - mean) / vol, np.nan)
+
+    return {
+        "regions":      names,
+        "window":       {"from": f"{prices.index[lo]:%Y-%m-%d}", "to": f"{end:%Y-%m-%d}"},
+        "latest":       latest,
+        "latest_date":  [f"{day:%Y-%m-%d}" for day in latest_day],
+        "fresh":        latest_day >= first,                # quoted inside the window
+        "spread":       spread,
+        "spread_pct":   spread_pct,
+        "mean_spread":  mean,
+        "volatility":   vol,
+        "zscore":       zscore,
+        "overlap_days": overlap,
+    }
+
+
+def _opportunities(matrix: dict, min_pct: float, limit: int) -> list[dict]:
+    """Widest positive current spreads between regions both quoted inside the window."""
+    names = matrix["regions"]
+    if not names:
+        return []
+    fresh = np.asarray(matrix["fresh"])
+    pct   = matrix["spread_pct"]
+    ok    = np.isfinite(pct) & (pct > 0) & (pct >= min_pct) & fresh[:, None] & fresh[None, :]
+    buy, sell = np.nonzero(ok)
+    order = np.argsort(-pct[buy, sell], kind="stable")[:limit]
+    return [
+        {
+            "buy_region":  names[i],
+            "sell_region": names[j],
+            "buy_price":   _num(matrix["latest"][i]),
+            "sell_price":  _num(matrix["latest"][j]),
+            "spread":      _num(matrix["spread"][i, j]),
+            "spread_pct":  _num(pct[i, j]),
+            "mean_spread": _num(matrix["mean_spread"][i, j]),
+            "volatility":  _num(matrix["volatility"][i, j]),
+            "zscore":      _num(matrix["zscore"][i, j]),
+        }
+        for i, j in zip(buy[order], sell[order])
+    ]
+
+
+def _num(value) -> float | None:
+    return round(float(value), 2) if np.isfinite(value) else None
+
+
+def _grid(values: np.ndarray) -> list[list[float | None]]:
+    rounded = np.round(values, 2)
+    return [[float(v) if np.isfinite(v) else None for v in row] for row in rounded]
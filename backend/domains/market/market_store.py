@@ -0,0 +1,249 @@
+"""
+Market Store — Columnar Sidecar Cache (Domain Layer)
+Persists the normalised form of each region CSV as Parquet under
+backend/data/.cache/ so cold loads skip the CSV parse entirely.
+
+A sidecar is only trusted while the source CSV's mtime and size match the
+values recorded in the Parquet schema metadata; replacing the CSV makes
+the next load re-parse it and rewrite the sidecar. Rows ingested through
+market_ingest are stored beside it as small delta files chained by the
+CSV stat before/after each append.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from config import MARKET_COLUMNAR_CACHE
+
+from .market_columns import COL_DATE, PRICE_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # columnar cache is optional — loads fall back to CSV
+    pa = None
+    pq = None
+
+CACHE_DIRNAME = ".cache"
+_META_KEY     = b"leafnet.market"
+# Bump when the normalisation in _load_csv changes shape, so stale sidecars are ignored
+STORE_VERSION = 2
+# Appended deltas kept beside a sidecar before they are folded back into it
+MAX_DELTAS    = 32
+
+# Per-file load metrics: filename → {source, load_ms, rows, loaded_at}
+_LOAD_STATS: dict[str, dict] = {}
+
+
+def _sidecar_path(csv_path: Path) -> Path:
+    return csv_path.parent / CACHE_DIRNAME / f"{csv_path.stem}.parquet"
+
+
+def _delta_paths(csv_path: Path) -> list[Path]:
+    return sorted((csv_path.parent / CACHE_DIRNAME).glob(f"{csv_path.stem}.delta-*.parquet"))
+
+
+def _source_meta(stat: os.stat_result) -> dict:
+    return {
+        "version":  STORE_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size":     stat.st_size,
+    }
+
+
+def _read_meta(path: Path) -> dict:
+    metadata = pq.read_schema(path).metadata or {}
+    return json.loads(metadata.get(_META_KEY, b"{}"))
+
+
+def _temp_path(path: Path) -> Path:
+    """Temp file beside path, unique per process and thread so concurrent writers never share one."""
+    return path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def _write_table(path: Path, df: pd.DataFrame, meta: dict) -> None:
+    """Write df to path with meta attached, via a temp file + rename so readers never see a partial file."""
+    tmp = _temp_path(path)
+    try:
+        path.parent.mkdir(exist_ok=True)
+        table    = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), _META_KEY: json.dumps(meta).encode()}
+        pq.write_table(table.replace_schema_metadata(metadata), tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _stream_schema(columns: list[str], meta: dict) -> "pa.Schema":
+    """
+    Declared schema of a streamed sidecar: Arrival_Date a timestamp, prices
+    float64 and every other column a string (region CSVs are read as text,
+    so this matches a frame parsed in memory).
+    Inferring it from the first chunk would type a column that chunk leaves
+    empty as null, and reject the next chunk that has values in it.
+    """
+    fields = []
+    for col in columns:
+        if col == COL_DATE:
+            fields.append(pa.field(col, pa.timestamp("ns")))
+        elif col in PRICE_COLUMNS:
+            fields.append(pa.field(col, pa.float64()))
+        else:
+            fields.append(pa.field(col, pa.large_string()))
+    return pa.schema(fields, metadata={_META_KEY: json.dumps(meta).encode()})
+
+
+def _read_frame(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    if columns is not None:
+        names   = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in names]
+    # self_destruct frees each Arrow column as it is converted, so the table and
+    # the frame are never both fully resident
+    return pq.read_table(path, columns=columns).to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _valid_chain(csv_path: Path, stat: os.stat_result) -> list[Path] | None:
+    """
+    The sidecar plus the appended deltas that together describe the CSV as it
+    is now, or None if they do not. Each delta records the CSV stat before and
+    after its rows were appended, so the chain must run from the sidecar's stat
+    to the current one without gaps.
+    """
+    sidecar = _sidecar_path(csv_path)
+    if not sidecar.exists():
+        return None
+
+    current = _read_meta(sidecar)
+    chain   = [sidecar]
+    for delta in _delta_paths(csv_path):
+        meta = _read_meta(delta)
+        if meta.get("before") != current:
+            break
+        current = meta.get("after")
+        chain.append(delta)
+    return chain if current == _source_meta(stat) else None
+
+
+def columnar_enabled() -> bool:
+    return MARKET_COLUMNAR_CACHE and pq is not None
+
+
+def read_columnar(csv_path: Path, stat: os.stat_result, columns: list[str] | None = None) -> pd.DataFrame | None:
+    """
+    Return the cached normalised frame for csv_path (sidecar plus any appended
+    deltas), or None if there is no sidecar or it was written for a different
+    version of the CSV. With columns, only those of them the sidecar has are read.
+    """
+    if not columnar_enabled():
+        return None
+
+    try:
+        chain = _valid_chain(csv_path, stat)
+        if chain is None:
+            return None
+        frames = [_read_frame(path, columns) for path in chain]
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    except Exception as e:
+        print(f"Market store: ignoring unreadable sidecar for {csv_path.name}: {e}")
+        return None
+
+
+def write_columnar(csv_path: Path, stat: os.stat_result, df: pd.DataFrame) -> None:
+    """
+    Write df as the sidecar for csv_path, tagged with the CSV's stat, and drop
+    any deltas left from an earlier version.
+    Failures are logged and swallowed — the cache is an optimisation only.
+    """
+    if not columnar_enabled():
+        return
+
+    try:
+        _write_table(_sidecar_path(csv_path), df, _source_meta(stat))
+        for delta in _delta_paths(csv_path):
+            delta.unlink(missing_ok=True)
+    except Exception as e:
+        print(f"Market store: could not write sidecar for {csv_path.name}: {e}")
+
+
+def write_columnar_chunks(csv_path: Path, stat: os.stat_result, chunks: Iterable[pd.DataFrame]) -> bool:
+    """
+    Stream normalised chunks into the sidecar for csv_path, one Parquet row
+    group per chunk, so only one chunk is ever held in memory. The schema is
+    declared from the normalised column types (see _stream_schema) for the
+    first chunk's columns. Returns False (and leaves no sidecar) on failure.
+    """
+    if not columnar_enabled():
+        return False
+
+    sidecar = _sidecar_path(csv_path)
+    tmp     = _temp_path(sidecar)
+    writer  = None
+    try:
+        sidecar.parent.mkdir(exist_ok=True)
+        for chunk in chunks:
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, _stream_schema(list(chunk.columns), _source_meta(stat)))
+            writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+        if writer is None:
+            return False
+        writer.close()
+        writer = None
+        os.replace(tmp, sidecar)
+        for delta in _delta_paths(csv_path):
+            delta.unlink(missing_ok=True)
+        return True
+    except Exception as e:
+        print(f"Market store: could not stream sidecar for {csv_path.name}: {e}")
+        return False
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+
+
+def append_columnar(csv_path: Path, before: os.stat_result, after: os.stat_result, rows: pd.DataFrame) -> None:
+    """
+    Record rows appended to csv_path as a delta file, so the next cold load
+    reads sidecar + deltas instead of re-parsing the CSV. If the sidecar did
+    not describe the CSV before the append, nothing is written (the next load
+    re-parses the CSV, which already contains the rows). Once MAX_DELTAS
+    deltas accumulate they are folded back into the sidecar.
+    """
+    if not columnar_enabled():
+        return
+
+    try:
+        chain = _valid_chain(csv_path, before)
+        if chain is None:
+            return
+        delta = _sidecar_path(csv_path).with_suffix(f".delta-{len(chain):04d}.parquet")
+        _write_table(delta, rows, {"before": _source_meta(before), "after": _source_meta(after)})
+
+        if len(chain) >= MAX_DELTAS:
+            write_columnar(csv_path, after, read_columnar(csv_path, after))
+    except Exception as e:
+        print(f"Market store: could not append delta for {csv_path.name}: {e}")
+
+
+def record_load(filename: str, source: str, seconds: float, rows: int) -> None:
+    """Record how a region file was loaded ("columnar" or "csv") and how long it took."""
+    _LOAD_STATS[filename] = {
+        "source":    source,
+        "load_ms":   round(seconds * 1000, 2),
+        "rows":      rows,
+        "loaded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def get_load_stats() -> dict:
+    """Load-time metrics for every region file loaded by this worker."""
+    return {
+        "columnar_enabled": columnar_enabled(),
+        "files":            dict(_LOAD_STATS),
+    }
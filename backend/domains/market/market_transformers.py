@@ -6,6 +6,28 @@ No API calls, no LLM — pure data transformation.
 
 from datetime import datetime
 
+import pandas as pd
+
+from .market_columns import (
+    COL_STATE, COL_DISTRICT, COL_MARKET, COL_COMMODITY, COL_VARIETY,
+    COL_GRADE, COL_DATE, COL_MIN, COL_MAX, COL_MODAL,
+)
+
+# Output key → (source column, default when the column is missing)
+_RECORD_TEXT_FIELDS = {
+    "state":          (COL_STATE,        "—"),
+    "district":       (COL_DISTRICT,     "—"),
+    "market":         (COL_MARKET,       "—"),
+    "commodity":      (COL_COMMODITY,    "—"),
+    "variety":        (COL_VARIETY,      "Other"),
+    "grade":          (COL_GRADE,        "—"),
+}
+_RECORD_PRICE_FIELDS = {
+    "min_price":      COL_MIN,
+    "max_price":      COL_MAX,
+    "modal_price":    COL_MODAL,
+}
+
 
 def to_price_card(enriched: dict) -> dict:
     """Shape enriched market data into a price summary card for the UI."""
@@ -76,20 +98,28 @@ def to_market_summary(enriched: dict, recommendation: dict | None = None) -> dic
 
 
 
-def to_chart_series(series: list[dict]) -> dict:
+def to_chart_series(series: list[dict], overlays: dict[str, list] | None = None) -> dict:
     """
     Transform raw series data into a chart-ready format.
-    Returns labels (dates) + price/arrival datasets.
+    Returns labels (dates) + price/arrival datasets, plus optional indicator
+    overlays (name → values aligned with labels) when provided.
     """
     labels   = [r["date"]    for r in series]
     prices   = [r["price"]   for r in series]
     arrivals = [r["arrival"] for r in series]
 
-    return {
+    chart = {
         "labels":   labels,
         "price":    prices,
         "arrival":  arrivals,
     }
+    # Weekly/monthly bars also carry open/high/low (price is the close)
+    if series and "open" in series[0]:
+        for key in ("open", "high", "low"):
+            chart[key] = [r[key] for r in series]
+    if overlays is not None:
+        chart["overlays"] = overlays
+    return chart
 
 
 def to_market_summary(enriched: dict, recommendation: dict | None = None) -> dict:
@@ -111,3 +141,38 @@ def to_market_summary(enriched: dict, recommendation: dict | None = None) -> dic
         },
         "generated_at": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
     }
+
+
+def to_record_rows(df: pd.DataFrame) -> list[dict]:
+    """
+    Serialise raw CSV rows for the records data table.
+    Columns are converted in bulk (one strftime / fillna per column) and
+    zipped into dicts, instead of formatting row by row.
+    """
+    n = len(df)
+    columns = {}
+    for key, (col, default) in _RECORD_TEXT_FIELDS.items():
+        columns[key] = _text_values(df[col], default) if col in df.columns else [default] * n
+
+    if COL_DATE in df.columns:
+        columns["arrival_date"] = pd.to_datetime(df[COL_DATE]).dt.strftime("%d/%m/%Y").fillna("—").tolist()
+    else:
+        columns["arrival_date"] = ["—"] * n
+
+    for key, col in _RECORD_PRICE_FIELDS.items():
+        columns[key] = df[col].fillna(0).astype(float).tolist() if col in df.columns else [0.0] * n
+
+    code = "Commodity_Code"
+    columns["commodity_code"] = _text_values(df[code], "—") if code in df.columns else ["—"] * n
+
+    # Keep the key order the data table has always received
+    keys = [
+        "state", "district", "market", "commodity", "variety", "grade", "arrival_date",
+        "min_price", "max_price", "modal_price", "commodity_code",
+    ]
+    return [dict(zip(keys, values)) for values in zip(*(columns[k] for k in keys))]
+
+
+def _text_values(values: pd.Series, default: str) -> list[str]:
+    """str() of each value, with default for missing ones (astype(str) keeps NaN on pandas 3)."""
+    return values.astype(object).map(str, na_action="ignore").fillna(default).tolist()
@@ -6,14 +6,29 @@ Endpoints:
   GET  /api/climate/risk            — Weather data → outbreak risk scoring
   GET  /api/satellite/health        — Vegetation health index
   POST /api/orchestrate             — Multi-agent synthesis via Groq LLM
-  GET  /api/market/intelligence     — Mandi price + signals + recommendation
+  GET  /api/market/intelligence     — Mandi price + signals + recommendation (+ forecast)
+  POST /api/market/intelligence/batch — Intelligence for many (region, commodity) pairs
+  GET  /api/market/screener         — Momentum/recommendation screener across all series
+  GET  /api/market/anomalies        — Recent outlier price quotes across all regions
+  GET  /api/market/backtest         — Historical performance of BUY/HOLD/SELL signals
+  GET  /api/market/series           — Per-market/variety/grade drill-down series
+  GET  /api/market/seasonality      — Day-of-year / month price bands for a commodity
+  GET  /api/market/spread           — Cross-region price spread / arbitrage matrix
+  GET  /api/market/correlation      — Commodity return correlation / covariance matrix
+  GET  /api/market/nearest          — Nearest mandis to a farm with their latest prices
+  GET  /api/market/aggregate        — State / all-India daily price, volume and momentum
+  POST /api/market/ingest           — Append new mandi rows to a region CSV
+  GET  /api/market/cache/stats      — Region load-time and memory cache metrics
   POST /api/growth/roadmap          — AI-powered farmer profit roadmap
   GET  /api/health                  — Health check
 """
 
+import io
+
+import pandas as pd
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
+from datetime import date, datetime
 
 from agents.vision_agent import analyze_image
 from agents.climate_agent import get_climate_risk
@@ -22,16 +37,31 @@ from agents.orchestrator import run_orchestration
 from agents.growth_planner import generate_growth_roadmap
 from domains.market import (
     get_market_data,
-    get_price_trend_series,
     get_available_filters,
     get_market_records,
-    enrich_market_data,
-    compute_trade_recommendation,
-    to_market_summary,
-    to_chart_series,
+    get_market_series,
+    get_market_seasonality,
+    get_market_intelligence,
+    get_market_intelligence_batch,
+    ChartOptions,
+    RESOLUTIONS,
+    get_market_screener,
+    get_market_anomalies,
+    get_market_backtest,
+    get_market_spread,
+    get_spread_cache_stats,
+    get_market_correlation,
+    get_correlation_cache_stats,
+    get_nearest_markets,
+    get_market_aggregate,
+    get_aggregate_cache_stats,
     resolve_coords_for_state,
+    get_load_stats,
+    get_region_cache_stats,
+    run_in_market_pool,
+    ingest_rows,
 )
-from models.schemas import AgentInput, GrowthPlannerInput
+from models.schemas import AgentInput, GrowthPlannerInput, MarketBatchInput
 
 app = FastAPI(
     title="Disease Intelligence Platform API",
@@ -123,45 +153,215 @@ async def orchestrate(agent_input: AgentInput):
 async def market_filters():
     """Return topology (State->District) and commodities from CSV filenames."""
     try:
-        return get_available_filters()
+        return await run_in_market_pool(get_available_filters)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Filter discovery failed: {str(e)}")
 
 
+# ── Market date ranges / chart resolution ──
+def _date_range(date_from: date | None, date_to: date | None) -> tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """Validate an inclusive from/to range and convert it for the market domain."""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    return (
+        pd.Timestamp(date_from) if date_from else None,
+        pd.Timestamp(date_to) if date_to else None,
+    )
+
+
+def _check_resolution(resolution: str) -> None:
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {', '.join(RESOLUTIONS)}")
+
+
 # ── Market Intelligence (Domain Layer) ──
 @app.get("/api/market/intelligence")
 async def market_intelligence(
     region:    str = Query("Kerala_Kottayam", description="Region filename (e.g. Kerala_Kottayam)"),
     commodity: str = Query("Banana",          description="Commodity name (e.g. Banana)"),
-    days:      int = Query(14,                description="Days of price history", ge=1, le=30),
+    days:      int = Query(14,                description="Days of price history (ignored when 'from' is set)", ge=1, le=3650),
+    overlays:  bool = Query(False,            description="Add SMA/EMA, volatility, band and ROC overlays to the chart"),
+    date_from: date | None = Query(None, alias="from", description="First day of the chart (YYYY-MM-DD)"),
+    date_to:   date | None = Query(None, alias="to",   description="Last day of the chart and price card (YYYY-MM-DD)"),
+    resolution: str = Query("auto",           description="Chart points: auto | day | week | month (OHLC) | lttb"),
+    points:    int = Query(300,               description="Point budget for lttb / auto", ge=10, le=2000),
+    forecast:  int = Query(0,                 description="Days of price forecast with intervals (0 = none)", ge=0, le=30),
+    exclude_anomalies: bool = Query(False,    description="Leave flagged outlier quotes out of signals and chart"),
+    seasonal:  bool = Query(False,            description="Add the seasonal percentile (price vs same time of year) to the price card"),
 ):
     """
-    Full market intelligence: price card + trend chart + trade recommendation.
+    Full market intelligence: price card + trend chart + trade recommendation,
+    plus a seasonal price forecast when requested.
     Powered by uploaded CSV files (backend/data/*.csv).
     """
-    import asyncio
+    start, end = _date_range(date_from, date_to)
+    _check_resolution(resolution)
     try:
-        raw, series = await asyncio.gather(
-            get_market_data(region, commodity),
-            get_price_trend_series(region, commodity, days=days),
-        )
-        from domains.market.market_signals import compute_price_momentum
-        enriched       = enrich_market_data(raw, series)
-        momentum       = compute_price_momentum(series)
-        enriched["momentum"] = momentum
-        recommendation = compute_trade_recommendation(
-            trend        = enriched.get("trend", "stable"),
-            buyer_signal = enriched.get("buyer_signal", "Stable"),
-            momentum     = momentum.get("momentum", "neutral"),
+        return await get_market_intelligence(
+            region, commodity, days, overlays, start, end, resolution, points, forecast, exclude_anomalies, seasonal,
         )
-        chart   = to_chart_series(series)
-        summary = to_market_summary(enriched, recommendation)
-        summary["chart"] = chart
-        return summary
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Market intelligence failed: {str(e)}")
 
 
+@app.post("/api/market/intelligence/batch")
+async def market_intelligence_batch(batch: MarketBatchInput):
+    """
+    Market intelligence for many (region, commodity) pairs in one call.
+    A commodity of "*" returns every commodity in the region; each region is loaded once.
+    """
+    start, end = _date_range(batch.date_from, batch.date_to)
+    _check_resolution(batch.resolution)
+    try:
+        pairs   = [(p.region, p.commodity or "*") for p in batch.pairs]
+        options = ChartOptions(
+            batch.days, start, end, batch.overlays, batch.resolution, batch.points, batch.forecast,
+            batch.exclude_anomalies, batch.seasonal,
+        )
+        results = await get_market_intelligence_batch(pairs, options)
+        return {"results": results, "count": len(results)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market intelligence batch failed: {str(e)}")
+
+
+# ── Market Screener (all regions × commodities) ──
+@app.get("/api/market/screener")
+async def market_screener(
+    days:       int = Query(14,           description="Days of price history per series", ge=2, le=3650),
+    sort:       str = Query("abs_change", description="Sort column; abs_change ranks the top movers"),
+    order:      str = Query("desc",       description="asc | desc"),
+    action:     str | None = Query(None,  description="Filter: BUY | HOLD | SELL"),
+    momentum:   str | None = Query(None,  description="Filter: rising | falling | neutral"),
+    state:      str | None = Query(None,  description="Filter: state (e.g. Kerala)"),
+    region:     str | None = Query(None,  description="Filter: region filename (e.g. Kerala_Kottayam)"),
+    commodity:  str | None = Query(None,  description="Filter: commodity name"),
+    min_change: float      = Query(0.0,   description="Minimum absolute change_pct", ge=0),
+    limit:      int        = Query(50,    description="Rows to return", ge=1, le=1000),
+    exclude_anomalies: bool = Query(False, description="Score series without their flagged outlier quotes"),
+):
+    """Momentum, volatility and BUY/HOLD/SELL for every commodity in every region, sortable and filterable."""
+    try:
+        return await get_market_screener(
+            days, sort, order, action, momentum, state, region, commodity, min_change, limit, exclude_anomalies,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market screener failed: {str(e)}")
+
+
+# ── Market Anomalies (outlier quotes across all regions) ──
+@app.get("/api/market/anomalies")
+async def market_anomalies(
+    days:      int = Query(30,          description="Days back from the newest quote", ge=1, le=3650),
+    state:     str | None = Query(None, description="Filter: state (e.g. Kerala)"),
+    region:    str | None = Query(None, description="Filter: region filename (e.g. Kerala_Kottayam)"),
+    commodity: str | None = Query(None, description="Filter: commodity name"),
+    limit:     int = Query(100,         description="Rows to return", ge=1, le=1000),
+):
+    """Price quotes flagged as outliers (rolling median/MAD) at load time, newest first."""
+    try:
+        return await get_market_anomalies(days, state, region, commodity, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market anomalies failed: {str(e)}")
+
+
+# ── Market Backtest (signal replay over full history) ──
+@app.get("/api/market/backtest")
+async def market_backtest(
+    days:       int = Query(14,         description="Momentum window (daily prices) used by the signal", ge=2, le=365),
+    horizons:   str = Query("7,14,30",  description="Comma-separated holding horizons in days"),
+    risk_level: str = Query("Low",      description="Climate risk assumed for every signal: Low | Moderate | High"),
+    hold_band:  float = Query(2.0,      description="A HOLD hits when |return| stays within this %", ge=0),
+    state:      str | None = Query(None, description="Filter: state (e.g. Kerala)"),
+    region:     str | None = Query(None, description="Filter: region filename (e.g. Kerala_Kottayam)"),
+    commodity:  str | None = Query(None, description="Filter: commodity name"),
+    exclude_anomalies: bool = Query(False, description="Replay without flagged outlier quotes"),
+):
+    """Forward returns, hit rate and adverse moves of every historical BUY/HOLD/SELL, per action and score."""
+    try:
+        parsed = tuple(int(h) for h in horizons.split(",") if h.strip())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="horizons must be comma-separated integers")
+    try:
+        return await get_market_backtest(days, parsed, risk_level, hold_band, state, region, commodity, exclude_anomalies)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market backtest failed: {str(e)}")
+
+
+# ── Market Spread (cross-region arbitrage) ──
+@app.get("/api/market/spread")
+async def market_spread(
+    commodity: str   = Query("Banana", description="Commodity name"),
+    days:      int   = Query(90,       description="Days of price history for spread mean/volatility", ge=2, le=3650),
+    min_pct:   float = Query(0.0,      description="Minimum current spread (%) for an opportunity", ge=0),
+    limit:     int   = Query(20,       description="Opportunities to return", ge=1, le=500),
+):
+    """Pairwise price spreads of one commodity across regions, with the widest current opportunities."""
+    try:
+        return await get_market_spread(commodity, days, min_pct, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market spread failed: {str(e)}")
+
+
+# ── Market Correlation (commodity co-movement) ──
+@app.get("/api/market/correlation")
+async def market_correlation(
+    region:      str | None = Query(None, description="Region filename (e.g. Kerala_Kottayam)"),
+    state:       str | None = Query(None, description="State (e.g. Kerala); used when no region is given"),
+    days:        int = Query(180,         description="Days of daily returns", ge=2, le=3650),
+    commodity:   str | None = Query(None, description="Also list this commodity's most/least correlated peers"),
+    top:         int = Query(5,           description="Peers to list", ge=1, le=50),
+    min_overlap: int = Query(20,          description="Minimum shared return days per pair", ge=2),
+    exclude_anomalies: bool = Query(True, description="Leave flagged outlier quotes out of the returns"),
+):
+    """Correlation and covariance of daily log returns across the commodities of a region or state."""
+    try:
+        return await get_market_correlation(region, state, days, commodity, top, min_overlap, exclude_anomalies)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market correlation failed: {str(e)}")
+
+
+# ── Market Nearest (farm → mandis) ──
+@app.get("/api/market/nearest")
+async def market_nearest(
+    lat:       float = Query(...,  description="Farm latitude", ge=-90, le=90),
+    lon:       float = Query(...,  description="Farm longitude", ge=-180, le=180),
+    k:         int = Query(5,      description="Markets to return", ge=1, le=50),
+    commodity: str | None = Query(None, description="Only markets quoting this commodity"),
+    max_km:    float | None = Query(None, description="Maximum distance in km", gt=0),
+    exclude_anomalies: bool = Query(True, description="Skip flagged outlier quotes in latest prices"),
+):
+    """The k nearest markets to a location, closest first, with each market's latest prices."""
+    try:
+        return await get_nearest_markets(lat, lon, k, commodity, max_km, exclude_anomalies)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market nearest lookup failed: {str(e)}")
+
+
+# ── Market Aggregate (state / all-India) ──
+@app.get("/api/market/aggregate")
+async def market_aggregate(
+    commodity: str = Query("Banana",    description="Commodity name"),
+    state:     str | None = Query(None, description="State (e.g. Kerala); all of India when omitted"),
+    days:      int = Query(90,          description="Days of daily prices", ge=2, le=3650),
+    exclude_anomalies: bool = Query(False, description="Leave flagged outlier quotes out of the rollups"),
+):
+    """Daily median price across districts, quote volume and momentum for a state or all of India."""
+    try:
+        return await get_market_aggregate(commodity, state, days, exclude_anomalies)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market aggregate failed: {str(e)}")
+
+
 # ── Market Records (paginated, for data table) ──
 @app.get("/api/market/records")
 async def market_records(
@@ -169,27 +369,109 @@ async def market_records(
     commodity: str = Query("Banana",          description="Commodity name"),
     page:      int = Query(1,                 description="Page number", ge=1),
     page_size: int = Query(50,                description="Records per page", ge=10, le=200),
+    cursor:    str | None = Query(None,       description="Keyset cursor (next_cursor of the previous page); overrides page"),
+    date_from: date | None = Query(None, alias="from", description="Only records on/after this day (YYYY-MM-DD)"),
+    date_to:   date | None = Query(None, alias="to",   description="Only records on/before this day (YYYY-MM-DD)"),
 ):
-    """Paginated individual records for the data table."""
+    """Paginated individual records for the data table (page number or keyset cursor)."""
+    start, end = _date_range(date_from, date_to)
     try:
-        return get_market_records(region, commodity, page, page_size)
+        return await run_in_market_pool(get_market_records, region, commodity, page, page_size, cursor, start, end)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Market records fetch failed: {str(e)}")
 
 
+# ── Market Series drill-down (market / variety / grade) ──
+@app.get("/api/market/series")
+async def market_series(
+    region:    str = Query("Kerala_Kottayam", description="Region filename"),
+    commodity: str = Query("Banana",          description="Commodity name"),
+    market:    str | None = Query(None,       description="Market (mandi) name; blank = all"),
+    variety:   str | None = Query(None,       description="Variety; blank = all"),
+    grade:     str | None = Query(None,       description="Grade; blank = all"),
+    days:      int = Query(14,                description="Days of price history (ignored when 'from' is set)", ge=1, le=3650),
+    date_from: date | None = Query(None, alias="from", description="First day (YYYY-MM-DD)"),
+    date_to:   date | None = Query(None, alias="to",   description="Last day (YYYY-MM-DD)"),
+):
+    """Daily series for a market/variety/grade drill-down, with the matching groups."""
+    start, end = _date_range(date_from, date_to)
+    try:
+        return await run_in_market_pool(
+            get_market_series, region, commodity, market, variety, grade, days, start, end,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market series fetch failed: {str(e)}")
+
+
+# ── Market Seasonality (price vs time of year) ──
+@app.get("/api/market/seasonality")
+async def market_seasonality(
+    region:    str = Query("Kerala_Kottayam", description="Region filename"),
+    commodity: str = Query("Banana",          description="Commodity name"),
+    exclude_anomalies: bool = Query(False,    description="Build the bands without flagged outlier quotes"),
+):
+    """Day-of-year and month percentile bands over the full history, and today's seasonal percentile."""
+    try:
+        return await run_in_market_pool(get_market_seasonality, region, commodity, exclude_anomalies)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market seasonality failed: {str(e)}")
+
+
 # ── Legacy: raw market data ──
 @app.get("/api/market/data")
 async def market_data(
     region:    str = Query("Kerala_Kottayam"),
     commodity: str = Query("Banana"),
+    market:    str = Query("", description="Market (mandi) name; blank = latest across markets"),
+    date_to:   date | None = Query(None, alias="to", description="Latest row as of this day (YYYY-MM-DD)"),
 ):
     """Raw market data from CSV."""
+    _, end = _date_range(None, date_to)
     try:
-        return await get_market_data(region, commodity)
+        return await get_market_data(region, commodity, market, end=end)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Market data fetch failed: {str(e)}")
 
 
+# ── Market Ingest (append new rows) ──
+@app.post("/api/market/ingest")
+async def market_ingest(
+    region: str = Query(..., description="Region filename (e.g. Kerala_Kottayam)"),
+    file:   UploadFile = File(..., description="CSV of new rows, same columns as the region file"),
+):
+    """Append new mandi rows to a region without re-parsing its history."""
+    try:
+        raw = pd.read_csv(io.BytesIO(await file.read()), dtype=str)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read CSV upload: {str(e)}")
+
+    try:
+        return await run_in_market_pool(ingest_rows, region, raw)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Market ingest failed: {str(e)}")
+
+
+# ── Market Cache Stats ──
+@app.get("/api/market/cache/stats")
+async def market_cache_stats():
+    """
+    Per-region load times (columnar cache vs CSV parse) plus the in-memory
+    region cache's byte budget, resident bytes and hit/miss/eviction counters,
+    and the same counters for the spread, correlation and aggregate caches.
+    """
+    return {
+        **get_load_stats(),
+        "memory":      get_region_cache_stats(),
+        "spread":      get_spread_cache_stats(),
+        "correlation": get_correlation_cache_stats(),
+        "aggregate":   get_aggregate_cache_stats(),
+    }
+
+
 # ── Farmer Growth Planner ──
 @app.post("/api/growth/roadmap")
 async def growth_roadmap(profile: GrowthPlannerInput):
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from datetime import date
+
+from pydantic import BaseModel, Field
 from typing import Optional
 
 
@@ -48,6 +50,24 @@ class MarketResult(BaseModel):
     error: Optional[str] = None
 
 
+class MarketPair(BaseModel):
+    region: str                              # e.g. Kerala_Kottayam
+    commodity: Optional[str] = "*"           # "*" or empty → every commodity in the region
+
+
+class MarketBatchInput(BaseModel):
+    pairs: list[MarketPair] = Field(..., min_length=1, max_length=500)
+    days: int = Field(14, ge=1, le=3650)     # ignored when "from" is set
+    overlays: bool = False                   # add rolling indicator overlays to each chart
+    date_from: Optional[date] = Field(None, alias="from")
+    date_to: Optional[date] = Field(None, alias="to")
+    resolution: str = "auto"                 # auto | day | week | month | lttb
+    points: int = Field(300, ge=10, le=2000) # point budget for lttb / auto
+    forecast: int = Field(0, ge=0, le=30)    # days of price forecast (0 = none)
+    exclude_anomalies: bool = False          # leave flagged outlier quotes out of signals and chart
+    seasonal: bool = False                   # add the seasonal percentile to each price card
+
+
 # ── Orchestration ──
 class AgentInput(BaseModel):
     # Pre-fetched agent results (optional — orchestrator self-fetches if missing)
@@ -60,7 +80,7 @@ class AgentInput(BaseModel):
     commodity_id: Optional[str] = "Tomato"
     market_id: Optional[str] = ""
     # New CSV-based context
-    region: Optional[str] = "Kerala_Kottayam"
+    region: Optional[str] = None             # default: nearest market to lat/lon, else Kerala_Kottayam
     commodity: Optional[str] = "Banana"
     lat: Optional[float] = None
     lon: Optional[float] = None